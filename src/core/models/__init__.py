@@ -1,6 +1,6 @@
 from .action import Action
 from .query import ParsedQuery, QueryTree, QueryNodeType
-from .result import ExecutionResult, Rows
+from .result import ExecutionResult, Rows, ColumnarRows
 from .response import Response
 from .failure import LogRecordType, LogRecord, RecoverCriteria
 from .storage import (
@@ -55,6 +55,7 @@ __all__ = [
     # Result
     "ExecutionResult", 
     "Rows",
+    "ColumnarRows",
 
     # Response
     "Response",
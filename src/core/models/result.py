@@ -1,4 +1,5 @@
-from typing import List, TypeVar, Generic, Union
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, TypeVar, Generic, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from .storage import TableSchema
@@ -12,6 +13,77 @@ class Rows(Generic[T]):
     rows_count: int
     schema: List[TableSchema] = field(default_factory=list)
 
+def make_row_type(column_names: List[str]) -> type:
+    """
+    Buat tipe namedtuple untuk satu hasil query. Row tetap bisa diakses
+    dengan nama kolom qualified (row["users.age"]) maupun index.
+    """
+    names = tuple(column_names)
+    positions = {name: i for i, name in enumerate(names)}
+    base = namedtuple("Row", [name.replace('.', '_') for name in names], rename=True)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return tuple.__getitem__(self, positions[key])
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        position = positions.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def keys(self):
+        return names
+
+    return type("Row", (base,), {
+        "__slots__": (),
+        "__getitem__": __getitem__,
+        "get": get,
+        "keys": keys,
+    })
+
+@dataclass
+class ColumnarRows:
+    """
+    Rows dalam layout struct-of-arrays: satu list per kolom.
+    Dict per row hanya dibangun saat `data` diakses (batas API).
+    """
+    columns: Dict[str, List[Any]]
+    rows_count: int
+    schema: List[TableSchema] = field(default_factory=list)
+    _data: Optional[List[Dict[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_rows(cls, rows: Rows) -> "ColumnarRows":
+        names = list(rows.data[0].keys()) if rows.data else []
+        columns = {name: [row.get(name) for row in rows.data] for name in names}
+        return cls(columns=columns, rows_count=len(rows.data), schema=rows.schema)
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        return {name: values[index] for name, values in self.columns.items()}
+
+    def take(self, indices: List[int]) -> "ColumnarRows":
+        """Pilih row berdasarkan posisi, hasilnya tetap columnar."""
+        columns = {name: [values[i] for i in indices] for name, values in self.columns.items()}
+        return ColumnarRows(columns=columns, rows_count=len(indices), schema=self.schema)
+
+    @property
+    def data(self) -> List[Dict[str, Any]]:
+        if self._data is None:
+            names = list(self.columns.keys())
+            self._data = [dict(zip(names, values)) for values in zip(*self.columns.values())] if names else []
+        return self._data
+
+    def records(self) -> List[tuple]:
+        """Row sebagai namedtuple (satu tipe per hasil), lebih ringan dari dict."""
+        row_type = make_row_type(list(self.columns.keys()))
+        return [row_type._make(values) for values in zip(*self.columns.values())]
+
+    def to_rows(self) -> Rows:
+        return Rows(data=self.data, rows_count=self.rows_count, schema=self.schema)
+
 @dataclass
 class ExecutionResult:
     transaction_id: int
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Union
 from enum import Enum
 
@@ -134,4 +135,12 @@ class ColumnDefinition:
 class TableSchema:
     table_name: str
     columns: List[ColumnDefinition]
-    primary_key: Optional[str] = None
\ No newline at end of file
+    primary_key: Optional[str] = None
+
+    @cached_property
+    def column_index(self) -> Dict[str, int]:
+        """Posisi kolom per nama, dibangun sekali. Schema yang berubah selalu objek baru."""
+        index: Dict[str, int] = {}
+        for position, column in enumerate(self.columns):
+            index.setdefault(column.name, position)
+        return index
@@ -14,3 +14,6 @@ class IQueryOptimizer(ABC):
     @abstractmethod
     def get_cost(self, query: ParsedQuery) -> int:
         raise NotImplementedError
+
+    def invalidate_plans(self) -> None:
+        """Buang plan yang di-cache optimizer; dipanggil setelah schema berubah."""
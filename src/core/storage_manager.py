@@ -7,6 +7,10 @@ from .models import (
 
 class IStorageManager(ABC):
 
+    # naik setiap kali schema/index berubah; cache plan di atas storage memakai
+    # nilai ini sebagai bagian key sehingga ikut basi tanpa perlu di-invalidate manual
+    schema_version: int = 0
+
     @abstractmethod
     def read_block(self, data_retrieval: DataRetrieval) -> Rows:
         raise NotImplementedError
@@ -27,6 +31,14 @@ class IStorageManager(ABC):
     def write_buffer(self, data_write: DataWrite) -> int:
         raise NotImplementedError
     
+    def write_buffer_batch(self, data_writes: List[DataWrite]) -> int:
+        # default: satu per satu; implementasi boleh menggabungkan I/O-nya
+        return sum(self.write_buffer(data_write) for data_write in data_writes)
+    
+    def normalize_row(self, schema: TableSchema, row: Dict[str, Any]) -> Dict[str, Any]:
+        # default: row disimpan apa adanya; implementasi mengembalikan bentuk row setelah disimpan
+        return dict(row)
+    
     @abstractmethod
     def delete_buffer(self, data_deletion: DataDeletion) -> int:
         raise NotImplementedError
@@ -37,3 +37,24 @@ def is_same_plan(plan1: QueryTree, plan2: QueryTree) -> bool:
         is_same_plan(c1, c2)
         for c1, c2 in zip(plan1.children, plan2.children)
     )
+
+
+def estimate_condition_selectivity(condition: str) -> float:
+    # Static estimate tanpa statistik. Lower value = more selective
+    if not condition:
+        return 1.0
+
+    # Check for equality (but not <> or !=)
+    if '=' in condition and '<>' not in condition and '!=' not in condition and \
+       '<=' not in condition and '>=' not in condition:
+        return 0.1
+
+    # Check for range operators
+    if any(op in condition for op in ['<', '>', '<=', '>=']):
+        return 0.3
+
+    # Check for not equal
+    if '<>' in condition or '!=' in condition:
+        return 0.9
+
+    return 0.5
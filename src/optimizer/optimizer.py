@@ -1,7 +1,9 @@
+from functools import cached_property
 from typing import List, Optional, Dict
 from src.core.models import ParsedQuery
 from src.core.models.query import QueryTree
 from src.core import IQueryOptimizer, IStorageManager
+from src.processor.plan_cache import PlanCache
 from .parser import QueryParser
 from .cost.cost_model import CostModel
 from .rules import (
@@ -21,6 +23,8 @@ from ._plan_utils import count_joins
 
 class QueryOptimizer(IQueryOptimizer):
 
+    MEMO_SIZE = 256
+
     def __init__(self,
                  storage_manager: IStorageManager,
                  max_iterations: int = 10,
@@ -33,8 +37,19 @@ class QueryOptimizer(IQueryOptimizer):
         self._parser = QueryParser()
         self._num_candidates = num_candidates
         self._use_heuristics = use_heuristics
+        self._heuristic_weights = heuristic_weights
+
+        # plan teroptimasi per bentuk kanonik tree input; teks query berbeda yang
+        # menghasilkan tree sama tidak dioptimasi ulang. Optimizer dipakai bersama
+        # oleh thread client server, jadi memakai PlanCache yang ber-lock
+        self._memo = PlanCache(capacity=self.MEMO_SIZE)
+
+    # Rules, cost model, scorer, dan generator baru dibangun saat pertama dipakai,
+    # sehingga query yang hanya di-parse (mis. BEGIN/COMMIT) tidak membayar biayanya.
 
-        self._rules = [
+    @cached_property
+    def _rules(self) -> List:
+        return [
             JoinCommutativityRule(),
             JoinAssociativityRule(prefer_right_deep=False),
             ProjectionEliminationRule(),
@@ -45,14 +60,20 @@ class QueryOptimizer(IQueryOptimizer):
             SelectionJoinDistributionRule(self._storage_manager),
         ]
 
-        self._cost_model = CostModel(storage_manager=self._storage_manager)
+    @cached_property
+    def _cost_model(self) -> CostModel:
+        return CostModel(storage_manager=self._storage_manager)
 
-        self._plan_scorer = PlanScorer(
+    @cached_property
+    def _plan_scorer(self) -> PlanScorer:
+        return PlanScorer(
             storage_manager=self._storage_manager,
-            heuristic_weights=heuristic_weights
+            heuristic_weights=self._heuristic_weights
         )
 
-        self._candidate_generator = CandidateGenerator(
+    @cached_property
+    def _candidate_generator(self) -> CandidateGenerator:
+        return CandidateGenerator(
             storage_manager=self._storage_manager
         )
 
@@ -64,13 +85,29 @@ class QueryOptimizer(IQueryOptimizer):
         return self._parser(query)
 
     def optimize_query(self, query: ParsedQuery) -> ParsedQuery:
+        # versi schema ikut di key agar DDL lewat processor mana pun membuat plan lama basi
+        key = (self._storage_manager.schema_version, self._canonical_key(query.tree))
+        plan = self._memo.get(key)
+        if plan is None:
+            plan = self._optimize_tree(query)
+            self._memo.put(key, plan)
+        return ParsedQuery(tree=plan, query=query.query)
+
+    def invalidate_plans(self) -> None:
+        self._memo.invalidate()
+
+    def _canonical_key(self, node: QueryTree) -> tuple:
+        value = node.value if isinstance(node.value, str) else repr(node.value)
+        return (node.type, value, tuple(self._canonical_key(child) for child in node.children))
+
+    def _optimize_tree(self, query: ParsedQuery) -> QueryTree:
         transformed = self._apply_basic_transformations(query.tree)
 
         if not self._use_heuristics:
-            return ParsedQuery(tree=transformed, query=query.query)
+            return transformed
 
         if not self._needs_candidate_generation(transformed):
-            return ParsedQuery(tree=transformed, query=query.query)
+            return transformed
 
         candidates = self._candidate_generator.generate_candidates(
             transformed,
@@ -81,9 +118,9 @@ class QueryOptimizer(IQueryOptimizer):
 
         if scored_plans:
             best_plan = min(scored_plans, key=lambda x: x.total_score)
-            return ParsedQuery(tree=best_plan.plan, query=query.query)
+            return best_plan.plan
         else:
-            return ParsedQuery(tree=transformed, query=query.query)
+            return transformed
 
     def get_cost(self, query: ParsedQuery) -> float:
         if self._cost_model is None:
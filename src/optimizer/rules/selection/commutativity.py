@@ -1,6 +1,7 @@
 from typing import Optional
 from src.optimizer.rules.base_rule import OptimizationRule
 from src.core.models.query import QueryTree, QueryNodeType
+from src.optimizer._plan_utils import estimate_condition_selectivity
 
 # Rule 2: Operasi seleksi bersifat komutatif
 class SelectionCommutativityRule(OptimizationRule):
@@ -57,20 +58,4 @@ class SelectionCommutativityRule(OptimizationRule):
     
     def _estimate_selectivity(self, condition: str) -> float:
         # Lower value = more selective
-        if not condition:
-            return 1.0
-                
-        # Check for equality (but not <> or !=)
-        if '=' in condition and '<>' not in condition and '!=' not in condition and \
-           '<=' not in condition and '>=' not in condition:
-            return 0.1 
-        
-        # Check for range operators
-        if any(op in condition for op in ['<', '>', '<=', '>=']):
-            return 0.3
-        
-        # Check for not equal
-        if '<>' in condition or '!=' in condition:
-            return 0.9  
-        
-        return 0.5
\ No newline at end of file
+        return estimate_condition_selectivity(condition)
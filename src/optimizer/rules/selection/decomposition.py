@@ -1,6 +1,7 @@
 from typing import Optional, List
 from src.optimizer.rules.base_rule import OptimizationRule
 from src.core.models.query import QueryTree, QueryNodeType
+from src.optimizer._plan_utils import estimate_condition_selectivity
 
 # Rule 1: Operasi seleksi konjungtif dapat diuraikan menjadi urutan seleksi.
 class SelectionDecompositionRule(OptimizationRule):
@@ -28,6 +29,14 @@ class SelectionDecompositionRule(OptimizationRule):
         if len(conditions) <= 1:
             return None
         
+        # Seleksi terdalam dieksekusi duluan: yang paling selektif ditaruh paling dalam
+        # supaya baris yang lolos ke seleksi berikutnya sesedikit mungkin
+        conditions = sorted(
+            (self._order_condition(condition) for condition in conditions),
+            key=self._estimate_selectivity,
+            reverse=True
+        )
+        
         # Build nested selections from innermost to outermost
         if not node.children or len(node.children) == 0:
             return None
@@ -48,12 +57,15 @@ class SelectionDecompositionRule(OptimizationRule):
         return current_tree
     
     def _split_and_conditions(self, condition: str) -> List[str]:
-        # Split condition by AND operator while respecting parentheses
+        return self._split_top_level(condition, 'AND')
+
+    def _split_top_level(self, condition: str, keyword: str) -> List[str]:
+        # Split condition by keyword operator while respecting parentheses
         import re
 
-        # Find all AND positions (case insensitive)
-        and_pattern = re.compile(r'\s+AND\s+', re.IGNORECASE)
-        matches = list(and_pattern.finditer(condition))
+        # Find all keyword positions (case insensitive)
+        keyword_pattern = re.compile(rf'\s+{keyword}\s+', re.IGNORECASE)
+        matches = list(keyword_pattern.finditer(condition))
 
         if not matches:
             return [condition]
@@ -70,7 +82,7 @@ class SelectionDecompositionRule(OptimizationRule):
                 elif condition[i] == ')':
                     depth -= 1
 
-            # Only split at top-level ANDs (depth == 0)
+            # Only split at top-level keywords (depth == 0)
             if depth == 0:
                 valid_splits.append((match.start(), match.end()))
 
@@ -85,4 +97,64 @@ class SelectionDecompositionRule(OptimizationRule):
             start = split_end
         parts.append(condition[start:].strip())
 
-        return [part for part in parts if part]
\ No newline at end of file
+        return [part for part in parts if part]
+
+    def _strip_outer_parentheses(self, condition: str) -> Optional[str]:
+        # Return isi kurung jika seluruh condition dibungkus satu pasang kurung
+        condition = condition.strip()
+        if not (condition.startswith('(') and condition.endswith(')')):
+            return None
+
+        depth = 0
+        for i, char in enumerate(condition):
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0 and i != len(condition) - 1:
+                    return None
+
+        return condition[1:-1].strip()
+
+    def _estimate_selectivity(self, condition: str) -> float:
+        inner = self._strip_outer_parentheses(condition)
+        if inner is None:
+            return estimate_condition_selectivity(condition)
+
+        disjuncts = self._split_top_level(inner, 'OR')
+        if len(disjuncts) > 1:
+            miss = 1.0
+            for part in disjuncts:
+                miss *= 1.0 - self._estimate_selectivity(part)
+            return 1.0 - miss
+
+        selectivity = 1.0
+        for part in self._split_top_level(inner, 'AND'):
+            selectivity *= self._estimate_selectivity(part)
+        return selectivity
+
+    def _order_condition(self, condition: str) -> str:
+        # Urutkan isi kurung secara rekursif supaya short-circuit lebih cepat terjadi:
+        # OR -> yang paling mungkin true duluan, AND -> yang paling mungkin false duluan
+        inner = self._strip_outer_parentheses(condition)
+        if inner is None:
+            return condition
+
+        disjuncts = self._split_top_level(inner, 'OR')
+        if len(disjuncts) > 1:
+            ordered = sorted(
+                (self._order_condition(part) for part in disjuncts),
+                key=self._estimate_selectivity,
+                reverse=True
+            )
+            return f"({' OR '.join(ordered)})"
+
+        conjuncts = self._split_top_level(inner, 'AND')
+        if len(conjuncts) > 1:
+            ordered = sorted(
+                (self._order_condition(part) for part in conjuncts),
+                key=self._estimate_selectivity
+            )
+            return f"({' AND '.join(ordered)})"
+
+        return f"({self._order_condition(inner)})"
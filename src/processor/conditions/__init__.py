@@ -1,9 +1,12 @@
 from .condition_parser import ConditionParser
 from .condition import ConditionNode
 from .condition_evaluator import ConditionEvaluator
+from .condition_compiler import ConditionCompiler, compile_condition
 
 __all__ = [
     "ConditionParser",
     "ConditionNode",
     "ConditionEvaluator",
+    "ConditionCompiler",
+    "compile_condition",
 ]
\ No newline at end of file
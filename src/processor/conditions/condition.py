@@ -1,6 +1,8 @@
+import operator
+from itertools import compress, repeat
 from abc import ABC, abstractmethod
 from typing import List, Any, Dict
-from src.core.models import ComparisonOperator, TableSchema, DataType
+from src.core.models import ComparisonOperator, TableSchema, DataType, ColumnarRows
 from ..utils import get_column_type, get_column_value, validate_column_in_schemas
 
 class ConditionNode(ABC):
@@ -10,6 +12,16 @@ class ConditionNode(ABC):
             Evaluate the condition against a given row.
         """
         raise NotImplementedError
+
+    def filter(self, rows: List[Dict[str, Any]], indices: List[int]) -> List[int]:
+        """
+            Return the subset of indices whose rows satisfy the condition.
+            Subclasses may override this to evaluate column-wise.
+        """
+        if isinstance(rows, ColumnarRows):
+            return [i for i in indices if self.evaluate(rows.row(i))]
+        return [i for i in indices if self.evaluate(rows[i])]
+
     def check_valid(self) -> tuple[Any, ComparisonOperator, Any]:
         """
             Check if the condition is valid in terms of types and columns.
@@ -17,6 +29,25 @@ class ConditionNode(ABC):
         """
         raise NotImplementedError
 
+_COMPARATORS = {
+    ComparisonOperator.EQ: operator.eq,
+    ComparisonOperator.GT: operator.gt,
+    ComparisonOperator.LT: operator.lt,
+    ComparisonOperator.GE: operator.ge,
+    ComparisonOperator.LE: operator.le,
+    ComparisonOperator.NE: operator.ne,
+}
+
+# operator setelah kedua sisi ditukar (5 < age  ->  age > 5)
+_MIRRORED = {
+    ComparisonOperator.EQ: ComparisonOperator.EQ,
+    ComparisonOperator.NE: ComparisonOperator.NE,
+    ComparisonOperator.LT: ComparisonOperator.GT,
+    ComparisonOperator.GT: ComparisonOperator.LT,
+    ComparisonOperator.LE: ComparisonOperator.GE,
+    ComparisonOperator.GE: ComparisonOperator.LE,
+}
+
 class SimpleCondition(ConditionNode):
     def __init__(self, left: str, op: ComparisonOperator, right: str, schemas: List[TableSchema]):
         self.left = left
@@ -36,10 +67,15 @@ class SimpleCondition(ConditionNode):
             else:
                 return None, self.op, None
         
-        if val_left in [col.name for col in self.schemas[0].columns]:
-            return val_left, self.op, val_right
+        # kolom boleh di-qualify dengan nama tabel, storage hanya mengenal nama kolomnya
+        if not self._is_literal(self.left):
+            return val_left.split('.')[-1], self.op, val_right
 
-        return val_right, self.op, val_left
+        return val_right.split('.')[-1], _MIRRORED[self.op], val_left
+
+    def _is_literal(self, value: str) -> bool:
+        return value.isdigit() or (value.replace('.', '', 1).isdigit() and '.' in value) \
+            or (value.startswith("'") and value.endswith("'"))
     
     def evaluate(self, row: Dict[str, Any]) -> bool:
         val_left, type_left = self._parse_value_and_type(self.left, self.schemas, row)
@@ -63,6 +99,86 @@ class SimpleCondition(ConditionNode):
         
         raise ValueError(f"Unsupported operator {self.op}")
 
+    def filter(self, rows: List[Dict[str, Any]], indices: List[int]) -> List[int]:
+        if not indices:
+            return indices
+
+        # operand di-resolve sekali per batch, bukan per row
+        columnar = isinstance(rows, ColumnarRows)
+        sample = rows.row(indices[0]) if columnar else rows[indices[0]]
+        left_is_column, left, type_left = self.resolve_operand(self.left, sample)
+        right_is_column, right, type_right = self.resolve_operand(self.right, sample)
+
+        to_float = False
+        if type_left != type_right:
+            if type_left in (DataType.INTEGER, DataType.FLOAT) and type_right in (DataType.INTEGER, DataType.FLOAT):
+                to_float = True
+            elif type_left in (DataType.CHAR, DataType.VARCHAR) and type_right in (DataType.CHAR, DataType.VARCHAR):
+                pass
+            else:
+                raise ValueError("Type mismatch in condition evaluation")
+
+        compare = _COMPARATORS.get(self.op)
+        if compare is None:
+            raise ValueError(f"Unsupported operator {self.op}")
+
+        # kolom <op> literal: bandingkan langsung tanpa membangun list nilai per operand
+        if not to_float and left_is_column != right_is_column:
+            if columnar:
+                column = rows.columns[left if left_is_column else right]
+                if len(indices) == len(column):
+                    # semua row masih kandidat: mask dibangun map() langsung atas
+                    # kolom utuh lalu di-compress, loop perbandingan berjalan di C
+                    if left_is_column:
+                        mask = map(compare, column, repeat(right))
+                    else:
+                        mask = map(compare, repeat(left), column)
+                    return list(compress(indices, mask))
+                if left_is_column:
+                    return [i for i in indices if compare(column[i], right)]
+                return [i for i in indices if compare(left, column[i])]
+            if left_is_column:
+                return [i for i in indices if compare(rows[i][left], right)]
+            return [i for i in indices if compare(left, rows[i][right])]
+
+        left_values = self._operand_values(left_is_column, left, rows, indices)
+        right_values = self._operand_values(right_is_column, right, rows, indices)
+        if to_float:
+            left_values = [float(v) for v in left_values]
+            right_values = [float(v) for v in right_values]
+
+        return [i for i, l, r in zip(indices, left_values, right_values) if compare(l, r)]
+
+    def _operand_values(self, is_column: bool, operand: Any, rows: List[Dict[str, Any]], indices: List[int]) -> List[Any]:
+        """
+            Expand a resolved operand into one value per selected row.
+            Literals are repeated, columns are read with the key resolved from the sample row.
+        """
+        if is_column:
+            if isinstance(rows, ColumnarRows):
+                column = rows.columns[operand]
+                return [column[i] for i in indices]
+            return [rows[i][operand] for i in indices]
+        return [operand] * len(indices)
+
+    def resolve_operand(self, value: str, sample: Dict[str, Any]) -> tuple[bool, Any, DataType]:
+        """
+            Resolve an operand against a sample row.
+            Returns (is_column, row key or literal value, type).
+        """
+        if self._is_literal(value):
+            literal, literal_type = self._check_value_and_type(value, self.schemas)
+            return False, literal, literal_type
+
+        validate_column_in_schemas(self.schemas, value)
+        column_type = get_column_type(self.schemas, value)
+        key = value
+        if key not in sample:
+            key = next((k for k in sample if k.endswith(f".{value}")), None)
+            if key is None:
+                raise ValueError(f"Column '{value}' not found in row")
+        return True, key, column_type
+
     def _check_value_and_type(self, value: str, schemas: List[TableSchema]) -> tuple[Any, DataType]:
         if value.isdigit():
             return int(value), DataType.INTEGER
@@ -71,7 +187,7 @@ class SimpleCondition(ConditionNode):
             return float(value), DataType.FLOAT
         
         if value.startswith("'") and value.endswith("'"):
-            return value.strip("'\""), DataType.VARCHAR
+            return value[1:-1].replace("''", "'"), DataType.VARCHAR
         
         validate_column_in_schemas(schemas, value)
         column_type = get_column_type(schemas, value)
@@ -85,7 +201,7 @@ class SimpleCondition(ConditionNode):
             return float(value), DataType.FLOAT
         
         if value.startswith("'") and value.endswith("'"):
-            return value.strip("'\""), DataType.VARCHAR
+            return value[1:-1].replace("''", "'"), DataType.VARCHAR
         
         validate_column_in_schemas(schemas, value)
         column_type = get_column_type(schemas, value)
@@ -101,8 +217,35 @@ class ComplexCondition(ConditionNode):
         raise NotImplementedError("ComplexCondition check is not supported")
     
     def evaluate(self, row: Dict[str, Any]) -> bool:
+        # short-circuit: berhenti di child pertama yang menentukan hasil
+        if self.op == 'AND':
+            for child in self.children:
+                if not child.evaluate(row):
+                    return False
+            return True
+        if self.op == 'OR':
+            for child in self.children:
+                if child.evaluate(row):
+                    return True
+            return False
+        return False
+
+    def filter(self, rows: List[Dict[str, Any]], indices: List[int]) -> List[int]:
+        # AND mempersempit kandidat, OR hanya mengevaluasi row yang belum lolos,
+        # sehingga semantik short-circuit per row tetap terjaga
         if self.op == 'AND':
-            return all(child.evaluate(row) for child in self.children)
+            for child in self.children:
+                if not indices:
+                    break
+                indices = child.filter(rows, indices)
+            return indices
         if self.op == 'OR':
-            return any(child.evaluate(row) for child in self.children)
-        return False
\ No newline at end of file
+            matched = set()
+            remaining = indices
+            for child in self.children:
+                if not remaining:
+                    break
+                matched.update(child.filter(rows, remaining))
+                remaining = [i for i in remaining if i not in matched]
+            return [i for i in indices if i in matched]
+        return []
\ No newline at end of file
@@ -0,0 +1,73 @@
+from typing import Any, Callable, Dict
+from src.core.models import ComparisonOperator, DataType
+from .condition import ConditionNode, SimpleCondition, ComplexCondition
+
+_PY_OPERATORS = {
+    ComparisonOperator.EQ: '==',
+    ComparisonOperator.NE: '!=',
+    ComparisonOperator.LT: '<',
+    ComparisonOperator.LE: '<=',
+    ComparisonOperator.GT: '>',
+    ComparisonOperator.GE: '>=',
+}
+
+_NUMERIC_TYPES = (DataType.INTEGER, DataType.FLOAT)
+_STRING_TYPES = (DataType.CHAR, DataType.VARCHAR)
+
+
+def _type_mismatch(*_):
+    raise ValueError("Type mismatch in condition evaluation")
+
+
+class ConditionCompiler:
+    """
+    Kompilasi tree kondisi menjadi satu fungsi Python `row -> bool`.
+    Key kolom dan literal di-resolve sekali dari sample row, sehingga
+    evaluasi per row tidak lagi menelusuri tree maupun parsing operand.
+    """
+
+    def __init__(self, sample: Dict[str, Any]):
+        self.sample = sample
+        self.namespace: Dict[str, Any] = {"_type_mismatch": _type_mismatch}
+
+    def compile(self, node: ConditionNode) -> Callable[[Dict[str, Any]], bool]:
+        source = f"lambda row: {self._emit(node)}"
+        return eval(compile(source, "<condition>", "eval"), self.namespace)
+
+    def _emit(self, node: ConditionNode) -> str:
+        if isinstance(node, ComplexCondition):
+            if node.op not in ('AND', 'OR') or not node.children:
+                return "False"
+            joiner = f" {node.op.lower()} "
+            return "(" + joiner.join(self._emit(child) for child in node.children) + ")"
+
+        if isinstance(node, SimpleCondition):
+            left, type_left = self._emit_operand(node, node.left)
+            right, type_right = self._emit_operand(node, node.right)
+
+            if type_left != type_right:
+                if type_left in _NUMERIC_TYPES and type_right in _NUMERIC_TYPES:
+                    pass
+                elif type_left in _STRING_TYPES and type_right in _STRING_TYPES:
+                    pass
+                else:
+                    # tetap lazy: hanya raise kalau kondisi ini benar-benar dievaluasi
+                    return f"_type_mismatch({left}, {right})"
+
+            if node.op not in _PY_OPERATORS:
+                raise ValueError(f"Unsupported operator {node.op}")
+            return f"({left} {_PY_OPERATORS[node.op]} {right})"
+
+        raise ValueError(f"Unsupported condition node {type(node).__name__}")
+
+    def _emit_operand(self, node: SimpleCondition, value: str) -> tuple[str, DataType]:
+        is_column, operand, operand_type = node.resolve_operand(value, self.sample)
+        name = f"_v{len(self.namespace)}"
+        self.namespace[name] = operand
+        if is_column:
+            return f"row[{name}]", operand_type
+        return name, operand_type
+
+
+def compile_condition(node: ConditionNode, sample: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    return ConditionCompiler(sample).compile(node)
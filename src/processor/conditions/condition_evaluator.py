@@ -1,13 +1,72 @@
+from ..plan_cache import PlanCache
 from .condition_parser import ConditionParser
-from src.core.models import TableSchema
-from typing import List, Dict, Any
+from .condition import ConditionNode
+from .condition_compiler import compile_condition
+from src.core.models import TableSchema, ColumnarRows
+from typing import List, Dict, Any, Callable, Union
 
 
 class ConditionEvaluator:
+    # batch kecil lebih cepat dievaluasi per kolom daripada membayar biaya kompilasi
+    COMPILE_THRESHOLD = 1024
+    COMPILED_CACHE_SIZE = 128
+    PARSED_CACHE_SIZE = 256
+
+    # shared antar evaluator, key: (kondisi, key kolom row, signature schema)
+    _compiled = PlanCache(capacity=COMPILED_CACHE_SIZE)
+    # shared antar evaluator, key: (kondisi, signature schema)
+    _parsed = PlanCache(capacity=PARSED_CACHE_SIZE)
+
     def __init__(self, schemas: List[TableSchema]):
+        self.schemas = schemas
         self.parser = ConditionParser.get_instance(schemas)
+        self.schema_signature = tuple(
+            (schema.table_name, tuple((col.name, col.data_type) for col in schema.columns))
+            for schema in schemas
+        )
         
     def evaluate(self, condition_str: str, row: Dict[str, Any]) -> bool:
-        condition_node = self.parser.parse(condition_str)
+        condition_node = self._get_parsed(condition_str)
         return condition_node.evaluate(row)
-    
\ No newline at end of file
+
+    def filter(self, condition_str: str, rows: Union[List[Dict[str, Any]], ColumnarRows]) -> Union[List[Dict[str, Any]], ColumnarRows]:
+        condition_node = self._get_parsed(condition_str)
+        if isinstance(rows, ColumnarRows):
+            # dievaluasi langsung per kolom, hasilnya tetap columnar
+            return rows.take(condition_node.filter(rows, list(range(rows.rows_count))))
+
+        if len(rows) >= self.COMPILE_THRESHOLD:
+            predicate = self._get_compiled(condition_str, condition_node, rows[0])
+            return [row for row in rows if predicate(row)]
+
+        indices = condition_node.filter(rows, list(range(len(rows))))
+        return [rows[i] for i in indices]
+
+    def count(self, condition_str: str, rows: Union[List[Dict[str, Any]], ColumnarRows]) -> int:
+        condition_node = self._get_parsed(condition_str)
+        if isinstance(rows, ColumnarRows):
+            return len(condition_node.filter(rows, list(range(rows.rows_count))))
+
+        if len(rows) >= self.COMPILE_THRESHOLD:
+            predicate = self._get_compiled(condition_str, condition_node, rows[0])
+            return sum(1 for row in rows if predicate(row))
+
+        return len(condition_node.filter(rows, list(range(len(rows)))))
+
+    def _get_parsed(self, condition_str: str) -> ConditionNode:
+        # tree kondisi hanya bergantung pada teks dan schema, jadi di-parse sekali
+        key = (condition_str, self.schema_signature)
+        condition_node = self._parsed.get(key)
+        if condition_node is None:
+            condition_node = self.parser.parse(condition_str)
+            self._parsed.put(key, condition_node)
+        return condition_node
+
+    def _get_compiled(self, condition_str: str, condition_node, sample: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+        key = (condition_str, tuple(sample.keys()), self.schema_signature)
+
+        predicate = self._compiled.get(key)
+        if predicate is None:
+            predicate = compile_condition(condition_node, sample)
+            self._compiled.put(key, predicate)
+        return predicate
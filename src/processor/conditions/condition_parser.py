@@ -37,7 +37,7 @@ class ConditionParser:
 
     def _tokenize(self, text: str) -> List[str]:
         token_pattern = re.compile(
-            r"('[^']*')|(\"[^\"]*\")|(\(|\))|(>=|<=|!=|=|>|<)|(\bAND\b|\bOR\b)|([a-zA-Z0-9_.]+)"
+            r"('(?:[^']|'')*')|(\"[^\"]*\")|(\(|\))|(>=|<=|!=|=|>|<)|(\bAND\b|\bOR\b)|([a-zA-Z0-9_.]+)"
         )
         tokens = []
         for match in token_pattern.finditer(text):
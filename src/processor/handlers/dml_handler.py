@@ -13,15 +13,22 @@ class DMLHandler:
     Menangani query DML (Data Manipulation Language) 
     Optimasi -> Eksekusi -> Logging
     """
+    # pesan sukses konstan per jenis query, dipakai bersama oleh semua hasil eksekusi
+    _SUCCESS_MESSAGES = {
+        QueryNodeType.UPDATE: "update successful",
+        QueryNodeType.DELETE: "delete successful",
+        QueryNodeType.INSERT: "insert successful",
+    }
+
     def __init__(self, processor: QueryProcessor):
         self.processor = processor
 
-    def handle(self, query: ParsedQuery) -> ExecutionResult:
+    def handle(self, query: ParsedQuery, count_only: bool = False) -> ExecutionResult:
         max_retries = 3
         
         for attempt in range(max_retries):
             try:
-                return self._execute_query(query)
+                return self._execute_query(query, count_only)
             except AbortError as abort_error:
                 print(f"Transaction {abort_error.transaction_id} aborted (attempt {attempt + 1}/{max_retries}): {abort_error}")
                 
@@ -35,7 +42,7 @@ class DMLHandler:
         
         raise RuntimeError("Unexpected error in transaction handling")
     
-    def _execute_query(self, query: ParsedQuery) -> ExecutionResult:
+    def _execute_query(self, query: ParsedQuery, count_only: bool = False) -> ExecutionResult:
         """
         Execute a single DML query attempt.
         """
@@ -56,22 +63,16 @@ class DMLHandler:
             ))
         
         try:
-            rows = self.processor.execute(query.tree, tx_id)
+            rows = self.processor.execute(query.tree, tx_id, count_only=count_only)
             
             result = ExecutionResult(
                 transaction_id=tx_id,
                 data=rows,
-                message="Query executed successfully.",
+                message=self._SUCCESS_MESSAGES.get(query.tree.type, "Query executed successfully."),
                 query=query.query,
                 timestamp=datetime.now()
             )
             
-            if query.tree.type == QueryNodeType.UPDATE:
-                result.message = "update successful"
-            elif query.tree.type == QueryNodeType.DELETE:
-                result.message = "delete successful"
-            elif query.tree.type == QueryNodeType.INSERT:
-                result.message = "insert successful"        
             # self.processor.frm.write_log(result)
             
             if is_implicit:
@@ -60,7 +60,12 @@ class InsertOperator:
 
         inserted = self.storage_manager.write_buffer(data_write)
 
-        return Rows(schema=[], data=[], rows_count=inserted)
+        # kembalikan row yang di-insert (seperti RETURNING *), key di-qualify seperti hasil scan.
+        # row dinormalisasi seperti yang disimpan storage (cast tipe, VARCHAR dipotong ke max_length, dst.)
+        # tanpa membaca ulang dari storage
+        stored_row = self.storage_manager.normalize_row(schema, parsed_row)
+        inserted_row = {f"{table_name}.{key}": value for key, value in stored_row.items()}
+        return Rows(schema=[schema], data=[inserted_row], rows_count=inserted)
     
     def _parse_values(self, values_str: str, schema: TableSchema) -> List[str]:
         values_str = values_str.strip()
@@ -200,7 +205,7 @@ class InsertOperator:
         # quoted literal
         if (token.startswith("'") and token.endswith("'")) or \
            (token.startswith('"') and token.endswith('"')):
-            literal = token[1:-1]
+            literal = token[1:-1].replace(token[0] * 2, token[0])
             return self._convert_literal(literal, col_type)
 
         # unquoted
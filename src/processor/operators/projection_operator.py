@@ -1,30 +1,83 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, replace
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 import re
 
 from src.core.models import Rows, TableSchema, ColumnDefinition
+from ..plan_cache import PlanCache
 from ..utils import get_schema_from_table_name, get_column_value
 
 
-@dataclass
+@dataclass(frozen=True)
 class ProjectionItem:
     kind: str  # "wildcard", "table_wildcard", "column"
     value: Optional[str] = None
     alias: Optional[str] = None
 
 
+class ProjectedRow(Mapping):
+    """
+    View read-only atas row sumber: tidak membangun dict baru per row,
+    key output dipetakan ke key sumber lewat satu dict yang dipakai bersama.
+    """
+    __slots__ = ("_row", "_keys")
+
+    def __init__(self, row: Dict[str, object], keys: Dict[str, str]):
+        self._row = row
+        self._keys = keys
+
+    def __getitem__(self, key: str) -> object:
+        return self._row.get(self._keys[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def copy(self) -> Dict[str, object]:
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class ProjectionOperator:
-    def execute(self, rows: Rows, select_clause: Optional[str]) -> Rows:
-        items = self._parse_projection_items(select_clause)
+    PARSED_CACHE_SIZE = 256
+
+    # shared antar operator, key: teks SELECT list
+    _parsed = PlanCache(capacity=PARSED_CACHE_SIZE)
+
+    def execute(self, rows: Rows, select_clause: Optional[str], count_only: bool = False) -> Rows:
+        items = self._get_projection_items(select_clause)
         if self._is_trivial_projection(items):
             return rows
 
-        projected_data = [
-            self._project_row(row, items, rows.schema or []) for row in rows.data
-        ]
-        new_schema = self._build_projected_schema(rows.schema or [], items)
+        if count_only:
+            # schema tetap dibangun supaya kolom yang tidak valid tetap error
+            return Rows(
+                data=[],
+                rows_count=rows.rows_count,
+                schema=self._build_projected_schema(rows.schema or [], items),
+            )
+
+        if rows.schema and rows.data:
+            # spec di-compile sekali per batch, tiap row hanya dibungkus view
+            keys, new_schema = self._compile(items, rows.schema, rows.data[0])
+            if self._is_identity_mapping(keys, rows.data[0]):
+                # mis. "users.*" atas input satu tabel: dict row dipakai bersama
+                return Rows(data=rows.data, rows_count=rows.rows_count, schema=new_schema)
+            projected_data = [ProjectedRow(row, keys) for row in rows.data]
+        else:
+            projected_data = [
+                self._project_row(row, items, rows.schema or []) for row in rows.data
+            ]
+            new_schema = self._build_projected_schema(rows.schema or [], items)
 
         return Rows(
             data=projected_data,
@@ -32,6 +85,15 @@ class ProjectionOperator:
             schema=new_schema,
         )
 
+    def _get_projection_items(
+        self, select_clause: Optional[str]
+    ) -> Tuple[ProjectionItem, ...]:
+        items = self._parsed.get(select_clause)
+        if items is None:
+            items = tuple(self._parse_projection_items(select_clause))
+            self._parsed.put(select_clause, items)
+        return items
+
     def _parse_projection_items(
         self, select_clause: Optional[str]
     ) -> List[ProjectionItem]:
@@ -126,13 +188,13 @@ class ProjectionOperator:
         if any(symbol in column for symbol in ("(", ")", "+", "-", "*", "/", "%")):
             raise NotImplementedError("Projection expressions are not supported yet")
 
-    def _is_trivial_projection(self, items: List[ProjectionItem]) -> bool:
+    def _is_trivial_projection(self, items: Sequence[ProjectionItem]) -> bool:
         return len(items) == 1 and items[0].kind == "wildcard"
 
     def _project_row(
         self,
         row: Dict[str, object],
-        items: List[ProjectionItem],
+        items: Sequence[ProjectionItem],
         schemas: List[TableSchema],
     ) -> Dict[str, object]:
         """Apply projection items to a single row."""
@@ -150,6 +212,74 @@ class ProjectionOperator:
 
         return projected
 
+    def _compile(
+        self,
+        items: Tuple[ProjectionItem, ...],
+        schemas: List[TableSchema],
+        sample: Dict[str, object],
+    ) -> Tuple[Dict[str, str], List[TableSchema]]:
+        """
+        Map output column names to source row keys (mirroring _project_row)
+        and build the projected schema, resolving each column only once.
+        """
+        keys: Dict[str, str] = {}
+        table_order = [schema.table_name for schema in schemas]
+        result_templates: Dict[str, TableSchema] = {
+            schema.table_name: replace(schema, columns=[]) for schema in schemas
+        }
+
+        for item in items:
+            if item.kind == "wildcard":
+                for schema in schemas:
+                    for column in schema.columns:
+                        name = f"{schema.table_name}.{column.name}"
+                        keys[name] = name
+                    self._extend_columns(
+                        result_templates[schema.table_name].columns, schema.columns
+                    )
+            elif item.kind == "table_wildcard" and item.value:
+                schema = get_schema_from_table_name(schemas, item.value)
+                for column in schema.columns:
+                    name = f"{item.value}.{column.name}"
+                    keys[name] = name
+                self._extend_columns(
+                    result_templates[schema.table_name].columns, schema.columns
+                )
+            elif item.kind == "column" and item.value:
+                column_def, table_name = self._get_column_definition(schemas, item.value)
+                column_name = item.alias or f"{table_name}.{column_def.name}"
+                keys[column_name] = self._resolve_source_key(sample, item.value)
+                output_name = item.alias or self._derive_output_name(item.value)
+                self._append_column(
+                    result_templates[table_name].columns,
+                    replace(column_def, name=output_name, primary_key=False),
+                )
+
+        new_schema = [
+            result_templates[name]
+            for name in table_order
+            if result_templates[name].columns
+        ]
+        return keys, new_schema
+
+    def _is_identity_mapping(
+        self, keys: Dict[str, str], sample: Dict[str, object]
+    ) -> bool:
+        if len(keys) != len(sample):
+            return False
+        return all(
+            output == source == row_key
+            for (output, source), row_key in zip(keys.items(), sample)
+        )
+
+    def _resolve_source_key(self, sample: Dict[str, object], column: str) -> str:
+        if column in sample:
+            return column
+        for key in sample:
+            if key.endswith(f".{column}"):
+                return key
+        raise ValueError(f"Column '{column}' not found in row")
+
     def _append_all_tables(
         self,
         target: Dict[str, object],
@@ -181,7 +311,7 @@ class ProjectionOperator:
         return column
 
     def _build_projected_schema(
-        self, schemas: List[TableSchema], items: List[ProjectionItem]
+        self, schemas: List[TableSchema], items: Sequence[ProjectionItem]
     ) -> List[TableSchema]:
         if not schemas:
             return []
@@ -243,16 +373,16 @@ class ProjectionOperator:
         if "." in column_name:
             table_name, col_name = column_name.split(".", 1)
             schema = get_schema_from_table_name(schemas, table_name)
-            for column in schema.columns:
-                if column.name == col_name:
-                    return column, schema.table_name
+            position = schema.column_index.get(col_name)
+            if position is not None:
+                return schema.columns[position], schema.table_name
             raise ValueError(f"Column '{col_name}' not found in table '{table_name}'")
 
-        matches: List[tuple[TableSchema, ColumnDefinition]] = []
-        for schema in schemas:
-            for column in schema.columns:
-                if column.name == column_name:
-                    matches.append((schema, column))
+        matches: List[tuple[TableSchema, ColumnDefinition]] = [
+            (schema, schema.columns[schema.column_index[column_name]])
+            for schema in schemas
+            if column_name in schema.column_index
+        ]
 
         if not matches:
             raise ValueError(f"Column '{column_name}' not found in projection source")
@@ -1,16 +1,17 @@
-from src.core.models.result import Rows
+from src.core.models.result import Rows, ColumnarRows
 from src.core import IConcurrencyControlManager, IStorageManager
 from src.core.models import DataRetrieval, Action, QueryTree, Condition, TableSchema
 from ..exceptions import AbortError
 from ..conditions import ConditionParser
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+import sys
 
 class ScanOperator:
     def __init__(self, ccm: IConcurrencyControlManager, storage_manager: IStorageManager):
         self.ccm = ccm
         self.storage_manager = storage_manager
 
-    def execute(self, table_name: str, tx_id: int, parent_node: Optional[QueryTree] = None) -> Rows:
+    def execute(self, table_name: str, tx_id: int, parent_node: Optional[QueryTree] = None, columnar: bool = False) -> Union[Rows, ColumnarRows]:
         table_name, table_alias = self._parse_table_name_and_alias(table_name)
         table_schema = self.storage_manager.get_table_schema(table_name)
 
@@ -34,6 +35,9 @@ class ScanOperator:
         
         rows = self.storage_manager.read_buffer(data_retrieval)
         rows.schema = [table_schema]
+        if columnar:
+            # langsung ke satu list per kolom, tanpa membangun dict qualified per row
+            return self._to_columnar(rows, table_alias)
         rows.data = self._transform_rows(rows.data, table_alias)
         
         return rows
@@ -46,11 +50,37 @@ class ScanOperator:
         return names[0], names[0]
     
     def _transform_rows(self, rows: List[Dict[str, Any]], table_alias: str) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        
+        # row dari storage punya kolom yang sama, jadi pasangan (kolom, nama qualified
+        # yang sudah di-intern) cukup dibangun sekali dari row pertama
+        pairs = [(key, sys.intern(f"{table_alias}.{key}")) for key in rows[0]]
+        try:
+            return [{qualified_key: row[key] for key, qualified_key in pairs} for row in rows]
+        except KeyError:
+            return self._transform_mixed_rows(rows, table_alias)
+    
+    def _to_columnar(self, rows: Rows, table_alias: str) -> ColumnarRows:
+        data = rows.data
+        keys = list(data[0]) if data else []
+        try:
+            columns = {sys.intern(f"{table_alias}.{key}"): [row[key] for row in data] for key in keys}
+        except KeyError:
+            transformed = self._transform_mixed_rows(data, table_alias)
+            return ColumnarRows.from_rows(Rows(data=transformed, rows_count=len(transformed), schema=rows.schema))
+        return ColumnarRows(columns=columns, rows_count=len(data), schema=rows.schema)
+    
+    def _transform_mixed_rows(self, rows: List[Dict[str, Any]], table_alias: str) -> List[Dict[str, Any]]:
+        # jalur umum untuk row yang kolomnya tidak seragam
+        qualified_keys: Dict[str, str] = {}
         transformed_data = []
         for row in rows:
             transformed_row = {}
             for key, value in row.items():
-                qualified_key = f"{table_alias}.{key}"
+                qualified_key = qualified_keys.get(key)
+                if qualified_key is None:
+                    qualified_key = qualified_keys[key] = sys.intern(f"{table_alias}.{key}")
                 transformed_row[qualified_key] = value
             transformed_data.append(transformed_row)
         
@@ -1,14 +1,21 @@
-from src.core.models.result import Rows
+from typing import Union
+from src.core.models.result import Rows, ColumnarRows
 from ..conditions import ConditionEvaluator
 
 class SelectionOperator:
-    def execute(self, rows: Rows, conditions: str) -> Rows:
+    def execute(self, rows: Union[Rows, ColumnarRows], conditions: str, count_only: bool = False) -> Union[Rows, ColumnarRows]:
         evaluator = ConditionEvaluator(rows.schema)
-        filtered_data = []
-        for row in rows.data:
-            if evaluator.evaluate(conditions, row):
-                filtered_data.append(row)
+        # ColumnarRows difilter per kolom dan tetap columnar, tanpa membangun dict per row
+        source = rows if isinstance(rows, ColumnarRows) else rows.data
+        if count_only:
+            return Rows(schema=rows.schema,
+                        rows_count=evaluator.count(conditions, source),
+                        data=[])
+        
+        filtered_data = evaluator.filter(conditions, source)
+        if isinstance(filtered_data, ColumnarRows):
+            return filtered_data
                 
         return Rows(schema=rows.schema, 
                     rows_count=len(filtered_data), 
-                    data=filtered_data)
\ No newline at end of file
+                    data=filtered_data)
@@ -1,20 +1,53 @@
 from __future__ import annotations
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional, Set
 from datetime import datetime
+from operator import itemgetter
 from src.core.models import Rows, TableSchema
+from ..plan_cache import PlanCache
 from ..utils import validate_column_in_schemas, get_column_value
 
 
+# int dan float sama-sama bertag 1 di _normalize_value
+_NUMERIC_TYPES = frozenset((int, float))
+_NULLABLE_NUMERIC_TYPES = _NUMERIC_TYPES | {type(None)}
+# pass DESC memakai reverse=True, jadi NULL-first butuh sentinel terbesar
+_NULL_SENTINELS = {"ASC": float("-inf"), "DESC": float("inf")}
+_NULLABLE_STRING_TYPES = frozenset((str, type(None)))
+
+
 class SortOperator:
+    PARSED_CACHE_SIZE = 256
+
+    # shared antar operator, key: teks ORDER BY
+    _parsed = PlanCache(capacity=PARSED_CACHE_SIZE)
+
     def execute(self, rows: Rows, order_by: str) -> Rows:
         if not order_by or not order_by.strip():
             return rows
         
         sort_keys = self._parse_order_by(order_by)
-        sorted_data = sorted(
-            rows.data,
-            key=lambda row: self._build_sort_key(row, sort_keys, rows.schema)
-        )
+        data = rows.data
+        if not data:
+            return rows
+        if len(data) == 1:
+            # satu row sudah terurut; kolom tetap divalidasi supaya
+            # ORDER BY kolom yang tidak ada tetap error
+            for col, _ in sort_keys:
+                validate_column_in_schemas(rows.schema, col)
+            return rows
+
+        # tiap kolom sort dinormalisasi sekali menjadi satu list key,
+        # lalu yang diurutkan cukup posisi row
+        key_columns = [
+            (self._build_key_column(data, col, direction, rows.schema), direction)
+            for col, direction in sort_keys
+        ]
+        order = list(range(len(data)))
+        # sort stabil satu pass per kolom, dari kunci paling akhir; tiap pass hanya
+        # membandingkan satu key per row (tanpa tuple gabungan), DESC cukup reverse=True
+        for keys, direction in reversed(key_columns):
+            order = self._sort_pass(order, keys, direction)
+        sorted_data = [data[i] for i in order]
 
         return Rows(
             data=sorted_data,
@@ -22,7 +55,26 @@ class SortOperator:
             schema=rows.schema,
         )
 
-    def _parse_order_by(self, order_by: str) -> List[Tuple[str, str]]:
+    def _sort_pass(self, order: List[int], keys: List[Any], direction: str) -> List[int]:
+        reverse = direction == "DESC"
+        if None not in keys:
+            order.sort(key=keys.__getitem__, reverse=reverse)
+            return order
+        # hanya kolom teks polos yang menyimpan NULL sebagai None: NULL dipisah di depan
+        # (urutan pass sebelumnya tetap), sisanya diurutkan tanpa tag tipe
+        nulls = [i for i in order if keys[i] is None]
+        rest = [i for i in order if keys[i] is not None]
+        rest.sort(key=keys.__getitem__, reverse=reverse)
+        return nulls + rest
+
+    def _parse_order_by(self, order_by: str) -> Tuple[Tuple[str, str], ...]:
+        keys = self._parsed.get(order_by)
+        if keys is None:
+            keys = self._parse_order_by_uncached(order_by)
+            self._parsed.put(order_by, keys)
+        return keys
+
+    def _parse_order_by_uncached(self, order_by: str) -> Tuple[Tuple[str, str], ...]:
         parts = order_by.split(",")
         keys = []
         for part in parts:
@@ -32,16 +84,76 @@ class SortOperator:
             if len(tokens) > 1 and tokens[1].upper() in ("ASC", "DESC"):
                 direction = tokens[1].upper()
             keys.append((col, direction))
-        return keys
+        return tuple(keys)
     
-    def _build_sort_key(self, row: Dict[str, object], sort_keys: List[Tuple[str, str]], schemas: List[TableSchema]) -> Tuple:
-        key = []
-        for col, direction in sort_keys:
-            validate_column_in_schemas(schemas, col)
-            raw = get_column_value(row, col)
-            norm = self._normalize_value(raw)
-            key.append(self._apply_direction(norm, direction))
-        return tuple(key)
+    def _build_key_column(self, data: List[Dict[str, object]], col: str, direction: str, schemas: List[TableSchema]) -> List[Any]:
+        validate_column_in_schemas(schemas, col)
+        values = self._column_values(data, col)
+        value_types = set(map(type, values))
+        if value_types <= _NUMERIC_TYPES:
+            # semua nilai bertipe sama, jadi tag tipe tidak mempengaruhi urutan:
+            # nilai mentah langsung jadi key tanpa tuple per row
+            return values
+        if value_types <= _NULLABLE_NUMERIC_TYPES:
+            # NULL diganti sentinel yang tetap berada di awal setelah pass ASC/DESC;
+            # kalau kolom sudah memuat nilai tak hingga yang sama, pakai key bertag
+            sentinel = _NULL_SENTINELS[direction]
+            if sentinel not in values:
+                return [sentinel if value is None else value for value in values]
+        if value_types <= _NULLABLE_STRING_TYPES and not any(value[:1].isdigit() for value in values if value is not None):
+            # tidak ada yang bisa jadi tanggal ISO, jadi semua bertag 4: cukup lower(),
+            # NULL dibiarkan None dan dipisah di _sort_pass
+            return [None if value is None else value.lower() for value in values]
+        key_of = self._key_function(direction, value_types)
+        distinct = set(values)
+        if len(distinct) * 2 <= len(values):
+            # banyak nilai berulang: normalisasi (termasuk parsing tanggal) cukup
+            # sekali per nilai distinct, row lain hanya lookup dict
+            normalized = {raw: key_of(raw) for raw in distinct}
+            try:
+                return list(map(normalized.__getitem__, values))
+            except KeyError:
+                # NaN tidak sama dengan dirinya sendiri, jadi tidak bisa di-lookup
+                pass
+        return list(map(key_of, values))
+
+    def _key_function(self, direction: str, value_types: Set[type]):
+        # normalizer dipilih sekali per kolom: kolom teks memakai versi khusus string.
+        # pass DESC diurutkan dengan reverse=True; tag tipe dinegasikan supaya
+        # urutan antar tipe (NULL lebih dulu) tetap sama dengan ASC
+        normalize = self._normalize_value
+        if value_types <= _NULLABLE_STRING_TYPES:
+            normalize = self._normalize_string
+        if direction == "ASC":
+            return normalize
+
+        def desc_key(value: Any):
+            type_id, val = normalize(value)
+            return (-type_id, val)
+
+        return desc_key
+
+    def _normalize_string(self, value: Optional[str]):
+        if value is None:
+            return (0, None)
+        # format ISO selalu diawali digit tahun, teks lain tidak perlu dicoba di-parse
+        if value[:1].isdigit():
+            try:
+                return (3, datetime.fromisoformat(value).timestamp())
+            except ValueError:
+                pass
+        return (4, value.lower())
+
+    def _column_values(self, data: List[Dict[str, object]], col: str) -> List[Any]:
+        # key row di-resolve sekali dari row pertama, bukan dicari ulang per row
+        sample = data[0]
+        key = col if col in sample else next((k for k in sample if k.endswith(f".{col}")), None)
+        if key is not None:
+            try:
+                return list(map(itemgetter(key), data))
+            except KeyError:
+                pass
+        return [get_column_value(row, col) for row in data]
     
     def _normalize_value(self, value: Any):
         if value is None:
@@ -62,20 +174,3 @@ class SortOperator:
             return (4, value.lower()) 
 
         return (5, str(value))
-
-    def _apply_direction(self, norm, direction: str):
-        type_id, val = norm
-
-        if direction == "ASC":
-            return (type_id, val)
-        
-        if isinstance(val, (int, float)):
-            return (type_id, -val)
-
-        if val is None:
-            return (type_id, val)
-
-        if isinstance(val, str):
-            return (type_id, "".join(chr(255 - ord(c)) for c in val))
-
-        return (type_id, val)
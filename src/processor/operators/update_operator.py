@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from src.core import IConcurrencyControlManager, IStorageManager, IFailureRecoveryManager
 from src.core.models import (DataWrite, 
                              DataRetrieval,
@@ -9,9 +9,15 @@ from src.core.models import (DataWrite,
                              Action, ColumnDefinition,
                              ForeignKeyAction)
 from ..exceptions import AbortError
+from ..plan_cache import PlanCache
 from ..utils import get_column_from_schema, check_referential_integrity
 
 class UpdateOperator:
+    PARSED_CACHE_SIZE = 256
+
+    # shared antar operator, key: teks SET clause
+    _parsed = PlanCache(capacity=PARSED_CACHE_SIZE)
+
     def __init__(self, ccm: IConcurrencyControlManager, storage_manager: IStorageManager, frm: IFailureRecoveryManager):
         self.ccm = ccm
         self.storage_manager = storage_manager
@@ -24,7 +30,7 @@ class UpdateOperator:
         table_name = rows.schema[0].table_name
 
         # ambil SET clause
-        assignments = self._parse_assignment_string(set_clause)
+        assignments = self._parse_set_clause(set_clause)
 
         # ambil schema & PK
         schema = rows.schema[0]
@@ -34,22 +40,28 @@ class UpdateOperator:
         if not pks:
             raise ValueError(f"Table '{table_name}' does not have a primary key.")
 
-        # update per-row
-        updated_count = 0
-        
         # Validate with CCM before proceeding
         validate = self.ccm.validate_object(table_name, tx_id, Action.WRITE)
         if not validate.allowed:
             raise AbortError(tx_id, table_name, Action.WRITE, 
                            f"Write access denied by concurrency control manager")
 
+        # write ke storage dikumpulkan lalu dikirim sekali di akhir;
+        # pk baru yang sudah dipakai row sebelumnya dicatat karena belum ada di storage
+        data_writes = []
+        pending_pks = set()
+        updates = []
+
+        # nilai SET tidak bergantung pada row, jadi di-parse sekali per statement
+        plan = self._plan_assignments(assignments, schema) if rows.data else []
+
         for row in rows.data:
             # pk_with_table = f"{table_name}.{pk}"
             pk_with_table_list = [f"{table_name}.{pk}" for pk in pks]
             # original_pk_value = row.get(pk_with_table) or row.get(pk)
             original_pk_val = [row.get(pk_with_table) or row.get(pks[i]) for i, pk_with_table in enumerate(pk_with_table_list)]
             
-            updated_row = self._apply_assignments(row, assignments, schema, tx_id)
+            updated_row = self._apply_assignments(row, plan)
             updated_row = self._transform_col_name(updated_row)
             
             
@@ -61,8 +73,16 @@ class UpdateOperator:
                 conditions=pk_conditions,
                 limit=1
             ))
-            if check.rows_count > 0:
-                raise ValueError(f"UPDATE causes PK conflict on '{pks}' with values {[updated_row.get(pk) for pk in pks]}")
+            new_pk_val = tuple(updated_row.get(pk) for pk in pks)
+            if check.rows_count > 0 or new_pk_val in pending_pks:
+                raise ValueError(f"UPDATE causes PK conflict on '{pks}' with values {list(new_pk_val)}")
+            pending_pks.add(new_pk_val)
+            updates.append((row, updated_row, original_pk_val))
+
+        # aksi FK (cascade / set null) langsung menulis ke storage,
+        # jadi baru dijalankan setelah semua row lolos cek konflik PK
+        for row, updated_row, original_pk_val in updates:
+            self._apply_assignment_foreign_key_actions(row, plan, table_name, tx_id)
             
             # Log ke Failure Recovery Manager
             log_record = LogRecord(
@@ -75,20 +95,47 @@ class UpdateOperator:
             )
             self.frm.write_log(log_record)
             
-            # write ke storage
-            data_write = DataWrite(
+            data_writes.append(DataWrite(
                 table_name=table_name,
                 data=updated_row,
                 is_update=True,
                 conditions=[Condition(pk, ComparisonOperator.EQ, original_pk_value) for pk, original_pk_value in zip(pks, original_pk_val)]
-            )
+            ))
 
-            updated_count += self.storage_manager.write_buffer(data_write)
+        # write ke storage
+        updated_count = self.storage_manager.write_buffer_batch(data_writes)
 
         return Rows(schema=[], 
                     data=[], 
                     rows_count=updated_count)
 
+    def _parse_set_clause(self, set_clause: str) -> Tuple[Tuple[str, str], ...]:
+        assignments = self._parsed.get(set_clause)
+        if assignments is None:
+            assignments = tuple(self._parse_assignment_string(set_clause).items())
+            self._parsed.put(set_clause, assignments)
+        return assignments
+
+    def _plan_assignments(self, assignments: Tuple[Tuple[str, str], ...], schema: TableSchema) -> List[Tuple[str, Any, ColumnDefinition]]:
+        plan = []
+        for col, expr in assignments:
+            qualified_col = col
+            if ('.' not in col):
+                qualified_col = f"{schema.table_name}.{col}"
+            value = self._parse_value(expr, col, schema)
+            column = get_column_from_schema(schema, col)
+            if (value is None) and (not column.nullable):
+                raise ValueError(f"Column '{col}' cannot be set to NULL due to NOT NULL constraint.")
+            
+            if (value is None) and column.primary_key:
+                raise ValueError(f"Column '{col}' cannot be set to NULL due to PRIMARY KEY constraint.")
+            
+            if column.foreign_key is not None:
+                if not check_referential_integrity(value, column, self.storage_manager):
+                    raise ValueError(f"Referential integrity violation: value '{value}' for column '{col}' does not exist in referenced table '{column.foreign_key.referenced_table}'")
+            plan.append((qualified_col, value, column))
+        return plan
+
     def _parse_assignment_string(self, assignment_str: str) -> Dict[str, str]:
         assignments = {}
 
@@ -123,40 +170,18 @@ class UpdateOperator:
         return assignments
 
     # apply assignment ke row lama
-    def _apply_assignments(self, row: Dict[str, Any], assignments: Dict[str, str], schema: TableSchema, tx_id: int) -> Dict[str, Any]:
+    def _apply_assignments(self, row: Dict[str, Any], plan: List[Tuple[str, Any, ColumnDefinition]]) -> Dict[str, Any]:
         updated = row.copy()
-        table_name = schema.table_name
-        pk_column = schema.primary_key
-        
-        for col, expr in assignments.items():
-            qualified_col = col
-            if ('.' not in col):
-                qualified_col = f"{table_name}.{col}"
-            updated[qualified_col] = self._parse_value(expr, col, schema)
-            column = get_column_from_schema(schema, col)
-            if (updated[qualified_col] is None) and (not column.nullable):
-                raise ValueError(f"Column '{col}' cannot be set to NULL due to NOT NULL constraint.")
-            
-            if (updated[qualified_col] is None) and column.primary_key:
-                raise ValueError(f"Column '{col}' cannot be set to NULL due to PRIMARY KEY constraint.")
-            
-            if column.foreign_key is not None:
-                if not check_referential_integrity(updated[qualified_col], column, self.storage_manager):
-                    raise ValueError(f"Referential integrity violation: value '{updated[qualified_col]}' for column '{col}' does not exist in referenced table '{column.foreign_key.referenced_table}'")
-            
-            if column.primary_key and pk_column is not None:
-                new_pk_value = updated[qualified_col]
-                old_pk_value = row.get(qualified_col)
-                
-                # if new_pk_value != old_pk_value:
-                #     if self._check_pk_conflict(table_name, pk_column, new_pk_value):
-                #         raise ValueError(f"UPDATE causes PK conflict '{pk_column}'={new_pk_value}")
-            new_value = updated[qualified_col]
-            old_value = row.get(qualified_col)
+        for qualified_col, new_value, _ in plan:
+            updated[qualified_col] = new_value
+        return updated
+
+    # jalankan aksi FK untuk setiap kolom yang di-assign pada satu row
+    def _apply_assignment_foreign_key_actions(self, row: Dict[str, Any], plan: List[Tuple[str, Any, ColumnDefinition]], table_name: str, tx_id: int):
+        for qualified_col, new_value, column in plan:
             self._apply_update_foreign_key_actions(
-                old_value, new_value, table_name, column, tx_id
+                row.get(qualified_col), new_value, table_name, column, tx_id
             )
-        return updated
     
     def _apply_update_foreign_key_actions(self, old_value: Any, 
                                                 new_value: Any, 
@@ -310,10 +335,9 @@ class UpdateOperator:
 
         # cari tipe kolom
         col_type = None
-        for col in schema.columns:
-            if col.name == column_name:
-                col_type = col.data_type
-                break
+        position = schema.column_index.get(column_name)
+        if position is not None:
+            col_type = schema.columns[position].data_type
 
         if col_type is None:
             raise ValueError(f"Column '{column_name}' not found")
@@ -326,7 +350,7 @@ class UpdateOperator:
         if (value_expr.startswith("'") and value_expr.endswith("'")) or \
            (value_expr.startswith('"') and value_expr.endswith('"')):
 
-            literal = value_expr[1:-1]
+            literal = value_expr[1:-1].replace(value_expr[0] * 2, value_expr[0])
 
             if col_type == DataType.INTEGER:
                 try:
@@ -0,0 +1,45 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class PlanCache:
+    """
+    Cache LRU untuk hasil parse (+ optimasi) query, dengan key berupa teks query
+    yang sudah dinormalisasi. Plan teroptimasi harus di-invalidate setiap kali
+    schema berubah (DDL).
+
+    Juga dipakai sebagai cache parse level kelas di operator. Instance bisa dibagi
+    antar thread client, jadi setiap akses ke OrderedDict dijaga lock.
+    """
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.plans: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hit_count = 0
+        self.miss_count = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            plan = self.plans.get(key)
+            if plan is None:
+                self.miss_count += 1
+                return None
+
+            self.hit_count += 1
+            self.plans.move_to_end(key)
+            return plan
+
+    def put(self, key: Hashable, plan: Any) -> None:
+        with self._lock:
+            self.plans[key] = plan
+            self.plans.move_to_end(key)
+            if len(self.plans) > self.capacity:
+                self.plans.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.plans.clear()
+
+    def __len__(self) -> int:
+        return len(self.plans)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, Sequence
+
+from src.core.models import ExecutionResult, ParsedQuery, QueryTree
+
+if TYPE_CHECKING:
+    from .processor import QueryProcessor
+
+
+class PreparedStatement:
+    """
+    Query DML dengan placeholder '?' yang divalidasi, di-parse, dan dioptimasi sekali.
+    Setiap execute hanya mengisi literal ke plan lalu langsung dieksekusi.
+    """
+
+    # string literal dilewati supaya '?' di dalam string tidak dianggap placeholder
+    _PLACEHOLDER_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\?")
+    # penanda bernomor, urutan node di plan teroptimasi bisa beda dengan urutan di teks;
+    # string literal juga dilewati supaya '?1' milik user tidak ikut diganti
+    _MARKER_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\?(\d+)")
+
+    def __init__(self, processor: QueryProcessor, query: str, plan: ParsedQuery, param_count: int):
+        self.processor = processor
+        self.query = query
+        self.plan = plan
+        self.param_count = param_count
+
+    @classmethod
+    def number_placeholders(cls, query: str, replacement: str | None = None) -> tuple[str, int]:
+        """
+        Ganti setiap '?' di luar string literal dengan penanda '?<n>' (atau replacement).
+        """
+        count = 0
+
+        def substitute(match: re.Match) -> str:
+            nonlocal count
+            token = match.group(0)
+            if token != "?":
+                return token
+            count += 1
+            return replacement if replacement is not None else f"?{count}"
+
+        return cls._PLACEHOLDER_RE.sub(substitute, query), count
+
+    def execute(self, params: Sequence[Any] = (), count_only: bool = False) -> ExecutionResult:
+        if len(params) != self.param_count:
+            raise ValueError(
+                f"Prepared statement expects {self.param_count} parameters, got {len(params)}"
+            )
+
+        literals = [self._format_literal(param) for param in params]
+        bound = ParsedQuery(tree=self._bind(self.plan.tree, literals), query=self.query)
+        return self.processor._route_query(bound, count_only)
+
+    def _bind(self, node: QueryTree, literals: Sequence[str]) -> QueryTree:
+        """Salin tree plan dengan penanda diganti literal; plan asli tidak diubah."""
+        value = node.value
+        if isinstance(value, str) and "?" in value:
+            value = self._MARKER_RE.sub(
+                lambda m: m.group(0) if m.group(1) is None else literals[int(m.group(1)) - 1], value
+            )
+
+        bound = QueryTree(type=node.type, value=value, children=[])
+        for child in node.children:
+            bound_child = self._bind(child, literals)
+            bound_child.parent = bound
+            bound.children.append(bound_child)
+        return bound
+
+    def _format_literal(self, value: Any) -> str:
+        if value is None:
+            return "NULL"
+        if isinstance(value, bool):
+            raise TypeError("Boolean parameters are not supported")
+        if isinstance(value, (int, float)):
+            return repr(value)
+        if isinstance(value, str):
+            # kutip tunggal di dalam string di-escape menjadi ''
+            return "'" + value.replace("'", "''") + "'"
+        raise TypeError(f"Unsupported parameter type '{type(value).__name__}'")
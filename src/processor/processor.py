@@ -12,6 +12,8 @@ from .operators import (
     InsertOperator
 )
 from .validators import SyntaxValidator
+from .plan_cache import PlanCache
+from .prepared_statement import PreparedStatement
 from typing import Optional
 from datetime import datetime
 import re
@@ -21,6 +23,13 @@ Kelas utama untuk memproses query yang diterima dari user.
 """    
 class QueryProcessor(IQueryProcessor):
     
+    # dikompilasi sekali, dipakai untuk normalisasi whitespace sekaligus key plan cache
+    _WS_RE = re.compile(r'\s+')
+    
+    # hasil validasi + parse hanya bergantung pada teks query (bukan schema),
+    # jadi dibagi antar instance processor; optimizer tidak mengubah tree input
+    _parse_cache = PlanCache(capacity=1024)
+    
     def __init__(self, 
                  optimizer: IQueryOptimizer,
                  ccm: IConcurrencyControlManager,
@@ -38,6 +47,10 @@ class QueryProcessor(IQueryProcessor):
         # validator untuk syntax SQL
         self.validator = SyntaxValidator()
         
+        # cache plan hasil parse + optimasi, key: (versi schema storage, query yang sudah dinormalisasi);
+        # DDL dari processor lain di atas storage yang sama menaikkan versi, jadi plan lama tidak terpakai
+        self.plan_cache = PlanCache()
+        
         # handler untuk berbagai jenis query (TCL, DML, atau DDL kalo mau kerja bonus)
         self.dml_handler = DMLHandler(self)
         self.tcl_handler = TCLHandler(self)
@@ -54,15 +67,72 @@ class QueryProcessor(IQueryProcessor):
         self.insert_operator = InsertOperator(self.ccm, self.storage, self.frm)
         # dst
 
-    def execute_query(self, query: str) -> ExecutionResult:
+    def execute_query(self, query: str, count_only: bool = False) -> ExecutionResult:
         """
         Eksekusi query yang diterima dari user.
+        Jika count_only, SELECT hanya menghitung jumlah row hasil (data dikosongkan).
         """
         # Handle meta commands first, before validation
         meta_result = self._handle_meta_commands(query.strip())
         if meta_result is not None:
             return meta_result
         
+        normalized_query = QueryProcessor._WS_RE.sub(' ', query).strip()
+        
+        # query yang sama (setelah normalisasi) tidak perlu divalidasi, di-parse, dan dioptimasi ulang
+        cache_key = (self.storage.schema_version, normalized_query)
+        optimized_query = self.plan_cache.get(cache_key)
+        if optimized_query is None:
+            parsed_query = self._parse(query, normalized_query)
+            if self._get_query_type(parsed_query.tree) == QueryTypeEnum.TCL:
+                # tidak ada yang bisa dioptimasi dari BEGIN/COMMIT/ABORT
+                optimized_query = parsed_query
+            else:
+                optimized_query = self.optimizer.optimize_query(parsed_query)
+            if self._get_query_type(optimized_query.tree) != QueryTypeEnum.DDL:
+                self.plan_cache.put(cache_key, optimized_query)
+        
+        return self._route_query(optimized_query, count_only)
+
+    def count(self, query: str) -> int:
+        """
+        Jumlah row hasil query tanpa membangun data row-nya.
+        """
+        result = self.execute_query(query, count_only=True)
+        return result.data.rows_count if result.data is not None else 0
+
+    def prepare(self, query: str) -> PreparedStatement:
+        """
+        Siapkan query DML dengan placeholder '?'; validasi, parse, dan optimasi hanya dilakukan sekali.
+        """
+        normalized_query = QueryProcessor._WS_RE.sub(' ', query).strip()
+        marked_query, param_count = PreparedStatement.number_placeholders(normalized_query)
+        
+        # validator tidak mengenal placeholder, jadi dicek dengan literal pengganti
+        self._validate_syntax(PreparedStatement.number_placeholders(query, replacement="0")[0])
+        parsed_query = self.optimizer.parse_query(marked_query)
+        if self._get_query_type(parsed_query.tree) != QueryTypeEnum.DML:
+            raise ValueError("Only DML statements can be prepared")
+        
+        return PreparedStatement(self, query, self.optimizer.optimize_query(parsed_query), param_count)
+
+    def _parse(self, query: str, normalized_query: str) -> ParsedQuery:
+        """
+        Validasi dan parse query, memakai hasil parse bersama jika teks yang sama pernah diproses.
+        """
+        key = (type(self.optimizer), normalized_query)
+        parsed_query = QueryProcessor._parse_cache.get(key)
+        if parsed_query is None:
+            self._validate_syntax(query)
+            parsed_query = self.optimizer.parse_query(normalized_query)
+            if self._get_query_type(parsed_query.tree) != QueryTypeEnum.DDL:
+                QueryProcessor._parse_cache.put(key, parsed_query)
+        return parsed_query
+
+    def _validate_syntax(self, query: str) -> None:
+        """
+        Validasi sintaks query, raise SyntaxError dengan posisi error jika tidak valid.
+        """
         validated_query = self.validator.validate(query)
         if not validated_query.is_valid:
             error_msg = f"{validated_query.error_message}\n"
@@ -79,31 +149,32 @@ class QueryProcessor(IQueryProcessor):
                     pointer = ' ' * (col + 6) + '^'
                     error_msg += pointer
             raise SyntaxError(f"{error_msg}")
-        
-        query = re.sub(r'\s+', ' ', query.strip()).strip()
-        
-        parsed_query = self.optimizer.parse_query(query)
-        optimized_query = self.optimizer.optimize_query(parsed_query)
-        return self._route_query(optimized_query)
-        
 
-    def _route_query(self, query: ParsedQuery):
+    def _route_query(self, query: ParsedQuery, count_only: bool = False):
         """
         Membaca query dan memanggil handler yang sesuai.
         """
         query_type = self._get_query_type(query.tree)
         if query_type == QueryTypeEnum.DML:
-            return self.dml_handler.handle(query)
+            return self.dml_handler.handle(query, count_only)
         elif query_type == QueryTypeEnum.TCL:
             return self.tcl_handler.handle(query)
         else:
-            return self.ddl_handler.handle(query)
+            try:
+                return self.ddl_handler.handle(query)
+            finally:
+                # schema berubah, plan yang sudah di-cache bisa jadi tidak valid
+                self.plan_cache.invalidate()
+                self.optimizer.invalidate_plans()
         
         
-    def execute(self, node: QueryTree, tx_id: int) -> Rows:
+    def execute(self, node: QueryTree, tx_id: int, count_only: bool = False) -> Rows:
         """
         Eksekusi query secara rekursif berdasarkan pohon query yang sudah di-parse.
         """
+        if count_only:
+            return self._execute_count(node, tx_id)
+        
         if node.type == QueryNodeType.TABLE:
             return self.scan_operator.execute(node.value, tx_id)
         
@@ -160,6 +231,38 @@ class QueryProcessor(IQueryProcessor):
 
         raise ValueError(f"Unknown query type: {node.type}")
     
+    def _execute_count(self, node: QueryTree, tx_id: int) -> Rows:
+        """
+        Hitung jumlah row hasil query tanpa membangun row output.
+        """
+        if node.type == QueryNodeType.ORDER_BY:
+            # urutan tidak mempengaruhi jumlah row
+            return self._execute_count(node.children[0], tx_id)
+        
+        elif node.type == QueryNodeType.PROJECTION:
+            rows = self._execute_count(node.children[0], tx_id)
+            return self.projection_operator.execute(rows, node.value, count_only=True)
+        
+        elif node.type == QueryNodeType.SELECTION and not self._check_index_selection(node):
+            child = node.children[0]
+            if child.type == QueryNodeType.TABLE:
+                # hanya jumlah yang dibutuhkan: scan columnar, kondisi dievaluasi per kolom
+                rows = self.scan_operator.execute(child.value, tx_id, columnar=True)
+            else:
+                rows = self.execute(child, tx_id)
+            return self.selection_operator.execute(rows, node.value, count_only=True)
+        
+        elif node.type == QueryNodeType.LIMIT:
+            rows = self._execute_count(node.children[0], tx_id)
+            try:
+                limit = int(node.value)
+            except ValueError:
+                raise ValueError(f"Invalid LIMIT value: {node.value}")
+            return Rows(data=[], rows_count=min(rows.rows_count, limit), schema=rows.schema)
+        
+        rows = self.execute(node, tx_id)
+        return Rows(data=[], rows_count=rows.rows_count, schema=rows.schema)
+    
     def _get_query_type(self, query_tree: QueryTree) -> QueryTypeEnum:
         """
         Mengembalikan tipe query berdasarkan pohon query.
@@ -333,12 +436,12 @@ class QueryProcessor(IQueryProcessor):
     def _check_index_selection(self, node: QueryTree):
         # cek apakah kondisi cukup sederhana
         # yang pake index: 
-        # "column = value", "column {< | <= | > | >=} value"
+        # "[table.]column = value", "[table.]column {< | <= | > | >=} value"
         if node.children[0].type != QueryNodeType.TABLE:
             return False
         
         cond_str = node.value.strip()
-        simple_pattern = r'^[a-zA-Z_][a-zA-Z0-9_]*\s*(=|<|<=|>|>=)\s*[\w\'"]+$'
+        simple_pattern = r'^(?:[a-zA-Z_][a-zA-Z0-9_]*\.)?[a-zA-Z_][a-zA-Z0-9_]*\s*(=|<|<=|>|>=)\s*[\w\'"]+$'
         if re.match(simple_pattern, cond_str):
             return True
         return False
@@ -13,11 +13,7 @@ def get_schema_from_table_name(schemas: List[TableSchema], table_name: str) -> T
 def validate_column_in_schemas(schemas: List[TableSchema], column_name: str) -> None:
     if column_name.count('.') == 0:
         # cari jumlah kemunculan kolom di semua schema
-        count = 0
-        for sch in schemas:
-            for col in sch.columns:
-                if col.name == column_name:
-                    count += 1
+        count = sum(column_name in sch.column_index for sch in schemas)
         if count == 0:
             raise ValueError(f"Column '{column_name}' not found in any table")
         elif count > 1:
@@ -27,7 +23,7 @@ def validate_column_in_schemas(schemas: List[TableSchema], column_name: str) ->
         # table_name.column_name
         table_name, col_name = column_name.split('.')
         schema = get_schema_from_table_name(schemas, table_name)
-        if not any(col.name == col_name for col in schema.columns):
+        if col_name not in schema.column_index:
             raise ValueError(f"Column '{col_name}' not found in table '{table_name}'")
     
     else:
@@ -39,9 +35,8 @@ def get_column_type(schemas: List[TableSchema], column_name: str) -> DataType:
     
     if column_name.count('.') == 0:
         for sch in schemas:
-            for col in sch.columns:
-                if col.name == column_name:
-                    schema = sch
+            if column_name in sch.column_index:
+                schema = sch
     
     elif column_name.count('.') == 1:
         # table_name.column_name
@@ -52,9 +47,9 @@ def get_column_type(schemas: List[TableSchema], column_name: str) -> DataType:
     if schema is None:
         raise ValueError(f"Invalid column '{column_name}'")
     
-    for col in schema.columns:
-        if col.name == lookup_name:
-            return col.data_type
+    position = schema.column_index.get(lookup_name)
+    if position is not None:
+        return schema.columns[position].data_type
         
     raise ValueError(f"Column '{column_name}' not found")
 
@@ -72,9 +67,11 @@ def get_column_value(row: Dict[str, Any], column_name: str) -> Any:
     raise ValueError(f"Column '{column_name}' not found in row")
 
 def get_column_from_schema(schema: TableSchema, column_name: str):
-    for col in schema.columns:
-        if col.name == column_name or column_name.endswith(f".{col.name}"):
-            return col
+    position = schema.column_index.get(column_name)
+    if position is None:
+        position = schema.column_index.get(column_name.rsplit('.', 1)[-1])
+    if position is not None:
+        return schema.columns[position]
     raise ValueError(f"Column '{column_name}' not found in schema '{schema.table_name}'")
 
 def check_referential_integrity(value: Any, fk_column: ColumnDefinition, sm: IStorageManager):
@@ -283,6 +283,11 @@ class SQLLexer:
             if current_char == quote_char:
                 value += current_char
                 self._advance()
+                # kutip ganda ('') adalah escape untuk satu kutip
+                if self.position < len(self.text) and self.text[self.position] == quote_char:
+                    value += quote_char
+                    self._advance()
+                    continue
                 found_closing_quote = True
                 break
             elif current_char == '\\' and self.position + 1 < len(self.text):
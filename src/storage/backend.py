@@ -0,0 +1,97 @@
+import os
+import shutil
+from typing import Dict, List, Set
+
+
+class FileBackend:
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def read(self, path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def write(self, path: str, data: bytes) -> None:
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def remove(self, path: str) -> None:
+        if os.path.exists(path):
+            os.remove(path)
+
+    def listdir(self, directory: str) -> List[str]:
+        if not os.path.exists(directory):
+            return []
+        return os.listdir(directory)
+
+    def makedirs(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+
+    def clear(self, directory: str) -> None:
+        if os.path.exists(directory):
+            shutil.rmtree(directory)
+
+
+class MemoryBackend:
+
+    def __init__(self):
+        self.files: Dict[str, bytes] = {}
+        self.directories: Set[str] = set()
+
+    def exists(self, path: str) -> bool:
+        path = os.path.normpath(path)
+        return path in self.files or path in self.directories
+
+    def read(self, path: str) -> bytes:
+        path = os.path.normpath(path)
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        return self.files[path]
+
+    def write(self, path: str, data: bytes) -> None:
+        self.files[os.path.normpath(path)] = bytes(data)
+
+    def remove(self, path: str) -> None:
+        self.files.pop(os.path.normpath(path), None)
+
+    def listdir(self, directory: str) -> List[str]:
+        directory = os.path.normpath(directory)
+        return [
+            os.path.basename(path)
+            for path in self.files
+            if os.path.dirname(path) == directory
+        ]
+
+    def makedirs(self, directory: str) -> None:
+        self.directories.add(os.path.normpath(directory))
+
+    def clear(self, directory: str) -> None:
+        prefix = os.path.normpath(directory) + os.sep
+        self.files = {p: d for p, d in self.files.items() if not p.startswith(prefix)}
+        self.directories = {d for d in self.directories if not d.startswith(prefix)}
+
+    def snapshot(self, directory: str) -> Dict[str, bytes]:
+        # path relatif terhadap directory supaya bisa di-restore ke directory lain
+        directory = os.path.normpath(directory)
+        prefix = directory + os.sep
+        return {
+            os.path.relpath(path, directory): data
+            for path, data in self.files.items()
+            if path.startswith(prefix)
+        }
+
+    def restore(self, directory: str, snapshot: Dict[str, bytes]) -> None:
+        # bytes immutable, jadi cukup salin referensinya
+        for relative_path, data in snapshot.items():
+            path = os.path.normpath(os.path.join(directory, relative_path))
+            self.files[path] = data
+            self.directories.add(os.path.dirname(path))
+
+
+def create_backend(backend: str):
+    if backend == "file":
+        return FileBackend()
+    if backend == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Invalid storage backend '{backend}'. Use 'file' or 'memory'")
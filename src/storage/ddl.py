@@ -2,20 +2,22 @@ import os
 from typing import Optional
 from src.core.models import TableSchema
 from src.storage.serializer import Serializer
+from src.storage.backend import FileBackend
 
 
 class DDLManager:
     
-    def __init__(self, data_directory: str = "data"):
+    def __init__(self, data_directory: str = "data", backend=None):
         self.data_directory = data_directory
+        self.backend = backend if backend is not None else FileBackend()
         self.schema_directory = os.path.join(data_directory, "schemas")
         self.table_directory = os.path.join(data_directory, "tables")
         self.schema_directory = self.schema_directory 
         self.table_directory = self.table_directory
         self.serializer = Serializer()
         
-        os.makedirs(self.schema_directory, exist_ok=True)
-        os.makedirs(self.table_directory, exist_ok=True)
+        self.backend.makedirs(self.schema_directory)
+        self.backend.makedirs(self.table_directory)
     
     def get_schema_path(self, table_name: str) -> str:
         return os.path.join(self.schema_directory, f"{table_name}.dat")
@@ -24,47 +26,38 @@ class DDLManager:
         return os.path.join(self.table_directory, f"{table_name}.dat")
     
     def schema_exists(self, table_name: str) -> bool:
-        return os.path.exists(self.get_schema_path(table_name))
+        return self.backend.exists(self.get_schema_path(table_name))
     
     def save_schema(self, schema: TableSchema) -> None:
         schema_path = self.get_schema_path(schema.table_name)
         serialized_schema = self.serializer.serialize_schema(schema)
         
-        with open(schema_path, 'wb') as f:
-            f.write(serialized_schema)
+        self.backend.write(schema_path, serialized_schema)
     
     def load_schema(self, table_name: str) -> Optional[TableSchema]:
         schema_path = self.get_schema_path(table_name)
         
-        if not os.path.exists(schema_path):
+        if not self.backend.exists(schema_path):
             return None
         
-        with open(schema_path, 'rb') as f:
-            serialized_schema = f.read()
+        serialized_schema = self.backend.read(schema_path)
         
         return self.serializer.deserialize_schema(serialized_schema)
     
     def delete_schema(self, table_name: str) -> None:
         schema_path = self.get_schema_path(table_name)
-        
-        if os.path.exists(schema_path):
-            os.remove(schema_path)
+        self.backend.remove(schema_path)
     
     def create_table_file(self, table_name: str) -> None:
         table_path = self.get_table_path(table_name)
-        open(table_path, 'wb').close()
+        self.backend.write(table_path, b'')
     
     def delete_table_file(self, table_name: str) -> None:
         table_path = self.get_table_path(table_name)
-        
-        if os.path.exists(table_path):
-            os.remove(table_path)
+        self.backend.remove(table_path)
     
     def list_schema_files(self) -> list[str]:
-        if not os.path.exists(self.schema_directory):
-            return []
-        
-        schema_files = os.listdir(self.schema_directory)
+        schema_files = self.backend.listdir(self.schema_directory)
         return [f.replace('.dat', '') for f in schema_files if f.endswith('.dat')]
     
     def validate_schema(self, schema: TableSchema) -> None:
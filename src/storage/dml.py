@@ -2,32 +2,35 @@ import os
 from typing import List, Any, Dict, Optional
 from src.core.models import Rows, TableSchema, Condition, ComparisonOperator
 from src.storage.serializer import Serializer
+from src.storage.backend import FileBackend
 
 
 class DMLManager:
     
-    def __init__(self, data_directory: str, buffer_pool=None):
+    def __init__(self, data_directory: str, buffer_pool=None, backend=None):
         self.data_directory = data_directory
+        self.backend = backend if backend is not None else FileBackend()
         self.table_directory = os.path.join(data_directory, "tables")
         self.serializer = Serializer()
         self.buffer_pool = buffer_pool
         
-        os.makedirs(self.table_directory, exist_ok=True)
+        # table -> (page data dan kolom pk saat map dibangun, {primary key: row})
+        self.pk_maps: Dict[str, tuple] = {}
+        
+        self.backend.makedirs(self.table_directory)
     
     def get_table_path(self, table_name: str) -> str:
         return os.path.join(self.table_directory, f"{table_name}.dat")
     
     def _load_page_data(self, table_name: str) -> bytes:
         table_path = self.get_table_path(table_name)
-        if not os.path.exists(table_path):
+        if not self.backend.exists(table_path):
             return b''
-        with open(table_path, 'rb') as f:
-            return f.read()
+        return self.backend.read(table_path)
     
     def _write_page_data(self, table_name: str, data: bytes) -> None:
         table_path = self.get_table_path(table_name)
-        with open(table_path, 'wb') as f:
-            f.write(data)
+        self.backend.write(table_path, data)
     
     def _load_from_disk(self, table_name: str, schema: TableSchema) -> Rows:
         data = self._load_page_data(table_name)
@@ -59,14 +62,67 @@ class DMLManager:
         return rows
     
     def save_all_rows(self, table_name: str, rows: Rows, schema: TableSchema) -> None:
+        self._store_rows(table_name, rows, schema)
+    
+    def _store_rows(self, table_name: str, rows: Rows, schema: TableSchema) -> bytes:
+        serialized = self.serializer.serialize_rows(rows, schema)
+        
         if self.buffer_pool is None:
-            self._save_to_disk(table_name, rows, schema)
-            return
+            self._write_page_data(table_name, serialized)
+        else:
+            self.buffer_pool.put_page(f"table:{table_name}", serialized, mark_dirty=True)
+        
+        return serialized
+    
+    def _current_page_data(self, table_name: str) -> bytes:
+        if self.buffer_pool is None:
+            return self._load_page_data(table_name)
         
         page_id = f"table:{table_name}"
-        serialized = self.serializer.serialize_rows(rows, schema)
+        data = self.buffer_pool.get_page(page_id, lambda: self._load_page_data(table_name))
+        self.buffer_pool.unpin_page(page_id)
+        return data
+    
+    def append_row(self, table_name: str, rows: Rows, row: Dict[str, Any], schema: TableSchema) -> None:
+        """
+        Simpan rows yang sudah ditambah `row` di akhir. Map pk di-update write-through:
+        hanya row baru yang dibentuk ulang, bukan deserialize seluruh page.
+        """
+        pk_name = schema.primary_key
+        cached = self.pk_maps.get(table_name)
+        is_current = cached is not None and cached[0] == (self._current_page_data(table_name), pk_name)
+        
+        data = self._store_rows(table_name, rows, schema)
+        if not is_current:
+            return
+        
+        stored = self.stored_form(row, schema)
+        cached[1][stored.get(pk_name)] = stored
+        self.pk_maps[table_name] = ((data, pk_name), cached[1])
+    
+    def stored_form(self, row: Dict[str, Any], schema: TableSchema) -> Dict[str, Any]:
+        """Bentuk row sama persis dengan hasil deserialize page (NULL, panjang string, dst.)."""
+        return self.serializer.deserialize_row(self.serializer.serialize_row(row, schema), schema)
+    
+    def get_row_by_pk(self, table_name: str, schema: TableSchema, pk_value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Ambil satu row berdasarkan primary key tanpa scan linear.
+        Map pk -> row dibangun sekali per versi page dan dibangun ulang saat isi page berubah.
+        """
+        pk_name = schema.primary_key
+        if not pk_name:
+            raise ValueError(f"Table '{table_name}' has no primary key")
+        
+        data = self._current_page_data(table_name)
+        
+        cached = self.pk_maps.get(table_name)
+        if cached is None or cached[0] != (data, pk_name):
+            rows = self.serializer.deserialize_rows(data, schema).data if data else []
+            cached = ((data, pk_name), {row.get(pk_name): row for row in rows})
+            self.pk_maps[table_name] = cached
         
-        self.buffer_pool.put_page(page_id, serialized, mark_dirty=True)
+        row = cached[1].get(pk_value)
+        return dict(row) if row is not None else None
     
     def flush_table(self, table_name: str) -> None:
         if self.buffer_pool is None:
@@ -24,8 +24,8 @@ class BPlusTreeNode:
 
 class BPlusTreeIndex(BaseIndex):
 
-    def __init__(self, table_name: str, column_name: str, data_directory: str = "data", order: int = 4):
-        super().__init__(table_name, column_name, data_directory)
+    def __init__(self, table_name: str, column_name: str, data_directory: str = "data", order: int = 4, backend=None):
+        super().__init__(table_name, column_name, data_directory, backend)
         self.order = order 
         self.root = BPlusTreeNode(order, is_leaf=True)
         self.load() 
@@ -334,6 +334,10 @@ class BPlusTreeIndex(BaseIndex):
             if index < len(node.children):
                 self._delete_recursive(node.children[index], key, row_id)
 
+    def clear(self) -> None:
+        self.root = BPlusTreeNode(self.order, is_leaf=True)
+        self.save()
+
     def _get_state(self) -> dict:
         """Return state untuk serialisasi"""
         return {
@@ -2,18 +2,20 @@ from abc import ABC, abstractmethod
 from typing import Any, List, Optional
 import pickle
 import os
+from src.storage.backend import FileBackend
 
 
 class BaseIndex(ABC):
-    def __init__(self, table_name: str, column_name: str, data_directory: str = "data"):
+    def __init__(self, table_name: str, column_name: str, data_directory: str = "data", backend=None):
         self.table_name = table_name
         self.column_name = column_name
         self.data_directory = data_directory
+        self.backend = backend if backend is not None else FileBackend()
         self.index_file = self._get_index_file_path()
 
     def _get_index_file_path(self) -> str:
         index_dir = os.path.join(self.data_directory, "indexes", self.table_name)
-        os.makedirs(index_dir, exist_ok=True)
+        self.backend.makedirs(index_dir)
         return os.path.join(index_dir, f"{self.column_name}_{self.get_index_type()}.idx")
 
     @abstractmethod
@@ -72,15 +74,18 @@ class BaseIndex(ABC):
 
     def save(self) -> None:
         """Save index structure ke disk"""
-        with open(self.index_file, 'wb') as f:
-            pickle.dump(self._get_state(), f)
+        self.backend.write(self.index_file, pickle.dumps(self._get_state()))
 
     def load(self) -> None:
         """Load index structure dari disk"""
-        if os.path.exists(self.index_file):
-            with open(self.index_file, 'rb') as f:
-                state = pickle.load(f)
-                self._set_state(state)
+        if self.backend.exists(self.index_file):
+            state = pickle.loads(self.backend.read(self.index_file))
+            self._set_state(state)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Kosongkan index (semua key dihapus) dan simpan ke disk"""
+        pass
 
     @abstractmethod
     def _get_state(self) -> dict:
@@ -93,5 +98,4 @@ class BaseIndex(ABC):
         pass
 
     def destroy(self) -> None:
-        if os.path.exists(self.index_file):
-            os.remove(self.index_file)
+        self.backend.remove(self.index_file)
@@ -1,4 +1,5 @@
 import struct
+import sys
 from typing import Dict, Any, List
 from src.core.models import DataType, ColumnDefinition, TableSchema, Rows, ForeignKeyConstraint, ForeignKeyAction
 
@@ -215,7 +216,7 @@ class Serializer:
         
         table_name_len = struct.unpack('H', data[offset:offset + 2])[0]
         offset += 2
-        table_name = data[offset:offset + table_name_len].decode('utf-8')
+        table_name = sys.intern(data[offset:offset + table_name_len].decode('utf-8'))
         offset += table_name_len
         
         num_columns = struct.unpack('H', data[offset:offset + 2])[0]
@@ -225,7 +226,8 @@ class Serializer:
         for _ in range(num_columns):
             col_name_len = struct.unpack('H', data[offset:offset + 2])[0]
             offset += 2
-            col_name = data[offset:offset + col_name_len].decode('utf-8')
+            # di-intern supaya semua dict row memakai objek key yang sama
+            col_name = sys.intern(data[offset:offset + col_name_len].decode('utf-8'))
             offset += col_name_len
             
             data_type_len = struct.unpack('H', data[offset:offset + 2])[0]
@@ -8,37 +8,46 @@ from src.core.models import (
     Statistic, 
     TableSchema,
     Rows,
-    Condition 
+    Condition,
+    ComparisonOperator
 )
 from src.storage.ddl import DDLManager
 from src.storage.dml import DMLManager
 from src.storage.statistics import StatisticsManager
 from src.storage.index import BPlusTreeIndex, BaseIndex
 from src.storage.buffer_pool import BufferPool
+from src.storage.backend import create_backend
 
 
 class StorageManager(IStorageManager):
     
-    def __init__(self, data_directory: str = "data", use_buffer: bool = True, buffer_size: int = 200):
+    def __init__(self, data_directory: str = "data", use_buffer: bool = True, buffer_size: int = 200, backend: str = "file"):
         self.data_directory = data_directory
         self.use_buffer = use_buffer
+        self.backend = create_backend(backend)
+
+        # path relatif di-anchor ke src/, path absolut dipakai apa adanya
+        if os.path.isabs(data_directory):
+            self.data_path = data_directory
+        else:
+            self.data_path = f"src/{data_directory}"
         
         if use_buffer:
             self.buffer_pool = BufferPool(pool_size=buffer_size)
         else:
             self.buffer_pool = None
         
-        self.ddl_manager = DDLManager(f"src/{self.data_directory}")
-        self.dml_manager = DMLManager(f"src/{self.data_directory}", self.buffer_pool)
-        self.statistics_manager = StatisticsManager(f"src/{self.data_directory}")
+        self.ddl_manager = DDLManager(self.data_path, self.backend)
+        self.dml_manager = DMLManager(self.data_path, self.buffer_pool, self.backend)
+        self.statistics_manager = StatisticsManager(self.data_path)
         self.indexes: Dict[tuple, BaseIndex] = {}
+        self.schema_version = 0
     
     def _write_page_to_disk(self, page_id: str, data: bytes) -> None:
         if page_id.startswith("table:"):
             tbl_name = page_id.split(":", 1)[1]
             table_path = self.dml_manager.get_table_path(tbl_name)
-            with open(table_path, 'wb') as f:
-                f.write(data)
+            self.backend.write(table_path, data)
     
     def read_block(self, data_retrieval: DataRetrieval) -> Rows:
         schema = self.ddl_manager.load_schema(data_retrieval.table_name)
@@ -220,6 +229,11 @@ class StorageManager(IStorageManager):
         rows = None
         
         if data_retrieval.conditions:
+            # kesamaan pada primary key hasilnya paling banyak satu row, jadi dicek lebih dulu:
+            # seek lewat map pk, sedangkan jalur index tetap men-deserialize seluruh page
+            rows = self._try_read_by_primary_key(data_retrieval.table_name, schema, data_retrieval.conditions)
+        
+        if rows is None and data_retrieval.conditions:
             rows = self.dml_manager.try_read_with_index(
                 data_retrieval.table_name,
                 schema,
@@ -245,6 +259,25 @@ class StorageManager(IStorageManager):
         
         return rows
     
+    def _try_read_by_primary_key(self, table: str, schema: TableSchema, conditions: List[Condition]) -> Optional[Rows]:
+        pk_name = schema.primary_key
+        if not pk_name:
+            return None
+        
+        for condition in conditions:
+            if condition.column != pk_name or condition.operator != ComparisonOperator.EQ:
+                continue
+            
+            row = self.dml_manager.get_row_by_pk(table, schema, condition.value)
+            rows = Rows(data=[row] if row is not None else [], rows_count=1 if row is not None else 0)
+            
+            remaining_conditions = [c for c in conditions if c is not condition]
+            if remaining_conditions:
+                rows = self.dml_manager.apply_conditions(rows, remaining_conditions)
+            return rows
+        
+        return None
+    
     def write_buffer(self, data_write: DataWrite) -> int:
         table = data_write.table_name
         schema = self.ddl_manager.load_schema(table)
@@ -284,16 +317,86 @@ class StorageManager(IStorageManager):
                     if value is not None:
                         index.insert(value, new_row_id)
             
-            self.dml_manager.save_all_rows(table, all_rows, schema)
+            self.dml_manager.append_row(table, all_rows, new_row, schema)
             return 1
 
+        return self._write_updates(table, schema, all_rows, [data_write])
+    
+    def normalize_row(self, schema: TableSchema, row: Dict[str, Any]) -> Dict[str, Any]:
+        # cast + serialize seperti write_buffer, tanpa I/O
+        return self.dml_manager.stored_form(self.dml_manager._cast_by_schema(dict(row), schema), schema)
+    
+    def write_buffer_batch(self, data_writes: List[DataWrite]) -> int:
+        """
+        UPDATE banyak row pada satu tabel: page dimuat dan disimpan sekali,
+        bukan sekali per DataWrite seperti write_buffer.
+        """
+        if not data_writes:
+            return 0
+        
+        table = data_writes[0].table_name
+        if any(dw.table_name != table or not dw.is_update for dw in data_writes):
+            return sum(self.write_buffer(dw) for dw in data_writes)
+        
+        schema = self.ddl_manager.load_schema(table)
+        if schema is None:
+            raise ValueError(f"Table '{table}' does not exist")
+        
+        all_rows: Rows = self.dml_manager.load_all_rows(table, schema)
+        return self._write_updates(table, schema, all_rows, data_writes)
+    
+    def _write_updates(self, table: str, schema: TableSchema, all_rows: Rows, data_writes: List[DataWrite]) -> int:
+        """
+        Terapkan semua DataWrite UPDATE ke all_rows lalu simpan sekali. Semua write
+        (termasuk cek konflik pk) selesai dulu di all_rows; index baru diubah setelah
+        page tersimpan, jadi write yang gagal di tengah tidak meninggalkan index basi.
+        """
+        pk_name = schema.primary_key
+        # posisi row per nilai pk dibangun sekali, jadi write yang kondisinya pk = nilai
+        # tidak perlu scan seluruh row (dan cek konflik pk juga cukup lookup)
+        pk_positions = {row.get(pk_name): i for i, row in enumerate(all_rows.data)} if pk_name else {}
+        index_changes: List[tuple] = []
+        
+        updated_count = 0
+        for data_write in data_writes:
+            updated_count += self._apply_update(schema, all_rows, data_write, pk_positions, index_changes)
+        
+        if updated_count > 0:
+            all_rows.rows_count = len(all_rows.data)
+            self.dml_manager.save_all_rows(table, all_rows, schema)
+            
+            for column, old_value, new_value, row_id in index_changes:
+                index = self.indexes.get((table, column))
+                if index is None:
+                    continue
+                if old_value is not None:
+                    index.delete(old_value, row_id)
+                if new_value is not None:
+                    index.insert(new_value, row_id)
+        
+        return updated_count
+    
+    def _apply_update(self, schema: TableSchema, all_rows: Rows, data_write: DataWrite,
+                      pk_positions: Dict[Any, int], index_changes: List[tuple]) -> int:
+        """
+        Terapkan satu DataWrite UPDATE ke all_rows (in-place). Perubahan index hanya
+        dicatat ke index_changes sebagai (kolom, nilai lama, nilai baru, posisi row).
+        """
+        pk_name = schema.primary_key
         conditions: List[Condition] = data_write.conditions
         updated_count = 0
         set_expr: Dict[str, Any] = dict(data_write.data)
 
-        for i, row in enumerate(all_rows.data):
+        candidates = range(len(all_rows.data))
+        if pk_name and len(conditions) == 1:
+            condition = conditions[0]
+            if condition.column == pk_name and condition.operator == ComparisonOperator.EQ:
+                position = pk_positions.get(condition.value)
+                candidates = [] if position is None else [position]
+
+        for i in candidates:
+            row = all_rows.data[i]
             if self.dml_manager._matches(row, conditions):
-                old_row = row.copy()
                 new_row = row.copy()
 
                 for k, v in set_expr.items():
@@ -302,38 +405,25 @@ class StorageManager(IStorageManager):
                 new_row = self.dml_manager._cast_by_schema(new_row, schema)
 
                 if pk_name and (pk_name in set_expr):
+                    # pk_positions selalu mengikuti all_rows, termasuk write sebelumnya di batch
                     new_pk = new_row[pk_name]
-                    
-                    if self.has_index(table, pk_name):
-                        index = self.indexes[(table, pk_name)]
-                        existing_ids = index.search(new_pk)
-                        if existing_ids and i not in existing_ids:
-                            raise ValueError(f"UPDATE causes PK conflict '{pk_name}'={new_pk}")
-                    else:
-                        for j, other in enumerate(all_rows.data):
-                            if j != i and other.get(pk_name) == new_pk:
-                                raise ValueError(f"UPDATE causes PK conflict '{pk_name}'={new_pk}")
+                    if pk_positions.get(new_pk, i) != i:
+                        raise ValueError(f"UPDATE causes PK conflict '{pk_name}'={new_pk}")
 
                 for column_def in schema.columns:
                     column = column_def.name
-                    if self.has_index(table, column):
-                        index = self.indexes[(table, column)]
-                        old_value = old_row.get(column)
-                        new_value = new_row.get(column)
-                        
-                        if old_value != new_value:
-                            if old_value is not None:
-                                index.delete(old_value, i)
-                            if new_value is not None:
-                                index.insert(new_value, i)
+                    old_value = row.get(column)
+                    new_value = new_row.get(column)
+                    if old_value != new_value:
+                        index_changes.append((column, old_value, new_value, i))
+                
+                if pk_name and row.get(pk_name) != new_row.get(pk_name):
+                    pk_positions.pop(row.get(pk_name), None)
+                    pk_positions[new_row.get(pk_name)] = i
                 
                 all_rows.data[i] = new_row
                 updated_count += 1
 
-        if updated_count > 0:
-            all_rows.rows_count = len(all_rows.data)
-            self.dml_manager.save_all_rows(table, all_rows, schema)
-
         return updated_count
     
     def delete_buffer(self, data_deletion: DataDeletion) -> int:
@@ -435,8 +525,7 @@ class StorageManager(IStorageManager):
         if schema is None:
             raise ValueError(f"Table '{table}' does not exist")
 
-        column_exists = any(col.name == column for col in schema.columns)
-        if not column_exists:
+        if column not in schema.column_index:
             raise ValueError(f"Column '{column}' does not exist in table '{table}'")
 
         if (table, column) in self.indexes:
@@ -444,7 +533,7 @@ class StorageManager(IStorageManager):
 
         index_type_lower = index_type.lower()
         if index_type_lower in ['b_plus_tree', 'btree', 'b+tree']:
-            index = BPlusTreeIndex(table, column, f"src/{self.data_directory}")
+            index = BPlusTreeIndex(table, column, self.data_path, backend=self.backend)
         else:
             raise ValueError(f"Invalid index type '{index_type}'. Use 'b_plus_tree', 'btree', 'b+tree', or 'hash'")
 
@@ -456,6 +545,7 @@ class StorageManager(IStorageManager):
         
         index.save()
         self.indexes[(table, column)] = index
+        self.schema_version += 1
     
     def drop_index(self, table: str, column: str) -> None:
         if (table, column) not in self.indexes:
@@ -465,6 +555,7 @@ class StorageManager(IStorageManager):
         index.destroy()
 
         del self.indexes[(table, column)]
+        self.schema_version += 1
     
     def has_index(self, table: str, column: str) -> bool:
         return (table, column) in self.indexes
@@ -477,6 +568,7 @@ class StorageManager(IStorageManager):
 
         self.ddl_manager.save_schema(schema)
         self.ddl_manager.create_table_file(schema.table_name)
+        self.schema_version += 1
 
     def drop_table(self, table_name: str) -> None:
         if not self.ddl_manager.schema_exists(table_name):
@@ -488,6 +580,35 @@ class StorageManager(IStorageManager):
 
         self.ddl_manager.delete_schema(table_name)
         self.ddl_manager.delete_table_file(table_name)
+        self.schema_version += 1
+
+    def truncate_table(self, table_name: str) -> None:
+        """
+        Hapus semua row tanpa drop schema: page dikosongkan dan index di-reset di tempat,
+        jadi tidak perlu drop + create ulang table dan index-nya.
+        """
+        if not self.ddl_manager.schema_exists(table_name):
+            raise ValueError(f"Table '{table_name}' does not exist")
+
+        self.ddl_manager.create_table_file(table_name)
+        if self.buffer_pool is not None:
+            # isi page sama dengan file yang baru dikosongkan, jadi tidak perlu ditandai dirty
+            self.buffer_pool.put_page(f"table:{table_name}", b'', mark_dirty=False)
+        self.dml_manager.pk_maps.pop(table_name, None)
+
+        for (table, _), index in self.indexes.items():
+            if table == table_name:
+                index.clear()
+
+    def drop_all(self) -> None:
+        if self.buffer_pool is not None:
+            self.buffer_pool.clear()
+        self.indexes.clear()
+
+        self.backend.clear(self.data_path)
+        self.backend.makedirs(self.ddl_manager.schema_directory)
+        self.backend.makedirs(self.ddl_manager.table_directory)
+        self.schema_version += 1
 
     def get_table_schema(self, table_name: str) -> Optional[TableSchema]:
         return self.ddl_manager.load_schema(table_name)
@@ -500,4 +621,5 @@ class StorageManager(IStorageManager):
             raise ValueError(f"Table '{schema.table_name}' does not exist")
 
         self.ddl_manager.validate_schema(schema)
-        self.ddl_manager.save_schema(schema)
\ No newline at end of file
+        self.ddl_manager.save_schema(schema)
+        self.schema_version += 1
\ No newline at end of file
@@ -1,6 +1,7 @@
+import importlib.util
 import os
 import sys
-import ast
+from typing import List, Optional
 import pytest
 from src.core import IStorageManager
 from src.core.models.storage import Statistic, TableSchema, DataRetrieval, DataWrite, DataDeletion, ColumnDefinition, DataType, Condition, ComparisonOperator
@@ -16,95 +17,14 @@ def import_cardinality_estimator_directly():
     if not os.path.exists(CARDINALITY_ESTIMATOR_PATH):
         raise ImportError(f"CardinalityEstimator file not found at: {CARDINALITY_ESTIMATOR_PATH}")
     
-    print(f"Reading CardinalityEstimator from: {CARDINALITY_ESTIMATOR_PATH}")
+    spec = importlib.util.spec_from_file_location("src.optimizer.cost._cardinality_estimator_under_test", CARDINALITY_ESTIMATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
     
-    with open(CARDINALITY_ESTIMATOR_PATH, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    try:
-        tree = ast.parse(content)
-        print("✓ File parsed successfully")
-        
-        class_found = any(
-            isinstance(node, ast.ClassDef) and node.name == 'CardinalityEstimator' 
-            for node in tree.body
-        )
-        if not class_found:
-            raise ImportError("CardinalityEstimator class not found in file")
-        print("✓ CardinalityEstimator class found")
-        
-    except SyntaxError as e:
-        raise ImportError(f"Syntax error in CardinalityEstimator file: {e}")
-    
-    namespace = {
-        'Dict': dict,
-        'List': list, 
-        'Optional': type('Optional', (), {}),
-        'Set': set,
-        'math': __import__('math'),
-        're': __import__('re'),
-        'IStorageManager': IStorageManager,
-        # Now use the actual imported classes for the namespace
-        'Statistic': Statistic,
-        'Condition': Condition,
-        'ComparisonOperator': ComparisonOperator,
-        'QueryTree': QueryTree,
-        'DataType': DataType,
-    }
-    
-    # Remove imports that are now handled by namespace or are directly imported
-    import_lines_to_remove = [
-        'from src.core.models.query import QueryTree', # This line should be kept in the actual file, but its a local def
-        'from src.core.models.storage import Statistic, Condition, ComparisonOperator', # Also this should be kept
-        'from src.core import IStorageManager', # This too
-    ]
-    
-    # Remove local class definitions for testing
-    local_class_definitions_to_remove = [
-        'class QueryTree:',
-        'class Statistic:',
-        'class Condition:',
-        'class ComparisonOperator:'
-    ]
-    
-    modified_content = content
-    # For robust removal, find exact class definitions and replace with pass
-    for class_keyword in local_class_definitions_to_remove:
-        idx = 0
-        while True:
-            idx = modified_content.find(class_keyword, idx) 
-            if idx == -1:
-                break
-            
-            # Find the end of the class block
-            end_of_class = modified_content.find('\nclass ', idx + 1) # Look for next class or end of file
-            if end_of_class == -1:
-                end_of_class = len(modified_content)
-            
-            # Replace the class body with 'pass'
-            modified_content = modified_content[:idx] + class_keyword + modified_content[idx:].split('\n', 1)[0] + '\n    pass' + modified_content[end_of_class:]
-            idx += len(class_keyword) # Move past this class
-    
-    # Comment out old import lines for the actual module being imported
-    modified_content = content # Reset content to avoid double-modifying
-    for import_line in import_lines_to_remove:
-        # Check if the line exists before attempting to replace, to avoid unintended changes
-        if import_line.strip() in modified_content: # Use strip for a robust check
-            modified_content = modified_content.replace(import_line, f'# {import_line}  # REMOVED FOR TESTING')
-
-    print("✓ Removed problematic imports and local class definitions for testing")
-    
-    try:
-        exec(modified_content, namespace)
-        print("✓ Successfully executed CardinalityEstimator file")
-    except Exception as e:
-        raise ImportError(f"Error executing CardinalityEstimator file: {e}")
-    
-    if 'CardinalityEstimator' not in namespace:
+    if not hasattr(module, 'CardinalityEstimator'):
         raise ImportError("CardinalityEstimator class not found after execution")
     
-    print("✓ SUCCESS: CardinalityEstimator imported directly from file!")
-    return namespace['CardinalityEstimator']
+    return module.CardinalityEstimator
 
 
 try:
@@ -1,7 +1,7 @@
-import math
+import importlib.util
 import os
 import sys
-import ast
+from typing import List, Optional
 import pytest
 from src.core import IStorageManager
 from src.core.models.storage import Statistic, TableSchema, DataRetrieval, DataWrite, DataDeletion, ColumnDefinition, DataType, Condition, ComparisonOperator
@@ -13,107 +13,32 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 COST_MODEL_PATH = os.path.join(os.path.dirname(__file__), '../../src/optimizer/cost/cost_model.py')
 
 
-def import_cost_model_directly():
-    if not os.path.exists(COST_MODEL_PATH):
-        raise ImportError(f"CostModel file not found at: {COST_MODEL_PATH}")
-    
-    print(f"Reading CostModel from: {COST_MODEL_PATH}")
-    
-    with open(COST_MODEL_PATH, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    try:
-        tree = ast.parse(content)
-        print("✓ File parsed successfully")
-        
-        class_found = any(
-            isinstance(node, ast.ClassDef) and node.name == 'CostModel' 
-            for node in tree.body
-        )
-        if not class_found:
-            raise ImportError("CostModel class not found in file")
-        print("✓ CostModel class found")
-        
-    except SyntaxError as e:
-        raise ImportError(f"Syntax error in CostModel file: {e}")
+class MockCardinalityEstimatorForCostModel:
+    # CostModel dites terpisah dari estimator asli
+    def __init__(self, storage_manager):
+        self.storage_manager = storage_manager
     
-    namespace = {
-        'math': math,
-        'Dict': dict,
-        'List': list, 
-        'Optional': type('Optional', (), {}),
-        'IStorageManager': IStorageManager,
-        'Statistic': Statistic,
-        'QueryTree': QueryTree,
-        'CardinalityEstimator': object, # Mock CardinalityEstimator for namespace if needed
-    }
-    
-    # Remove local class definitions for testing
-    local_class_definitions_to_remove = [
-        'class QueryTree:',
-        'class Statistic:',
-        'class CardinalityEstimator:'
-    ]
+    def is_equijoin(self, condition: str) -> bool:
+        return '=' in condition and '!' not in condition and '<' not in condition and '>' not in condition
     
-    modified_content = content
-    # For robust removal, find exact class definitions and replace with pass
-    for class_keyword in local_class_definitions_to_remove:
-        idx = 0
-        while True:
-            idx = modified_content.find(class_keyword, idx)
-            if idx == -1:
-                break
-            
-            # Find the end of the class block
-            end_of_class = modified_content.find('\nclass ', idx + 1) # Look for next class or end of file
-            if end_of_class == -1:
-                end_of_class = len(modified_content)
-            
-            # Replace the class body with 'pass'
-            modified_content = modified_content[:idx] + class_keyword + modified_content[idx:].split('\n', 1)[0] + '\n    pass' + modified_content[end_of_class:]
-            idx += len(class_keyword) # Move past this class
-    
-    # Comment out old import lines for the actual module being imported
-    modified_content = content # Reset content to avoid double-modifying
-    import_lines_to_remove = [
-        'from src.core.models.query import QueryTree',
-        'from src.core.models.storage import Statistic',
-        'from .cardinality_estimator import CardinalityEstimator',
-    ]
-    for import_line in import_lines_to_remove:
-        if import_line.strip() in modified_content:
-            modified_content = modified_content.replace(import_line, f'# {import_line}  # REMOVED FOR TESTING')
+    def estimate_condition_selectivity(self, stats, condition): return 0.5 # Dummy
 
-    print("✓ Removed problematic imports and local class definitions for testing")
+
+def import_cost_model_directly():
+    if not os.path.exists(COST_MODEL_PATH):
+        raise ImportError(f"CostModel file not found at: {COST_MODEL_PATH}")
     
-    try:
-        # Before executing, replace CardinalityEstimator with a mock or a simple object
-        # since the real one expects storage_manager, not statistics
-        # The CostModel itself relies on CardinalityEstimator, so we need a placeholder
-        class MockCardinalityEstimatorForCostModel:
-            def __init__(self, storage_manager):
-                self.storage_manager = storage_manager
-            
-            def is_equijoin(self, condition: str) -> bool:
-                # Mock implementation for the method used by CostModel
-                return '=' in condition and '!' not in condition and '<' not in condition and '>' not in condition
-            
-            # Add other methods that CostModel might call on CardinalityEstimator if needed
-            def estimate_condition_selectivity(self, stats, condition): return 0.5 # Dummy
-        
-        namespace['CardinalityEstimator'] = MockCardinalityEstimatorForCostModel
-
-
-        exec(modified_content, namespace)
-        print("✓ Successfully executed CostModel file")
-    except Exception as e:
-        raise ImportError(f"Error executing CostModel file: {e}")
+    # dimuat sebagai modul terpisah (tidak didaftarkan di sys.modules) supaya
+    # CardinalityEstimator bisa diganti tanpa mempengaruhi modul asli
+    spec = importlib.util.spec_from_file_location("src.optimizer.cost._cost_model_under_test", COST_MODEL_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
     
-    if 'CostModel' not in namespace:
+    if not hasattr(module, 'CostModel'):
         raise ImportError("CostModel class not found after execution")
     
-    print("✓ SUCCESS: CostModel imported directly from file!")
-    return namespace['CostModel']
+    module.CardinalityEstimator = MockCardinalityEstimatorForCostModel
+    return module.CostModel
 
 
 try:
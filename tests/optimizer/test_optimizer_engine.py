@@ -178,6 +178,19 @@ class TestQueryOptimizer:
         assert isinstance(result, ParsedQuery)
         assert result.query == "SELECT * FROM Employee"
 
+    def test_optimize_query_memoizes_identical_trees(self, optimizer):
+        """Identical trees are optimized once until the plans are invalidated."""
+        first = optimizer.optimize_query(optimizer.parse_query("SELECT * FROM Employee WHERE Employee.id = 1"))
+        optimizer._optimize_tree = Mock(side_effect=AssertionError("memo miss"))
+
+        second = optimizer.optimize_query(optimizer.parse_query("select * from Employee where Employee.id = 1"))
+        assert second.tree is first.tree
+        assert second.query == "select * from Employee where Employee.id = 1"
+
+        optimizer.invalidate_plans()
+        with pytest.raises(AssertionError, match="memo miss"):
+            optimizer.optimize_query(optimizer.parse_query("SELECT * FROM Employee WHERE Employee.id = 1"))
+
     # Remove this test as CostModel is always initialized now
     # def test_get_cost_raises_when_no_calculator(self, optimizer):
     #     """Test that get_cost raises error when no cost calculator configured."""
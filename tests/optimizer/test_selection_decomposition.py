@@ -23,3 +23,35 @@ def test_decompose_simple_and(rule):
     assert new_tree.value == "age > 30"
     assert new_tree.children[0].type == QueryNodeType.SELECTION
     assert new_tree.children[0].value == "salary < 5000"
+
+
+def test_decompose_orders_most_selective_innermost(rule):
+    child = QueryTree(type=QueryNodeType.TABLE, value="users", children=[], parent=None)
+    node = QueryTree(
+        type=QueryNodeType.SELECTION,
+        value="name != 'John' AND age > 30 AND id = 2",
+        children=[child],
+        parent=None
+    )
+
+    new_tree = rule.apply(node)
+
+    # Innermost selection runs first, so it should be the equality
+    assert new_tree.value == "name != 'John'"
+    assert new_tree.children[0].value == "age > 30"
+    assert new_tree.children[0].children[0].value == "id = 2"
+
+
+def test_decompose_orders_disjunction_likely_true_first(rule):
+    child = QueryTree(type=QueryNodeType.TABLE, value="users", children=[], parent=None)
+    node = QueryTree(
+        type=QueryNodeType.SELECTION,
+        value="(id = 1 OR name != 'John') AND age > 30",
+        children=[child],
+        parent=None
+    )
+
+    new_tree = rule.apply(node)
+
+    assert new_tree.value == "(name != 'John' OR id = 1)"
+    assert new_tree.children[0].value == "age > 30"
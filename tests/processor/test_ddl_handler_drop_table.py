@@ -1,5 +1,4 @@
 import os
-import shutil
 import sys
 
 import pytest
@@ -45,16 +44,8 @@ class DummyFailureRecoveryManager:
         return None
 
 
-TEST_DATA_DIR = "src/data_test"
-
-
-def cleanup_test_data():
-    if os.path.exists(TEST_DATA_DIR):
-        shutil.rmtree(TEST_DATA_DIR)
-
-
-def setup_processor_with_fk_chain() -> tuple[QueryProcessor, StorageManager]:
-    storage = StorageManager("data_test")
+def setup_processor_with_fk_chain(data_dir: str) -> tuple[QueryProcessor, StorageManager]:
+    storage = StorageManager(data_dir, backend="memory")
     optimizer = QueryOptimizer(storage_manager=storage)
     ccm = DummyConcurrencyControlManager()
     frm = DummyFailureRecoveryManager()
@@ -110,53 +101,41 @@ def setup_processor_with_fk_chain() -> tuple[QueryProcessor, StorageManager]:
     return processor, storage
 
 
-def test_drop_table_restrict_blocks_dependent_tables():
-    cleanup_test_data()
-    processor, _ = setup_processor_with_fk_chain()
+def test_drop_table_restrict_blocks_dependent_tables(tmp_path):
+    processor, _ = setup_processor_with_fk_chain(str(tmp_path))
 
-    try:
-        with pytest.raises(ValueError) as excinfo:
-            processor.execute_query("DROP TABLE departments")
+    with pytest.raises(ValueError) as excinfo:
+        processor.execute_query("DROP TABLE departments")
 
-        assert "employees" in str(excinfo.value)
-    finally:
-        cleanup_test_data()
+    assert "employees" in str(excinfo.value)
 
 
-def test_drop_table_cascade_removes_foreign_key_references():
-    cleanup_test_data()
-    processor, storage = setup_processor_with_fk_chain()
+def test_drop_table_cascade_removes_foreign_key_references(tmp_path):
+    processor, storage = setup_processor_with_fk_chain(str(tmp_path))
 
-    try:
-        result = processor.execute_query("DROP TABLE departments CASCADE")
+    result = processor.execute_query("DROP TABLE departments CASCADE")
 
-        assert isinstance(result, ExecutionResult)
-        assert "departments" in result.message
-        remaining_tables = sorted(storage.list_tables())
-        assert remaining_tables == ["employee_projects", "employees"]
+    assert isinstance(result, ExecutionResult)
+    assert "departments" in result.message
+    remaining_tables = sorted(storage.list_tables())
+    assert remaining_tables == ["employee_projects", "employees"]
 
-        employee_schema = storage.get_table_schema("employees")
-        assert employee_schema is not None
+    employee_schema = storage.get_table_schema("employees")
+    assert employee_schema is not None
 
-        fk_column = next(
-            (col for col in employee_schema.columns if col.name == "department_id"),
-            None,
-        )
-        assert fk_column is not None
-        assert fk_column.foreign_key is None
-    finally:
-        cleanup_test_data()
+    fk_column = next(
+        (col for col in employee_schema.columns if col.name == "department_id"),
+        None,
+    )
+    assert fk_column is not None
+    assert fk_column.foreign_key is None
 
 
-def test_drop_table_without_dependents_succeeds():
-    cleanup_test_data()
-    processor, storage = setup_processor_with_fk_chain()
+def test_drop_table_without_dependents_succeeds(tmp_path):
+    processor, storage = setup_processor_with_fk_chain(str(tmp_path))
 
-    try:
-        result = processor.execute_query("DROP TABLE employee_projects")
+    result = processor.execute_query("DROP TABLE employee_projects")
 
-        assert isinstance(result, ExecutionResult)
-        remaining_tables = sorted(storage.list_tables())
-        assert remaining_tables == ["departments", "employees"]
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    remaining_tables = sorted(storage.list_tables())
+    assert remaining_tables == ["departments", "employees"]
@@ -22,19 +22,19 @@ from src.storage.storage_manager import StorageManager
 from src.processor.exceptions import AbortError
 
 
+# direktori data per worker pytest-xdist supaya test paralel tidak saling menimpa
+DATA_DIR = f"data_test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+
+
 # -------------------------------------------------------------------------
 # Helpers
 # -------------------------------------------------------------------------
 
 def _make_mock_storage_manager():
     """Create a real storage manager instance but we will mock its methods later."""
-    data_dir = "data_test"
+    data_dir = DATA_DIR
     abs_data_path = os.path.join(os.path.dirname(__file__), '..', '..', 'src', data_dir)
-    if os.path.exists(abs_data_path):
-        try:
-            shutil.rmtree(abs_data_path)
-        except Exception:
-            pass
+    shutil.rmtree(abs_data_path, ignore_errors=True)
 
     storage = StorageManager(data_directory=data_dir)
     return storage
@@ -2,7 +2,6 @@ import os
 import sys
 import pytest
 from unittest.mock import Mock
-import shutil
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
@@ -19,56 +18,48 @@ from src.concurrency.concurrency_manager import ConcurrencyControlManager
 from src.failure.failure_recovery_manager import FailureRecoveryManager
 
 
+_EMPLOYEES_SCHEMA = TableSchema(
+    table_name="employees",
+    columns=[
+        ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
+        ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
+        ColumnDefinition(name="salary", data_type=DataType.INTEGER),
+        ColumnDefinition(name="department", data_type=DataType.VARCHAR, max_length=30),
+    ],
+    primary_key="id",
+)
+
+# users punya kolom nullable untuk test NULL
+_USERS_SCHEMA = TableSchema(
+    table_name="users",
+    columns=[
+        ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True, nullable=False),
+        ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50, nullable=False),
+        ColumnDefinition(name="email", data_type=DataType.VARCHAR, max_length=100, nullable=True),
+        ColumnDefinition(name="age", data_type=DataType.INTEGER, nullable=True),
+    ],
+    primary_key="id",
+)
+
+
 # -------------------------------------------------------------------------
-# Helpers
+# Fixtures & Helpers
 # -------------------------------------------------------------------------
 
-def _make_mock_storage_manager():
-    """Create a mock storage manager with test data."""
-    data_dir = "data_test"
-    abs_data_path = os.path.join(os.path.dirname(__file__), '..', '..', 'src', data_dir)
-    if os.path.exists(abs_data_path):
-        try:
-            shutil.rmtree(abs_data_path)
-        except Exception:
-            pass
-
-    storage = StorageManager(data_directory=data_dir)
-
-    # Create employees table schema
-    employees_schema = TableSchema(
-        table_name="employees",
-        columns=[
-            ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
-            ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
-            ColumnDefinition(name="salary", data_type=DataType.INTEGER),
-            ColumnDefinition(name="department", data_type=DataType.VARCHAR, max_length=30),
-        ],
-        primary_key="id",
-    )
-
-    try:
-        storage.create_table(employees_schema)
-    except Exception:
-        pass  # Table might already exist
-
-    # Create users table schema for testing nullable columns
-    users_schema = TableSchema(
-        table_name="users",
-        columns=[
-            ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True, nullable=False),
-            ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50, nullable=False),
-            ColumnDefinition(name="email", data_type=DataType.VARCHAR, max_length=100, nullable=True),
-            ColumnDefinition(name="age", data_type=DataType.INTEGER, nullable=True),
-        ],
-        primary_key="id",
-    )
-
-    try:
-        storage.create_table(users_schema)
-    except Exception:
-        pass  # Table might already exist
+@pytest.fixture(scope="module")
+def tables_snapshot():
+    """Create the test tables once and return their files relative to the data directory."""
+    seed = StorageManager("insert_snapshot", backend="memory")
+    seed.create_table(_EMPLOYEES_SCHEMA)
+    seed.create_table(_USERS_SCHEMA)
+    return seed.backend.snapshot(seed.data_path)
+
 
+@pytest.fixture
+def storage(tables_snapshot):
+    """Fresh in-memory storage restored from the snapshot; writes never leak between tests."""
+    storage = StorageManager("data_test", backend="memory")
+    storage.backend.restore(storage.data_path, tables_snapshot)
     return storage
 
 
@@ -91,9 +82,8 @@ def _make_mock_frm():
 # Test Cases
 # -------------------------------------------------------------------------
 
-def test_insert_with_all_columns_specified():
+def test_insert_with_all_columns_specified(storage):
     """Test inserting with all columns specified."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -105,8 +95,13 @@ def test_insert_with_all_columns_specified():
 
     assert isinstance(result, Rows)
     assert result.rows_count == 1
-    assert result.schema == []
-    assert result.data == []
+    assert result.schema == [storage.get_table_schema("employees")]
+    assert result.data == [{
+        "employees.id": 1,
+        "employees.name": "John Doe",
+        "employees.salary": 50000,
+        "employees.department": "Engineering",
+    }]
     
     storage.write_buffer.assert_called_once()
     write_call = storage.write_buffer.call_args[0][0]
@@ -121,9 +116,8 @@ def test_insert_with_all_columns_specified():
     assert write_call.conditions is None
 
 
-def test_insert_with_partial_columns_specified():
+def test_insert_with_partial_columns_specified(storage):
     """Test inserting with only some columns specified."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -146,9 +140,8 @@ def test_insert_with_partial_columns_specified():
     }
 
 
-def test_insert_without_columns_specified():
+def test_insert_without_columns_specified(storage):
     """Test inserting without specifying columns (values in schema order)."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -171,9 +164,8 @@ def test_insert_without_columns_specified():
     }
 
 
-def test_insert_with_quoted_values():
+def test_insert_with_quoted_values(storage):
     """Test inserting with quoted string values."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -203,9 +195,8 @@ def test_insert_with_quoted_values():
     assert write_call.data["email"] == "charlie@test.com"
 
 
-def test_insert_with_null_values():
+def test_insert_with_null_values(storage):
     """Test inserting with NULL values."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -227,9 +218,8 @@ def test_insert_with_null_values():
     }
 
 
-def test_insert_with_missing_values_for_nullable_columns():
+def test_insert_with_missing_values_for_nullable_columns(storage):
     """Test inserting with missing values for nullable columns."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -249,9 +239,8 @@ def test_insert_with_missing_values_for_nullable_columns():
     assert write_call.data["age"] is None
 
 
-def test_insert_parse_value_list_with_commas_in_quotes():
+def test_insert_parse_value_list_with_commas_in_quotes(storage):
     """Test parsing values with commas inside quoted strings."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -269,9 +258,8 @@ def test_insert_parse_value_list_with_commas_in_quotes():
     assert write_call.data["email"] == "john.smith@email.com"
 
 
-def test_insert_parse_value_list_with_escaped_quotes():
+def test_insert_parse_value_list_with_escaped_quotes(storage):
     """Test parsing values with escaped quotes."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -285,12 +273,11 @@ def test_insert_parse_value_list_with_escaped_quotes():
     assert result.rows_count == 1
     
     write_call = storage.write_buffer.call_args[0][0]
-    assert write_call.data["name"] == "O''Connor"
+    assert write_call.data["name"] == "O'Connor"
 
 
-def test_insert_type_conversion():
+def test_insert_type_conversion(storage):
     """Test automatic type conversion of values."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -308,9 +295,8 @@ def test_insert_type_conversion():
     assert isinstance(write_call.data["age"], int)
 
 
-def test_insert_invalid_table():
+def test_insert_invalid_table(storage):
     """Test inserting into non-existent table."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -321,9 +307,8 @@ def test_insert_invalid_table():
         operator.execute("nonexistent", values_str, tx_id=1)
 
 
-def test_insert_multiple_table_names():
+def test_insert_multiple_table_names(storage):
     """Test inserting with multiple table names (should fail)."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -334,9 +319,8 @@ def test_insert_multiple_table_names():
         operator.execute("table1 table2", values_str, tx_id=1)
 
 
-def test_insert_mismatched_columns_and_values():
+def test_insert_mismatched_columns_and_values(storage):
     """Test inserting with mismatched number of columns and values."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -348,9 +332,8 @@ def test_insert_mismatched_columns_and_values():
         operator.execute("users", values_str, tx_id=1)
 
 
-def test_insert_invalid_format_missing_parentheses():
+def test_insert_invalid_format_missing_parentheses(storage):
     """Test inserting with invalid format (missing parentheses)."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -361,9 +344,8 @@ def test_insert_invalid_format_missing_parentheses():
         operator.execute("users", values_str, tx_id=1)
 
 
-def test_insert_invalid_type_conversion():
+def test_insert_invalid_type_conversion(storage):
     """Test inserting with invalid type conversion."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -375,9 +357,8 @@ def test_insert_invalid_type_conversion():
         operator.execute("users", values_str, tx_id=1)
 
 
-def test_parse_value_list_empty_values():
+def test_parse_value_list_empty_values(storage):
     """Test parsing empty values."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
@@ -387,9 +368,8 @@ def test_parse_value_list_empty_values():
     assert result == ["''", "'Test'", "''"]
 
 
-def test_parse_value_with_different_data_types():
+def test_parse_value_with_different_data_types(storage):
     """Test _parse_value method with different data types."""
-    storage = _make_mock_storage_manager()
     ccm = _make_mock_ccm()
     frm = _make_mock_frm()
     operator = InsertOperator(ccm, storage, frm)
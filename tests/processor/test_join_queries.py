@@ -10,7 +10,7 @@ from src.optimizer.optimizer import QueryOptimizer
 from src.processor.processor import QueryProcessor
 from src.storage.storage_manager import StorageManager
 
-DATA_DIR = "data_join_tests"
+DATA_DIR = f"data_join_tests_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
 DATA_PATH = os.path.join("src", DATA_DIR)
 
 
@@ -1,718 +1,596 @@
 import sys
 import os
-import shutil
-
-# Add the project root to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import threading
+import pytest
 
 from src.processor.processor import QueryProcessor
+from src.processor.plan_cache import PlanCache
 from src.optimizer.optimizer import QueryOptimizer
 from src.storage.storage_manager import StorageManager
 from src.concurrency.concurrency_manager import ConcurrencyControlManager
 from src.failure.failure_recovery_manager import FailureRecoveryManager
-from src.core.models import ExecutionResult, Rows, TableSchema, ColumnDefinition, DataType
+from src.core.models import ExecutionResult, Rows, TableSchema, ColumnDefinition, DataType, ForeignKeyConstraint, ForeignKeyAction
+
+
+# storage hanya menyerialisasi schema, jadi aman dipakai bersama oleh semua test
+_USERS_SCHEMA = TableSchema(
+    table_name="users",
+    columns=[
+        ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
+        ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
+        ColumnDefinition(name="age", data_type=DataType.INTEGER),
+        ColumnDefinition(name="salary", data_type=DataType.FLOAT),
+    ],
+    primary_key="id"
+)
+
+_DEPARTMENTS_SCHEMA = TableSchema(
+    table_name="departments",
+    columns=[
+        ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
+        ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
+    ],
+    primary_key="id"
+)
+
+
+_USERS_ROWS = [
+    {"id": 1, "name": "John", "age": 25, "salary": 50000.0},
+    {"id": 2, "name": "Jane", "age": 30, "salary": 60000.0},
+    {"id": 3, "name": "Bob", "age": 35, "salary": 70000.0}
+]
+
+_ALL_USER_COLUMNS = {"users.id", "users.name", "users.age", "users.salary"}
+
+_DEPARTMENTS_ROWS = [
+    {"id": 1, "name": "Engineering"},
+    {"id": 2, "name": "Marketing"},
+    {"id": 3, "name": "Sales"}
+]
+
 
+def build_snapshot(schema, rows):
+    """Create and seed `schema` once and return its files relative to the data directory."""
+    seed = StorageManager(f"{schema.table_name}_snapshot", backend="memory")
+    seed.create_table(schema)
+    seed.dml_manager.save_all_rows(schema.table_name, Rows(data=rows, rows_count=len(rows)), schema)
+    seed.flush_buffer()
+    return seed.backend.snapshot(seed.data_path)
 
-def cleanup_test_data():
-    test_dir = "src/data_test"
-    if os.path.exists(test_dir):
-        shutil.rmtree(test_dir)
 
+@pytest.fixture(scope="session")
+def users_snapshot():
+    return build_snapshot(_USERS_SCHEMA, _USERS_ROWS)
 
-def setup_test_environment():
-    storage_manager = StorageManager("data_test")
+
+@pytest.fixture(scope="session")
+def departments_snapshot():
+    return build_snapshot(_DEPARTMENTS_SCHEMA, _DEPARTMENTS_ROWS)
+
+
+def setup_test_environment(data_dir: str, snapshot):
+    storage_manager = StorageManager(data_dir, backend="memory")
+    storage_manager.backend.restore(storage_manager.data_path, snapshot)
     optimizer = QueryOptimizer(storage_manager=storage_manager)
     ccm = ConcurrencyControlManager("Timestamp")
-    frm = FailureRecoveryManager()
-    
-    schema = TableSchema(
-        table_name="users",
-        columns=[
-            ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
-            ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
-            ColumnDefinition(name="age", data_type=DataType.INTEGER),
-            ColumnDefinition(name="salary", data_type=DataType.FLOAT),
-        ],
-        primary_key="id"
-    )
-    
-    storage_manager.create_table(schema)
-    
-    test_rows = Rows(
-        data=[
-            {"id": 1, "name": "John", "age": 25, "salary": 50000.0},
-            {"id": 2, "name": "Jane", "age": 30, "salary": 60000.0},
-            {"id": 3, "name": "Bob", "age": 35, "salary": 70000.0}
-        ],
-        rows_count=3
-    )
-    
-    storage_manager.dml_manager.save_all_rows("users", test_rows, schema)
+    frm = FailureRecoveryManager(os.path.join(data_dir, "wal.jsonl"))
     
     processor = QueryProcessor(optimizer, ccm, frm, storage_manager)
     return processor
 
 
-def test_execute_query_valid_select():
-    cleanup_test_data()
-    processor = setup_test_environment()
-    
-    try:
-        result = processor.execute_query("SELECT * FROM users")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.data is not None
-        assert isinstance(result.data, Rows)
-        assert result.data.rows_count == 3
-        assert len(result.data.data) == 3
-        assert result.message is not None
-        assert result.query == "SELECT * FROM users"
-        
-        first_row = result.data.data[0]
-        assert "users.id" in first_row
-        assert "users.name" in first_row
-        assert "users.age" in first_row
-        assert "users.salary" in first_row
-        
-    finally:
-        cleanup_test_data()
+def get_row(processor, table_name, pk_value):
+    """Read one row by primary key straight from storage, for verifying DML results."""
+    storage = processor.storage
+    return storage.dml_manager.get_row_by_pk(table_name, storage.get_table_schema(table_name), pk_value)
 
 
-def test_execute_query_with_where_clause():
-    cleanup_test_data()
-    processor = setup_test_environment()
-    
-    try:
-        result = processor.execute_query("SELECT * FROM users WHERE users.age > 28")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 2
-        ages = [row["users.age"] for row in result.data.data]
-        assert all(age > 28 for age in ages)
-        
-    finally:
-        cleanup_test_data()
+@pytest.fixture(scope="module")
+def readonly_processor(tmp_path_factory, users_snapshot):
+    """Processor shared by tests that only read the seeded tables."""
+    processor = setup_test_environment(str(tmp_path_factory.mktemp("readonly")), users_snapshot)
+    yield processor
+    processor.storage.drop_all()
 
 
-def test_execute_query_with_projection():
-    cleanup_test_data()
-    processor = setup_test_environment()
-    
-    try:
-        result = processor.execute_query("SELECT users.name, users.age FROM users")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 3
-        for row in result.data.data:
-            assert "users.name" in row
-            assert "users.age" in row
-            
-    finally:
-        cleanup_test_data()
+@pytest.fixture
+def processor(tmp_path, users_snapshot):
+    """Fresh processor over a restored copy of the seeded tables; changes never leak between tests."""
+    processor = setup_test_environment(str(tmp_path), users_snapshot)
+    yield processor
+    processor.storage.drop_all()
 
 
-def test_execute_query_invalid_syntax():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_query_valid_select(readonly_processor):
+    result = readonly_processor.execute_query("SELECT * FROM users")
     
-    try:
-        try:
-            processor.execute_query("SELECT FROM users")
-            assert False, "Should have raised SyntaxError"
-        except SyntaxError as e:
-            assert "error" in str(e).lower()
-            
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.data is not None
+    assert isinstance(result.data, Rows)
+    assert result.data.rows_count == 3
+    assert len(result.data.data) == 3
+    assert result.message is not None
+    assert result.query == "SELECT * FROM users"
+    
+    first_row, *_ = result.data.data
+    assert first_row.keys() == _ALL_USER_COLUMNS
 
 
-def test_execute_query_nonexistent_table():
-    cleanup_test_data()
-    processor = setup_test_environment()
-    
-    try:
-        try:
-            processor.execute_query("SELECT * FROM nonexistent_table")
-            assert False, "Should have raised an exception"
-        except Exception as e:
-            assert "does not exist" in str(e) or "not found" in str(e).lower()
-            
-    finally:
-        cleanup_test_data()
+def test_execute_query_invalid_syntax(readonly_processor):
+    with pytest.raises(SyntaxError, match=r"(?i)error"):
+        readonly_processor.execute_query("SELECT FROM users")
 
 
-def test_execute_query_begin_transaction():
-    cleanup_test_data()
-    processor = setup_test_environment()
-    
-    try:
-        result = processor.execute_query("BEGIN TRANSACTION")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.transaction_id is not None
-        assert result.message is not None
-        
-    finally:
-        cleanup_test_data()
+def test_execute_query_nonexistent_table(readonly_processor):
+    with pytest.raises(Exception, match=r"does not exist|(?i:not found)"):
+        readonly_processor.execute_query("SELECT * FROM nonexistent_table")
 
 
-def test_execute_query_commit():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_query_begin_transaction(processor):
+    result = processor.execute_query("BEGIN TRANSACTION")
     
-    try:
-        begin_result = processor.execute_query("BEGIN TRANSACTION")
-        tx_id = begin_result.transaction_id
-        
-        processor.transaction_id = tx_id
-        
-        result = processor.execute_query("COMMIT")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.message is not None
-        
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.transaction_id is not None
+    assert result.message is not None
+
 
-def test_query_routing():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_query_commit(processor):
+    begin_result = processor.execute_query("BEGIN TRANSACTION")
+    tx_id = begin_result.transaction_id
     
-    try:
-        result = processor.execute_query("SELECT * FROM users")
-        assert isinstance(result, ExecutionResult)
-        
-        result = processor.execute_query("BEGIN TRANSACTION")
-        assert isinstance(result, ExecutionResult)
-        
-    finally:
-        cleanup_test_data()
+    processor.transaction_id = tx_id
+    
+    result = processor.execute_query("COMMIT")
+    
+    assert isinstance(result, ExecutionResult)
+    assert result.message is not None
 
+def test_transaction_control_skips_optimizer_setup(processor):
+    processor.execute_query("BEGIN TRANSACTION")
+    processor.execute_query("COMMIT")
+    
+    # rules and cost model are only built once a query needs optimizing
+    assert "_rules" not in vars(processor.optimizer)
+    assert "_cost_model" not in vars(processor.optimizer)
+    
+    processor.execute_query("SELECT * FROM users")
+    assert "_rules" not in vars(processor.optimizer)
+    assert processor.optimizer.rules
 
-def test_whitespace_normalization():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_query_routing(processor):
+    result = processor.execute_query("SELECT * FROM users")
+    assert isinstance(result, ExecutionResult)
     
-    try:
-        result1 = processor.execute_query("  SELECT   *   FROM   users  ")
-        result2 = processor.execute_query("SELECT * FROM users")
-        
-        assert result1.data is not None
-        assert result2.data is not None
-        assert result1.data.rows_count == result2.data.rows_count
-        assert len(result1.data.data) == len(result2.data.data)
-        
-    finally:
-        cleanup_test_data()
+    result = processor.execute_query("BEGIN TRANSACTION")
+    assert isinstance(result, ExecutionResult)
 
 
-def test_complex_query():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_whitespace_normalization(readonly_processor):
+    result1 = readonly_processor.execute_query("  SELECT   *   FROM   users  ")
+    result2 = readonly_processor.execute_query("SELECT * FROM users")
     
-    try:
-        result = processor.execute_query("SELECT users.name FROM users WHERE users.salary > 55000")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 2
-        for row in result.data.data:
-            assert "users.name" in row
-            
-    finally:
-        cleanup_test_data()
+    assert result1.data is not None
+    assert result2.data is not None
+    assert result1.data.rows_count == result2.data.rows_count
+    assert len(result1.data.data) == len(result2.data.data)
+
 
 
-def test_complex_query_with_multiple_conditions():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_plan_cache_reuses_normalized_query(processor):
+    processor.execute_query("SELECT * FROM users")
+    assert processor.plan_cache.miss_count == 1
     
-    try:
-        result = processor.execute_query("SELECT * FROM users WHERE users.age > 25 AND users.salary > 55000")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 2
-        for row in result.data.data:
-            assert row["users.age"] > 25
-            assert row["users.salary"] > 55000
-            
-    finally:
-        cleanup_test_data()
+    result = processor.execute_query("  SELECT   *   FROM   users  ")
+    assert processor.plan_cache.hit_count == 1
+    assert result.data.rows_count == 3
+    
+    processor.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    assert len(processor.plan_cache) == 0
+
+def test_plan_cache_invalidated_by_ddl_from_other_processor(processor):
+    storage = processor.storage
+    other = QueryProcessor(
+        QueryOptimizer(storage_manager=storage),
+        ConcurrencyControlManager("Timestamp"),
+        processor.frm,
+        storage,
+    )
+    query = "SELECT * FROM users"
+    processor.execute_query(query)
+    processor.execute_query(query)
+    assert processor.plan_cache.hit_count == 1
+
+    other.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY)")
 
+    misses = processor.plan_cache.miss_count
+    result = processor.execute_query(query)
+    assert processor.plan_cache.miss_count == misses + 1
+    assert result.data.rows_count == 3
 
-def test_complex_query_with_or_conditions():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_parse_cache_shared_between_processors(processor, tmp_path, users_snapshot):
+    query = "SELECT users.name FROM users WHERE users.age < 31"
+    processor.execute_query(query)
     
-    try:
-        result = processor.execute_query("SELECT users.name FROM users WHERE users.age < 26 OR users.salary > 65000")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 2
-        names = [row["users.name"] for row in result.data.data]
-        assert "John" in names
-        assert "Bob" in names
-            
-    finally:
-        cleanup_test_data()
+    other = setup_test_environment(str(tmp_path / "other"), users_snapshot)
+    hits = QueryProcessor._parse_cache.hit_count
+    result = other.execute_query(query)
+    
+    assert QueryProcessor._parse_cache.hit_count == hits + 1
+    assert result.data.rows_count == 2
+    other.storage.drop_all()
 
 
-def test_complex_query_with_parentheses():
-    cleanup_test_data()
-    processor = setup_test_environment()
-    
-    try:
-        result = processor.execute_query("SELECT * FROM users WHERE (users.age > 30 OR users.salary < 55000) AND users.name != 'John'")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 1
-        assert result.data.data[0]["users.name"] == "Bob"
-            
-    finally:
-        cleanup_test_data()
+def test_plan_cache_serializes_access_between_threads():
+    # cache level kelas dipakai bersama oleh thread client server: get/put/invalidate
+    # tidak boleh jalan selama thread lain sedang memegang OrderedDict-nya
+    cache = PlanCache(capacity=8)
+    cache.put("q", "plan")
 
+    for call in (lambda: cache.get("q"), lambda: cache.put("r", "plan"), cache.invalidate):
+        with cache._lock:
+            thread = threading.Thread(target=call)
+            thread.start()
+            thread.join(timeout=0.05)
+            assert thread.is_alive()
+        thread.join()
+        assert not thread.is_alive()
 
-def test_complex_query_multiple_projections():
-    cleanup_test_data()
-    processor = setup_test_environment()
+
+def test_execute_query_count_only(readonly_processor):
+    result = readonly_processor.execute_query("SELECT users.name FROM users WHERE users.age >= 25 AND users.salary <= 60000", count_only=True)
+    assert result.data.rows_count == 2
+    assert result.data.data == []
     
-    try:
-        result = processor.execute_query("SELECT users.id, users.name, users.age FROM users WHERE users.age >= 30")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 2
-        
-        for row in result.data.data:
-            assert "users.id" in row
-            assert "users.name" in row
-            assert "users.age" in row
-            assert "users.salary" not in row
-            assert row["users.age"] >= 30
-            
-    finally:
-        cleanup_test_data()
+    result = readonly_processor.execute_query("SELECT * FROM users ORDER BY users.age DESC LIMIT 2", count_only=True)
+    assert result.data.rows_count == 2
+    assert result.data.data == []
+    
+    full = readonly_processor.execute_query("SELECT users.name FROM users WHERE users.age >= 25 AND users.salary <= 60000")
+    assert full.data.rows_count == 2
+    assert len(full.data.data) == 2
+    
+    assert readonly_processor.count("SELECT * FROM users WHERE users.age > 28") == 2
 
 
-def test_complex_query_nested_conditions():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_query_primary_key_lookup(readonly_processor):
+    for query in ("SELECT * FROM users WHERE users.id = 2", "SELECT * FROM users WHERE 2 = id"):
+        result = readonly_processor.execute_query(query)
+        assert result.data.rows_count == 1
+        assert result.data.data[0]["users.name"] == "Jane"
     
-    try:
-        result = processor.execute_query("SELECT users.name FROM users WHERE ((users.age > 25 AND users.salary > 50000) OR users.age < 26) AND users.name != 'Jane'")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 2
-        names = [row["users.name"] for row in result.data.data]
-        assert "John" in names
-        assert "Bob" in names
-        assert "Jane" not in names
-            
-    finally:
-        cleanup_test_data()
+    result = readonly_processor.execute_query("SELECT * FROM users WHERE users.id = 42")
+    assert result.data.rows_count == 0
 
 
-def test_complex_query_boundary_values():
-    cleanup_test_data()
-    processor = setup_test_environment()
+@pytest.mark.parametrize("sql, expected_names, expected_columns", [
+    pytest.param("SELECT * FROM users WHERE users.age > 28",
+                 ["Jane", "Bob"], _ALL_USER_COLUMNS, id="where_clause"),
+    pytest.param("SELECT users.name, users.age FROM users",
+                 ["John", "Jane", "Bob"], {"users.name", "users.age"}, id="projection"),
+    pytest.param("SELECT users.name FROM users WHERE users.salary > 55000",
+                 ["Jane", "Bob"], {"users.name"}, id="simple"),
+    pytest.param("SELECT * FROM users WHERE users.age > 25 AND users.salary > 55000",
+                 ["Jane", "Bob"], _ALL_USER_COLUMNS, id="multiple_conditions"),
+    pytest.param("SELECT users.name FROM users WHERE users.age < 26 OR users.salary > 65000",
+                 ["John", "Bob"], {"users.name"}, id="or_conditions"),
+    pytest.param("SELECT * FROM users WHERE (users.age > 30 OR users.salary < 55000) AND users.name != 'John'",
+                 ["Bob"], _ALL_USER_COLUMNS, id="parentheses"),
+    pytest.param("SELECT users.id, users.name, users.age FROM users WHERE users.age >= 30",
+                 ["Jane", "Bob"], {"users.id", "users.name", "users.age"}, id="multiple_projections"),
+    pytest.param("SELECT users.name FROM users WHERE ((users.age > 25 AND users.salary > 50000) OR users.age < 26) AND users.name != 'Jane'",
+                 ["John", "Bob"], {"users.name"}, id="nested_conditions"),
+    pytest.param("SELECT * FROM users WHERE users.age >= 25 AND users.age <= 35 AND users.salary >= 50000 AND users.salary <= 70000",
+                 ["John", "Jane", "Bob"], _ALL_USER_COLUMNS, id="boundary_values"),
+    pytest.param("SELECT * FROM users WHERE (users.age > 20 AND users.salary > 45000) OR users.name = 'Bob'",
+                 ["John", "Jane", "Bob"], _ALL_USER_COLUMNS, id="wildcard_and_conditions"),
+])
+def test_select_query(readonly_processor, sql, expected_names, expected_columns):
+    result = readonly_processor.execute_query(sql)
     
-    try:
-        result = processor.execute_query("SELECT * FROM users WHERE users.age >= 25 AND users.age <= 35 AND users.salary >= 50000 AND users.salary <= 70000")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 3
-            
-    finally:
-        cleanup_test_data()
+    assert result.data is not None
+    assert result.data.rows_count == len(expected_names)
+    assert sorted(row["users.name"] for row in result.data.data) == sorted(expected_names)
+    assert all(row.keys() == expected_columns for row in result.data.data)
 
 
-def test_complex_query_with_wildcard_and_conditions():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_update_query(processor):
+    result = processor.execute_query("UPDATE users SET salary = 80000 WHERE id = 2")
     
-    try:
-        result = processor.execute_query("SELECT * FROM users WHERE (users.age > 20 AND users.salary > 45000) OR users.name = 'Bob'")
-        
-        assert result.data is not None
-        assert result.data.rows_count == 3
-        
-        for row in result.data.data:
-            assert "users.id" in row
-            assert "users.name" in row
-            assert "users.age" in row
-            assert "users.salary" in row
-            
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.message is not None
+    
+    assert get_row(processor, "users", 2)["salary"] == 80000.0
+
 
-def test_update_query():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_insert_query_all_columns(processor):
+    result = processor.execute_query("INSERT INTO users (id, name, age, salary) VALUES (4, 'Alice', 28, 55000.0)")
     
-    try:
-        result = processor.execute_query("UPDATE users SET salary = 80000 WHERE id = 2")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.message is not None
-        
-        select_result = processor.execute_query("SELECT salary FROM users WHERE id = 2")
-        assert select_result.data is not None
-        assert select_result.data.rows_count == 1
-        assert select_result.data.data[0]["users.salary"] == 80000.0
-        
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.data is not None
+    assert result.data.rows_count == 1
+    assert "executed successfully" in result.message.lower() or "insert" in result.message.lower()
+    
+    new_row, = result.data.data
+    assert new_row == {"users.id": 4, "users.name": "Alice", "users.age": 28, "users.salary": 55000.0}
+    
+    select_result = processor.execute_query("SELECT * FROM users WHERE users.id = 4")
+    assert select_result.data.data == [new_row]
 
 
-def test_execute_insert_query_all_columns():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_insert_query_returns_stored_row(processor, monkeypatch):
+    reads = []
+    read_buffer = processor.storage.read_buffer
+    monkeypatch.setattr(processor.storage, "read_buffer", lambda retrieval: reads.append(retrieval) or read_buffer(retrieval))
     
-    try:
-        result = processor.execute_query("INSERT INTO users (id, name, age, salary) VALUES (4, 'Alice', 28, 55000.0)")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.data is not None
-        assert result.data.rows_count == 1
-        assert "executed successfully" in result.message.lower() or "insert" in result.message.lower()
-        
-        select_result = processor.execute_query("SELECT * FROM users WHERE users.id = 4")
-        assert select_result.data is not None
-        assert select_result.data.rows_count == 1
-        new_row = select_result.data.data[0]
-        assert new_row["users.id"] == 4
-        assert new_row["users.name"] == "Alice"
-        assert new_row["users.age"] == 28
-        assert new_row["users.salary"] == 55000.0
-        
-    finally:
-        cleanup_test_data()
+    long_name = "x" * 60
+    result = processor.execute_query(f"INSERT INTO users (id, name) VALUES (13, '{long_name}')")
+    
+    # hanya cek duplikat pk; row hasil tidak dibaca ulang dari storage
+    assert len(reads) == 1
+    new_row, = result.data.data
+    assert new_row["users.name"] == long_name[:50]
+    
+    select_result = processor.execute_query("SELECT * FROM users WHERE users.id = 13")
+    assert select_result.data.data == [new_row]
 
 
-def test_execute_insert_query_partial_columns():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_insert_query_partial_columns(processor):
+    result = processor.execute_query("INSERT INTO users (id, name) VALUES (5, 'Charlie')")
     
-    try:
-        result = processor.execute_query("INSERT INTO users (id, name) VALUES (5, 'Charlie')")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.data is not None
-        assert result.data.rows_count == 1
-        
-        select_result = processor.execute_query("SELECT * FROM users WHERE users.id = 5")
-        assert select_result.data is not None
-        assert select_result.data.rows_count == 1
-        new_row = select_result.data.data[0]
-        assert new_row["users.id"] == 5
-        assert new_row["users.name"] == "Charlie"
-        assert new_row["users.age"] is None
-        assert new_row["users.salary"] is None
-        
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.data is not None
+    assert result.data.rows_count == 1
+    
+    new_row, = result.data.data
+    assert new_row == {"users.id": 5, "users.name": "Charlie", "users.age": None, "users.salary": None}
 
 
-def test_execute_insert_query_no_columns_specified():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_insert_query_no_columns_specified(processor):
+    result = processor.execute_query("INSERT INTO users VALUES (6, 'Diana', 32, 62000.0)")
     
-    try:
-        result = processor.execute_query("INSERT INTO users VALUES (6, 'Diana', 32, 62000.0)")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.data is not None
-        assert result.data.rows_count == 1
-        
-        select_result = processor.execute_query("SELECT * FROM users WHERE users.id = 6")
-        assert select_result.data is not None
-        assert select_result.data.rows_count == 1
-        new_row = select_result.data.data[0]
-        assert new_row["users.id"] == 6
-        assert new_row["users.name"] == "Diana"
-        assert new_row["users.age"] == 32
-        assert new_row["users.salary"] == 62000.0
-        
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.data is not None
+    assert result.data.rows_count == 1
+    
+    new_row, = result.data.data
+    assert new_row == {"users.id": 6, "users.name": "Diana", "users.age": 32, "users.salary": 62000.0}
 
 
-def test_execute_insert_query_with_null_values():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_insert_query_with_null_values(processor):
+    result = processor.execute_query("INSERT INTO users (id, name, age, salary) VALUES (7, 'Eve', NULL, NULL)")
     
-    try:
-        result = processor.execute_query("INSERT INTO users (id, name, age, salary) VALUES (7, 'Eve', NULL, NULL)")
-        
-        assert isinstance(result, ExecutionResult)
-        assert result.data is not None
-        assert result.data.rows_count == 1
-        
-        select_result = processor.execute_query("SELECT * FROM users WHERE users.id = 7")
-        assert select_result.data is not None
-        assert select_result.data.rows_count == 1
-        new_row = select_result.data.data[0]
-        assert new_row["users.id"] == 7
-        assert new_row["users.name"] == "Eve"
-        assert new_row["users.age"] is None
-        assert new_row["users.salary"] is None
-        
-    finally:
-        cleanup_test_data()
+    assert isinstance(result, ExecutionResult)
+    assert result.data is not None
+    assert result.data.rows_count == 1
+    
+    new_row, = result.data.data
+    assert new_row == {"users.id": 7, "users.name": "Eve", "users.age": None, "users.salary": None}
+    assert get_row(processor, "users", 7) == {"id": 7, "name": "Eve", "age": None, "salary": None}
+
+
+def test_prepared_insert_and_select(processor):
+    insert = processor.prepare("INSERT INTO users (id, name, age) VALUES (?, ?, ?)")
+    assert insert.param_count == 3
+
+    insert.execute((8, "Frank", 41))
+    insert.execute((9, "O'Neil", None))
+    with pytest.raises(ValueError):
+        insert.execute((10, "Gina"))
+
+    select = processor.prepare("SELECT users.name FROM users WHERE users.id = ? AND users.name != '?'")
+    assert select.param_count == 1
+    assert select.execute((8,)).data.data == [{"users.name": "Frank"}]
+    assert select.execute((9,)).data.data == [{"users.name": "O'Neil"}]
+    assert select.execute((10,)).data.rows_count == 0
+
+
+def test_prepared_statement_keeps_placeholders_inside_string_literals(processor):
+    processor.execute_query("INSERT INTO users (id, name, age) VALUES (11, 'a?1', 20)")
+    processor.execute_query("INSERT INTO users (id, name, age) VALUES (12, 'b?', 21)")
+
+    select = processor.prepare("SELECT users.id FROM users WHERE users.name = 'a?1' AND users.id = ?")
+    assert select.param_count == 1
+    assert select.execute((11,)).data.data == [{"users.id": 11}]
+
+    select = processor.prepare("SELECT users.id FROM users WHERE users.name = 'b?' AND users.id = ?")
+    assert select.param_count == 1
+    assert select.execute((12,)).data.data == [{"users.id": 12}]
 
 
-def test_execute_delete_query():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_prepared_statement_binds_apostrophes_in_where_and_set(processor):
+    processor.prepare("INSERT INTO users (id, name, age) VALUES (?, ?, ?)").execute((13, "O'Neil", 30))
+
+    select = processor.prepare("SELECT users.id FROM users WHERE users.name = ?")
+    assert select.execute(("O'Neil",)).data.data == [{"users.id": 13}]
+
+    update = processor.prepare("UPDATE users SET name = ? WHERE users.id = ?")
+    update.execute(("it's \"both\"", 13))
+    assert select.execute(("it's \"both\"",)).data.data == [{"users.id": 13}]
+    assert get_row(processor, "users", 13)["name"] == "it's \"both\""
+
+
+def test_execute_delete_query(processor):
+    initial_result = processor.execute_query("SELECT * FROM users")
+    assert initial_result.data is not None
+    assert initial_result.data.rows_count == 3
     
-    try:
-        initial_result = processor.execute_query("SELECT * FROM users")
-        assert initial_result.data is not None
-        assert initial_result.data.rows_count == 3
-        
-        delete_result = processor.execute_query("DELETE FROM users WHERE users.id = 2")
-        
-        assert isinstance(delete_result, ExecutionResult)
-        assert delete_result.data is not None
-        assert delete_result.data.rows_count == 1
-        assert "delete successful" in delete_result.message.lower() or "executed successfully" in delete_result.message.lower()
-        
-        remaining_result = processor.execute_query("SELECT * FROM users")
-        assert remaining_result.data is not None
-        assert remaining_result.data.rows_count == 2
-        
-        jane_check = processor.execute_query("SELECT * FROM users WHERE users.id = 2")
-        assert jane_check.data is not None
-        assert jane_check.data.rows_count == 0
-        
-        remaining_ids = [row["users.id"] for row in remaining_result.data.data]
-        assert set(remaining_ids) == {1, 3}
-        
-    finally:
-        cleanup_test_data()
+    delete_result = processor.execute_query("DELETE FROM users WHERE users.id = 2")
+    
+    assert isinstance(delete_result, ExecutionResult)
+    assert delete_result.data is not None
+    assert delete_result.data.rows_count == 1
+    assert "delete successful" in delete_result.message.lower() or "executed successfully" in delete_result.message.lower()
+    
+    remaining_result = processor.execute_query("SELECT * FROM users")
+    assert remaining_result.data is not None
+    assert remaining_result.data.rows_count == 2
+    
+    assert get_row(processor, "users", 2) is None
+    
+    remaining_ids = [row["users.id"] for row in remaining_result.data.data]
+    assert set(remaining_ids) == {1, 3}
 
 
-def test_execute_delete_query_with_conditions():
-    cleanup_test_data()
-    processor = setup_test_environment()
+def test_execute_delete_query_with_conditions(processor):
+    delete_result = processor.execute_query("DELETE FROM users WHERE users.salary > 55000")
     
-    try:
-        delete_result = processor.execute_query("DELETE FROM users WHERE users.salary > 55000")
-        
-        assert isinstance(delete_result, ExecutionResult)
-        assert delete_result.data is not None
-        assert delete_result.data.rows_count == 2
-        
-        remaining_result = processor.execute_query("SELECT * FROM users")
-        assert remaining_result.data is not None
-        assert remaining_result.data.rows_count == 1
-        
-        remaining_user = remaining_result.data.data[0]
-        assert remaining_user["users.id"] == 1
-        assert remaining_user["users.name"] == "John"
-        assert remaining_user["users.salary"] == 50000.0
-        
-    finally:
-        cleanup_test_data()
+    assert isinstance(delete_result, ExecutionResult)
+    assert delete_result.data is not None
+    assert delete_result.data.rows_count == 2
+    
+    remaining_result = processor.execute_query("SELECT * FROM users")
+    assert remaining_result.data is not None
+    assert remaining_result.data.rows_count == 1
+    
+    remaining_user = remaining_result.data.data[0]
+    assert remaining_user["users.id"] == 1
+    assert remaining_user["users.name"] == "John"
+    assert remaining_user["users.salary"] == 50000.0
 
 
-def setup_foreign_key_test_environment():
-    storage_manager = StorageManager("data_test")
+def setup_foreign_key_test_environment(data_dir: str, snapshot):
+    storage_manager = StorageManager(data_dir, backend="memory")
+    storage_manager.backend.restore(storage_manager.data_path, snapshot)
     optimizer = QueryOptimizer(storage_manager=storage_manager)
     ccm = ConcurrencyControlManager("Timestamp")
-    frm = FailureRecoveryManager()
+    frm = FailureRecoveryManager(os.path.join(data_dir, "wal.jsonl"))
     
-    departments_schema = TableSchema(
-        table_name="departments",
+    processor = QueryProcessor(optimizer, ccm, frm, storage_manager)
+    return processor, storage_manager
+
+
+def seed_table(storage, table, schema, rows):
+    storage.dml_manager.save_all_rows(table, Rows(data=rows, rows_count=len(rows)), schema)
+
+
+def create_referencing_table(storage, table_name, label_column, fk_column, referenced_table,
+                             on_update=ForeignKeyAction.RESTRICT, on_delete=ForeignKeyAction.RESTRICT):
+    """Create `table_name (id PK, label_column VARCHAR(50), fk_column REFERENCES referenced_table(id))` directly in storage."""
+    schema = TableSchema(
+        table_name=table_name,
         columns=[
-            ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
-            ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
+            ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True, nullable=False),
+            ColumnDefinition(name=label_column, data_type=DataType.VARCHAR, max_length=50),
+            ColumnDefinition(
+                name=fk_column,
+                data_type=DataType.INTEGER,
+                foreign_key=ForeignKeyConstraint(
+                    referenced_table=referenced_table,
+                    referenced_column="id",
+                    on_delete=on_delete,
+                    on_update=on_update,
+                ),
+            ),
         ],
         primary_key="id"
     )
-    storage_manager.create_table(departments_schema)
-    
-    dept_rows = Rows(
-        data=[
-            {"id": 1, "name": "Engineering"},
-            {"id": 2, "name": "Marketing"},
-            {"id": 3, "name": "Sales"}
-        ],
-        rows_count=3
-    )
-    storage_manager.dml_manager.save_all_rows("departments", dept_rows, departments_schema)
-    
-    processor = QueryProcessor(optimizer, ccm, frm, storage_manager)
-    return processor, storage_manager
+    storage.create_table(schema)
+    return schema
+
+
+def batch_insert(processor, statements):
+    """Run INSERT statements in one explicit transaction so the WAL is flushed once on COMMIT."""
+    processor.execute_query("BEGIN TRANSACTION")
+    for statement in statements:
+        processor.execute_query(statement)
+    processor.execute_query("COMMIT")
 
 
-def setup_minimal_test_environment():
+def setup_minimal_test_environment(data_dir: str):
     """Setup test environment without pre-creating any tables."""
-    storage_manager = StorageManager("data_test")
+    storage_manager = StorageManager(data_dir, backend="memory")
     optimizer = QueryOptimizer(storage_manager=storage_manager)
     ccm = ConcurrencyControlManager("Timestamp")
-    frm = FailureRecoveryManager()
+    frm = FailureRecoveryManager(os.path.join(data_dir, "wal.jsonl"))
     
     processor = QueryProcessor(optimizer, ccm, frm, storage_manager)
     return processor, storage_manager
 
 
-def test_update_foreign_key_cascade():
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
-    
-    try:
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE CASCADE
-            )
-        """)
-        
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees VALUES (2, 'Bob', 1)")
-        processor.execute_query("INSERT INTO employees VALUES (3, 'Charlie', 2)")
+@pytest.mark.parametrize("on_update, expected", [
+    (ForeignKeyAction.CASCADE, "update"),
+    (ForeignKeyAction.SET_NULL, "null"),
+    (ForeignKeyAction.RESTRICT, "raise"),
+    (ForeignKeyAction.NO_ACTION, "raise"),
+])
+def test_update_foreign_key_action(tmp_path, on_update, expected, departments_snapshot):
+    """Test UPDATE of a referenced key under each ON UPDATE action."""
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
+    
+    try:
+        emp_schema = create_referencing_table(
+            storage, "employees", "name", "dept_id", "departments", on_update=on_update
+        )
+        seed_table(storage, "employees", emp_schema, [
+            {"id": 1, "name": "Alice", "dept_id": 1},
+            {"id": 2, "name": "Bob", "dept_id": 1},
+            {"id": 3, "name": "Charlie", "dept_id": 2},
+        ])
+        
+        if expected == "raise":
+            with pytest.raises(ValueError, match="Referential integrity violation: cannot update"):
+                processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
+            
+            # Verify that department id was not updated
+            assert get_row(processor, "departments", 1) is not None
+            return
         
         result = processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
         assert isinstance(result, ExecutionResult)
         
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE dept_id = 10")
-        assert emp_result.data is not None
-        assert emp_result.data.rows_count == 2
+        emp_result = processor.execute_query("SELECT * FROM employees")
+        dept_ids = {row["employees.name"]: row["employees.dept_id"] for row in emp_result.data.data}
         
-        old_emp_result = processor.execute_query("SELECT * FROM employees WHERE dept_id = 1")
-        assert old_emp_result.data is not None
-        assert old_emp_result.data.rows_count == 0
+        if expected == "update":
+            assert dept_ids == {"Alice": 10, "Bob": 10, "Charlie": 2}
+        else:
+            # only the affected employees lose their reference
+            assert dept_ids == {"Alice": None, "Bob": None, "Charlie": 2}
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_restrict():
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
-    
-    try:
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE RESTRICT
-            )
-        """)
-        
-        # Insert employee data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees VALUES (2, 'Bob', 1)")
-        
-        # Try to update department id (should fail due to RESTRICT)
-        try:
-            processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
-            assert False, "Should have raised ValueError for RESTRICT violation"
-        except ValueError as e:
-            assert "Referential integrity violation" in str(e)
-            assert "cannot update" in str(e).lower()
-        
-        # Verify that department id was not updated
-        dept_result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert dept_result.data is not None
-        assert dept_result.data.rows_count == 1
-        
-    finally:
-        cleanup_test_data()
-
+def test_update_pk_conflict_does_not_cascade_earlier_rows(tmp_path, departments_snapshot):
+    """A multi-row UPDATE that conflicts on a later row must not cascade to children of earlier rows."""
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
 
-def test_update_foreign_key_set_null():
-    """Test UPDATE with SET NULL foreign key action."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
-    
     try:
-        # Create employees table with SET NULL on update
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE SET NULL
-            )
-        """)
-        
-        # Insert employee data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees VALUES (2, 'Bob', 1)")
-        processor.execute_query("INSERT INTO employees VALUES (3, 'Charlie', 2)")
-        
-        # Update department id (should set employee dept_id to NULL)
-        result = processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
-        assert isinstance(result, ExecutionResult)
-        
-        # Check that affected employees have NULL dept_id
-        alice_result = processor.execute_query("SELECT * FROM employees WHERE name = 'Alice'")
-        assert alice_result.data is not None
-        assert alice_result.data.rows_count == 1
-        assert alice_result.data.data[0]["employees.dept_id"] is None
-        
-        bob_result = processor.execute_query("SELECT * FROM employees WHERE name = 'Bob'")
-        assert bob_result.data is not None
-        assert bob_result.data.rows_count == 1
-        assert bob_result.data.data[0]["employees.dept_id"] is None
-        
-        # Check that unaffected employee still has original dept_id
-        charlie_result = processor.execute_query("SELECT * FROM employees WHERE name = 'Charlie'")
-        assert charlie_result.data is not None
-        assert charlie_result.data.rows_count == 1
-        assert charlie_result.data.data[0]["employees.dept_id"] == 2
-        
-    finally:
-        cleanup_test_data()
+        emp_schema = create_referencing_table(
+            storage, "employees", "name", "dept_id", "departments", on_update=ForeignKeyAction.CASCADE
+        )
+        seed_table(storage, "employees", emp_schema, [
+            {"id": 1, "name": "Alice", "dept_id": 1},
+            {"id": 2, "name": "Bob", "dept_id": 2},
+        ])
 
+        # kedua row mendapat id 10, row kedua konflik dengan row pertama
+        with pytest.raises(ValueError, match="PK conflict"):
+            processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1 OR id = 2")
+
+        assert get_row(processor, "employees", 1)["dept_id"] == 1
+        assert get_row(processor, "employees", 2)["dept_id"] == 2
+        assert get_row(processor, "departments", 1) is not None
+        assert get_row(processor, "departments", 10) is None
 
-def test_update_foreign_key_no_action():
-    """Test UPDATE with NO ACTION foreign key action."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
-    
-    try:
-        # Create employees table with NO ACTION on update
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE NO ACTION
-            )
-        """)
-        
-        # Insert employee data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        
-        # Try to update department id (should fail due to NO ACTION)
-        try:
-            processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
-            assert False, "Should have raised ValueError for NO ACTION violation"
-        except ValueError as e:
-            assert "Referential integrity violation" in str(e) or "cannot update" in str(e).lower()
-        
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_mixed_actions():
+def test_update_foreign_key_mixed_actions(tmp_path, departments_snapshot):
     """Test tables with different foreign key actions for DELETE and UPDATE."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
     
     try:
         # Create table with different DELETE and UPDATE actions
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON DELETE CASCADE ON UPDATE SET NULL
-            )
-        """)
-        
-        # Insert employee data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees VALUES (2, 'Bob', 1)")
+        emp_schema = create_referencing_table(
+            storage, "employees", "name", "dept_id", "departments",
+            on_update=ForeignKeyAction.SET_NULL, on_delete=ForeignKeyAction.CASCADE
+        )
+        seed_table(storage, "employees", emp_schema, [
+            {"id": 1, "name": "Alice", "dept_id": 1},
+            {"id": 2, "name": "Bob", "dept_id": 1},
+        ])
         
         # Update department id (should trigger SET NULL action)
         result = processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
@@ -727,175 +605,121 @@ def test_update_foreign_key_mixed_actions():
             assert row["employees.dept_id"] is None
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_multiple_referencing_tables():
+def test_update_foreign_key_multiple_referencing_tables(tmp_path, departments_snapshot):
     """Test UPDATE with multiple tables referencing the same foreign key."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
     
     try:
         # Create multiple tables referencing departments
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE CASCADE
-            )
-        """)
-        
-        processor.execute_query("""
-            CREATE TABLE projects (
-                id INTEGER PRIMARY KEY,
-                title VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE SET NULL
-            )
-        """)
+        emp_schema = create_referencing_table(
+            storage, "employees", "name", "dept_id", "departments", on_update=ForeignKeyAction.CASCADE
+        )
+        proj_schema = create_referencing_table(
+            storage, "projects", "title", "dept_id", "departments", on_update=ForeignKeyAction.SET_NULL
+        )
         
         # Insert data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO projects VALUES (1, 'Project A', 1)")
+        seed_table(storage, "employees", emp_schema, [{"id": 1, "name": "Alice", "dept_id": 1}])
+        seed_table(storage, "projects", proj_schema, [{"id": 1, "title": "Project A", "dept_id": 1}])
         
         # Update department id
         result = processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
         assert isinstance(result, ExecutionResult)
         
         # Check CASCADE action in employees table
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE id = 1")
-        assert emp_result.data is not None
-        assert emp_result.data.rows_count == 1
-        assert emp_result.data.data[0]["employees.dept_id"] == 10
+        assert get_row(processor, "employees", 1)["dept_id"] == 10
         
         # Check SET NULL action in projects table
-        proj_result = processor.execute_query("SELECT * FROM projects WHERE id = 1")
-        assert proj_result.data is not None
-        assert proj_result.data.rows_count == 1
-        assert proj_result.data.data[0]["projects.dept_id"] is None
+        assert get_row(processor, "projects", 1)["dept_id"] is None
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_chained_references():
+def test_update_foreign_key_chained_references(tmp_path, departments_snapshot):
     """Test UPDATE with chained foreign key references."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
     
     try:
         # Create employees table
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE CASCADE
-            )
-        """)
+        emp_schema = create_referencing_table(
+            storage, "employees", "name", "dept_id", "departments", on_update=ForeignKeyAction.CASCADE
+        )
         
         # Create projects table referencing employees
-        processor.execute_query("""
-            CREATE TABLE projects (
-                id INTEGER PRIMARY KEY,
-                title VARCHAR(50),
-                emp_id INTEGER REFERENCES employees(id) ON UPDATE CASCADE
-            )
-        """)
+        proj_schema = create_referencing_table(
+            storage, "projects", "title", "emp_id", "employees", on_update=ForeignKeyAction.CASCADE
+        )
         
         # Insert chained data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO projects VALUES (1, 'Project A', 1)")
+        seed_table(storage, "employees", emp_schema, [{"id": 1, "name": "Alice", "dept_id": 1}])
+        seed_table(storage, "projects", proj_schema, [{"id": 1, "title": "Project A", "emp_id": 1}])
         
         # Update department id (should cascade through employees to projects)
         result = processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
         assert isinstance(result, ExecutionResult)
         
         # Check that employee dept_id was updated
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE id = 1")
-        assert emp_result.data is not None
-        assert emp_result.data.rows_count == 1
-        assert emp_result.data.data[0]["employees.dept_id"] == 10
+        assert get_row(processor, "employees", 1)["dept_id"] == 10
         
         # Update employee id (should cascade to projects)
         processor.execute_query("UPDATE employees SET id = 100 WHERE id = 1")
         
         # Check that project emp_id was updated
-        proj_result = processor.execute_query("SELECT * FROM projects WHERE id = 1")
-        assert proj_result.data is not None
-        assert proj_result.data.rows_count == 1
-        assert proj_result.data.data[0]["projects.emp_id"] == 100
+        assert get_row(processor, "projects", 1)["emp_id"] == 100
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_non_existent_value():
+def test_update_foreign_key_non_existent_value(tmp_path, departments_snapshot):
     """Test UPDATE that violates referential integrity with non-existent foreign key value."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
     
     try:
         # Create employees table
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id)
-            )
-        """)
-        
-        # Insert employee data
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', 1)")
+        emp_schema = create_referencing_table(storage, "employees", "name", "dept_id", "departments")
+        seed_table(storage, "employees", emp_schema, [{"id": 1, "name": "Alice", "dept_id": 1}])
         
         # Try to update to non-existent department id
-        try:
+        with pytest.raises(ValueError, match=r"Referential integrity violation.*does not exist"):
             processor.execute_query("UPDATE employees SET dept_id = 999 WHERE id = 1")
-            assert False, "Should have raised ValueError for referential integrity violation"
-        except ValueError as e:
-            assert "Referential integrity violation" in str(e)
-            assert "does not exist" in str(e)
         
         # Verify employee dept_id was not changed
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE id = 1")
-        assert emp_result.data is not None
-        assert emp_result.data.rows_count == 1
-        assert emp_result.data.data[0]["employees.dept_id"] == 1
+        assert get_row(processor, "employees", 1)["dept_id"] == 1
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_null_values():
+def test_update_foreign_key_null_values(tmp_path, departments_snapshot):
     """Test UPDATE foreign key with NULL values."""
-    cleanup_test_data()
-    processor, storage = setup_foreign_key_test_environment()
+    processor, storage = setup_foreign_key_test_environment(str(tmp_path), departments_snapshot)
     
     try:
         # Create employees table (dept_id nullable)
-        processor.execute_query("""
-            CREATE TABLE employees (
-                id INTEGER PRIMARY KEY,
-                name VARCHAR(50),
-                dept_id INTEGER REFERENCES departments(id) ON UPDATE CASCADE
-            )
-        """)
-        
-        # Insert employee with NULL dept_id
-        processor.execute_query("INSERT INTO employees VALUES (1, 'Alice', NULL)")
-        processor.execute_query("INSERT INTO employees VALUES (2, 'Bob', 1)")
+        emp_schema = create_referencing_table(
+            storage, "employees", "name", "dept_id", "departments", on_update=ForeignKeyAction.CASCADE
+        )
+        
+        # Seed employee with NULL dept_id
+        seed_table(storage, "employees", emp_schema, [
+            {"id": 1, "name": "Alice", "dept_id": None},
+            {"id": 2, "name": "Bob", "dept_id": 1},
+        ])
         
         # Update department id (should only affect non-NULL references)
         result = processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
         assert isinstance(result, ExecutionResult)
         
         # Check that Alice still has NULL dept_id
-        alice_result = processor.execute_query("SELECT * FROM employees WHERE id = 1")
-        assert alice_result.data is not None
-        assert alice_result.data.data[0]["employees.dept_id"] is None
+        assert get_row(processor, "employees", 1)["dept_id"] is None
         
         # Check that Bob's dept_id was cascaded
-        bob_result = processor.execute_query("SELECT * FROM employees WHERE id = 2")
-        assert bob_result.data is not None
-        assert bob_result.data.data[0]["employees.dept_id"] == 10
+        assert get_row(processor, "employees", 2)["dept_id"] == 10
         
         # Update employee to have valid foreign key
         processor.execute_query("UPDATE employees SET dept_id = 2 WHERE id = 1")
@@ -905,111 +729,95 @@ def test_update_foreign_key_null_values():
         assert isinstance(result, ExecutionResult)
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_recursive_cascade():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_update_foreign_key_recursive_cascade(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (2, 'Sales')")
-        
         processor.execute_query("CREATE TABLE teams (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON UPDATE CASCADE)")
-        processor.execute_query("INSERT INTO teams (id, name, dept_id) VALUES (1, 'Backend', 1)")
-        processor.execute_query("INSERT INTO teams (id, name, dept_id) VALUES (2, 'Frontend', 1)")
-        
         processor.execute_query("CREATE TABLE projects (id INT PRIMARY KEY, name VARCHAR(100), team_id INT REFERENCES teams(id) ON UPDATE CASCADE)")
-        processor.execute_query("INSERT INTO projects (id, name, team_id) VALUES (1, 'API', 1)")
-        processor.execute_query("INSERT INTO projects (id, name, team_id) VALUES (2, 'Mobile', 1)")
-        
         processor.execute_query("CREATE TABLE tasks (id INT PRIMARY KEY, title VARCHAR(100), project_id INT REFERENCES projects(id) ON UPDATE CASCADE)")
-        processor.execute_query("INSERT INTO tasks (id, title, project_id) VALUES (1, 'Design', 1)")
-        processor.execute_query("INSERT INTO tasks (id, title, project_id) VALUES (2, 'Code', 1)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO departments (id, name) VALUES (2, 'Sales')",
+            "INSERT INTO teams (id, name, dept_id) VALUES (1, 'Backend', 1)",
+            "INSERT INTO teams (id, name, dept_id) VALUES (2, 'Frontend', 1)",
+            "INSERT INTO projects (id, name, team_id) VALUES (1, 'API', 1)",
+            "INSERT INTO projects (id, name, team_id) VALUES (2, 'Mobile', 1)",
+            "INSERT INTO tasks (id, title, project_id) VALUES (1, 'Design', 1)",
+            "INSERT INTO tasks (id, title, project_id) VALUES (2, 'Code', 1)",
+        ])
         
         processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
         
-        teams_result = processor.execute_query("SELECT * FROM teams WHERE id = 1")
-        assert teams_result.data is not None
-        assert teams_result.data.data[0]["teams.dept_id"] == 10  
+        assert get_row(processor, "teams", 1)["dept_id"] == 10  
         
-        projects_result = processor.execute_query("SELECT * FROM projects WHERE id = 1")
-        assert projects_result.data is not None
-        assert projects_result.data.data[0]["projects.team_id"] == 1  
+        assert get_row(processor, "projects", 1)["team_id"] == 1  
         
         processor.execute_query("UPDATE teams SET id = 20 WHERE id = 1")
         
-        projects_result = processor.execute_query("SELECT * FROM projects WHERE id = 1")
-        assert projects_result.data is not None
-        assert projects_result.data.data[0]["projects.team_id"] == 20  
+        assert get_row(processor, "projects", 1)["team_id"] == 20  
         
         # Tasks should still reference projects.id=1 (project id didn't change)
-        tasks_result = processor.execute_query("SELECT * FROM tasks WHERE id = 1")
-        assert tasks_result.data is not None
-        assert tasks_result.data.data[0]["tasks.project_id"] == 1
+        assert get_row(processor, "tasks", 1)["project_id"] == 1
         
         # Now update the project id to see cascade to tasks
         processor.execute_query("UPDATE projects SET id = 30 WHERE id = 1")
         
-        tasks_result = processor.execute_query("SELECT * FROM tasks WHERE id = 1")
-        assert tasks_result.data is not None
-        assert tasks_result.data.data[0]["tasks.project_id"] == 30
+        assert get_row(processor, "tasks", 1)["project_id"] == 30
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_update_foreign_key_recursive_set_null():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_update_foreign_key_recursive_set_null(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        
         processor.execute_query("CREATE TABLE teams (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON UPDATE SET NULL)")
-        processor.execute_query("INSERT INTO teams (id, name, dept_id) VALUES (1, 'Backend', 1)")
-        
         processor.execute_query("CREATE TABLE projects (id INT PRIMARY KEY, name VARCHAR(100), team_id INT REFERENCES teams(id) ON UPDATE SET NULL)")
-        processor.execute_query("INSERT INTO projects (id, name, team_id) VALUES (1, 'API', 1)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO teams (id, name, dept_id) VALUES (1, 'Backend', 1)",
+            "INSERT INTO projects (id, name, team_id) VALUES (1, 'API', 1)",
+        ])
         
         processor.execute_query("UPDATE departments SET id = 10 WHERE id = 1")
         
-        teams_result = processor.execute_query("SELECT * FROM teams WHERE id = 1")
-        assert teams_result.data is not None
-        assert teams_result.data.data[0]["teams.dept_id"] is None
+        assert get_row(processor, "teams", 1)["dept_id"] is None
         
         # Update team ID - should set project's team_id to NULL
         processor.execute_query("UPDATE teams SET id = 20 WHERE id = 1")
         
-        projects_result = processor.execute_query("SELECT * FROM projects WHERE id = 1")
-        assert projects_result.data is not None
-        assert projects_result.data.data[0]["projects.team_id"] is None  # team_id should be NULL
+        assert get_row(processor, "projects", 1)["team_id"] is None  # team_id should be NULL
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_delete_foreign_key_cascade():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_delete_foreign_key_cascade(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (2, 'Sales')")
-        
         processor.execute_query("CREATE TABLE employees (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE CASCADE)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 1)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (3, 'Charlie', 2)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO departments (id, name) VALUES (2, 'Sales')",
+            "INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)",
+            "INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 1)",
+            "INSERT INTO employees (id, name, dept_id) VALUES (3, 'Charlie', 2)",
+        ])
         
         # Delete department - should cascade delete employees
         processor.execute_query("DELETE FROM departments WHERE id = 1")
         
         # Verify department is deleted
-        dept_result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert dept_result.data is not None
-        assert dept_result.data.rows_count == 0
+        assert get_row(processor, "departments", 1) is None
         
         # Verify employees in dept 1 are deleted
         emp_result = processor.execute_query("SELECT * FROM employees WHERE dept_id = 1")
@@ -1023,74 +831,63 @@ def test_delete_foreign_key_cascade():
         assert emp_result.data.data[0]["employees.name"] == "Charlie"
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_delete_foreign_key_restrict():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_delete_foreign_key_restrict(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (2, 'Sales')")
-        
         processor.execute_query("CREATE TABLE employees (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE RESTRICT)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 2)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO departments (id, name) VALUES (2, 'Sales')",
+            "INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)",
+            "INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 2)",
+        ])
         
         # Try to delete department with employees - should fail
-        try:
+        with pytest.raises(Exception, match=r"(?i)integrity error|foreign key constraint|restrict"):
             processor.execute_query("DELETE FROM departments WHERE id = 1")
-            assert False, "Should have raised an error due to RESTRICT"
-        except Exception as e:
-            assert "integrity error" in str(e).lower() or "foreign key constraint" in str(e).lower() or "restrict" in str(e).lower()
         
         # Verify department still exists
-        result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert result.data is not None
-        assert result.data.rows_count == 1
+        assert get_row(processor, "departments", 1) is not None
         
         # Delete employee first, then department should work
         processor.execute_query("DELETE FROM employees WHERE dept_id = 1")
         processor.execute_query("DELETE FROM departments WHERE id = 1")
         
-        result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert result.data is not None
-        assert result.data.rows_count == 0
+        assert get_row(processor, "departments", 1) is None
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_delete_foreign_key_set_null():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_delete_foreign_key_set_null(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (2, 'Sales')")
-        
         processor.execute_query("CREATE TABLE employees (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE SET NULL)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 1)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (3, 'Charlie', 2)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO departments (id, name) VALUES (2, 'Sales')",
+            "INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)",
+            "INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 1)",
+            "INSERT INTO employees (id, name, dept_id) VALUES (3, 'Charlie', 2)",
+        ])
         
         # Delete department - should set dept_id to NULL
         processor.execute_query("DELETE FROM departments WHERE id = 1")
         
         # Verify department is deleted
-        dept_result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert dept_result.data is not None
-        assert dept_result.data.rows_count == 0
+        assert get_row(processor, "departments", 1) is None
         
         # Verify employees' dept_id is set to NULL
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE id = 1")
-        assert emp_result.data is not None
-        assert emp_result.data.data[0]["employees.dept_id"] is None
+        assert get_row(processor, "employees", 1)["dept_id"] is None
         
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE id = 2")
-        assert emp_result.data is not None
-        assert emp_result.data.data[0]["employees.dept_id"] is None
+        assert get_row(processor, "employees", 2)["dept_id"] is None
         
         # Verify employee in dept 2 still has dept_id
         emp_result = processor.execute_query("SELECT * FROM employees WHERE dept_id = 2")
@@ -1099,163 +896,95 @@ def test_delete_foreign_key_set_null():
         assert emp_result.data.data[0]["employees.dept_id"] == 2
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_delete_foreign_key_no_action():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_delete_foreign_key_no_action(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (2, 'Sales')")
-        
         processor.execute_query("CREATE TABLE employees (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE NO ACTION)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 2)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO departments (id, name) VALUES (2, 'Sales')",
+            "INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)",
+            "INSERT INTO employees (id, name, dept_id) VALUES (2, 'Bob', 2)",
+        ])
         
         # Try to delete department with employees - should fail
-        try:
+        with pytest.raises(Exception, match=r"(?i)integrity error|foreign key constraint|no action|restrict"):
             processor.execute_query("DELETE FROM departments WHERE id = 1")
-            assert False, "Should have raised an error due to NO ACTION"
-        except Exception as e:
-            assert "integrity error" in str(e).lower() or "foreign key constraint" in str(e).lower() or "no action" in str(e).lower() or "restrict" in str(e).lower()
         
         # Verify department still exists
-        result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert result.data is not None
-        assert result.data.rows_count == 1
+        assert get_row(processor, "departments", 1) is not None
         
         # Delete employee first, then department should work
         processor.execute_query("DELETE FROM employees WHERE dept_id = 1")
         processor.execute_query("DELETE FROM departments WHERE id = 1")
         
-        result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert result.data is not None
-        assert result.data.rows_count == 0
+        assert get_row(processor, "departments", 1) is None
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_delete_foreign_key_mixed_actions():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_delete_foreign_key_mixed_actions(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        
         processor.execute_query("CREATE TABLE employees (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE CASCADE)")
-        processor.execute_query("INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)")
-        
         processor.execute_query("CREATE TABLE contractors (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE SET NULL)")
-        processor.execute_query("INSERT INTO contractors (id, name, dept_id) VALUES (1, 'Bob', 1)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO employees (id, name, dept_id) VALUES (1, 'Alice', 1)",
+            "INSERT INTO contractors (id, name, dept_id) VALUES (1, 'Bob', 1)",
+        ])
         
         # Delete department
         processor.execute_query("DELETE FROM departments WHERE id = 1")
         
         # Verify employee is cascade deleted
-        emp_result = processor.execute_query("SELECT * FROM employees WHERE id = 1")
-        assert emp_result.data is not None
-        assert emp_result.data.rows_count == 0
+        assert get_row(processor, "employees", 1) is None
         
         # Verify contractor's dept_id is set to NULL
-        contractor_result = processor.execute_query("SELECT * FROM contractors WHERE id = 1")
-        assert contractor_result.data is not None
-        assert contractor_result.data.rows_count == 1
-        assert contractor_result.data.data[0]["contractors.dept_id"] is None
+        assert get_row(processor, "contractors", 1)["dept_id"] is None
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
-def test_delete_foreign_key_recursive_cascade():
-    cleanup_test_data()
-    processor, storage = setup_minimal_test_environment()
+def test_delete_foreign_key_recursive_cascade(tmp_path):
+    processor, storage = setup_minimal_test_environment(str(tmp_path))
     try:
         processor.execute_query("CREATE TABLE departments (id INT PRIMARY KEY, name VARCHAR(100))")
-        processor.execute_query("INSERT INTO departments (id, name) VALUES (1, 'Engineering')")
-        
         processor.execute_query("CREATE TABLE teams (id INT PRIMARY KEY, name VARCHAR(100), dept_id INT REFERENCES departments(id) ON DELETE CASCADE)")
-        processor.execute_query("INSERT INTO teams (id, name, dept_id) VALUES (1, 'Backend', 1)")
-        
         processor.execute_query("CREATE TABLE projects (id INT PRIMARY KEY, name VARCHAR(100), team_id INT REFERENCES teams(id) ON DELETE CASCADE)")
-        processor.execute_query("INSERT INTO projects (id, name, team_id) VALUES (1, 'API', 1)")
-        
         processor.execute_query("CREATE TABLE tasks (id INT PRIMARY KEY, title VARCHAR(100), project_id INT REFERENCES projects(id) ON DELETE CASCADE)")
-        processor.execute_query("INSERT INTO tasks (id, title, project_id) VALUES (1, 'Design', 1)")
+        
+        batch_insert(processor, [
+            "INSERT INTO departments (id, name) VALUES (1, 'Engineering')",
+            "INSERT INTO teams (id, name, dept_id) VALUES (1, 'Backend', 1)",
+            "INSERT INTO projects (id, name, team_id) VALUES (1, 'API', 1)",
+            "INSERT INTO tasks (id, title, project_id) VALUES (1, 'Design', 1)",
+        ])
         
         # Delete department - should cascade through all levels
         processor.execute_query("DELETE FROM departments WHERE id = 1")
         
         # Verify all related records are deleted
-        dept_result = processor.execute_query("SELECT * FROM departments WHERE id = 1")
-        assert dept_result.data is not None
-        assert dept_result.data.rows_count == 0
+        assert get_row(processor, "departments", 1) is None
         
-        teams_result = processor.execute_query("SELECT * FROM teams WHERE id = 1")
-        assert teams_result.data is not None
-        assert teams_result.data.rows_count == 0
+        assert get_row(processor, "teams", 1) is None
         
-        projects_result = processor.execute_query("SELECT * FROM projects WHERE id = 1")
-        assert projects_result.data is not None
-        assert projects_result.data.rows_count == 0
+        assert get_row(processor, "projects", 1) is None
         
-        tasks_result = processor.execute_query("SELECT * FROM tasks WHERE id = 1")
-        assert tasks_result.data is not None
-        assert tasks_result.data.rows_count == 0
+        assert get_row(processor, "tasks", 1) is None
         
     finally:
-        cleanup_test_data()
+        storage.drop_all()
 
 
 if __name__ == "__main__":
-    test_execute_query_valid_select()
-    test_execute_query_with_where_clause()
-    test_execute_query_with_projection()
-    test_execute_query_invalid_syntax()
-    test_execute_query_nonexistent_table()
-    test_execute_query_begin_transaction()
-    test_execute_query_commit()
-    test_query_routing()
-    test_whitespace_normalization()
-    test_update_query()
-    test_complex_query()
-    test_complex_query_with_multiple_conditions()
-    test_complex_query_with_or_conditions()
-    test_complex_query_with_parentheses()
-    test_complex_query_multiple_projections()
-    test_complex_query_nested_conditions()
-    test_complex_query_boundary_values()
-    test_complex_query_with_wildcard_and_conditions()
-    test_execute_insert_query_all_columns()
-    test_execute_insert_query_partial_columns()
-    test_execute_insert_query_no_columns_specified()
-    test_execute_insert_query_with_null_values()
-    test_execute_delete_query()
-    test_execute_delete_query_with_conditions()
-    
-    # Foreign Key UPDATE Action Tests
-    test_update_foreign_key_cascade()
-    test_update_foreign_key_restrict()
-    test_update_foreign_key_set_null()
-    test_update_foreign_key_no_action()
-    test_update_foreign_key_mixed_actions()
-    test_update_foreign_key_multiple_referencing_tables()
-    test_update_foreign_key_chained_references()
-    test_update_foreign_key_non_existent_value()
-    test_update_foreign_key_null_values()
-    
-    # Foreign Key Recursive UPDATE Action Tests
-    test_update_foreign_key_recursive_cascade()
-    test_update_foreign_key_recursive_set_null()
-    
-    # Foreign Key DELETE Action Tests
-    test_delete_foreign_key_cascade()
-    test_delete_foreign_key_restrict()
-    test_delete_foreign_key_set_null()
-    test_delete_foreign_key_no_action()
-    test_delete_foreign_key_mixed_actions()
-    test_delete_foreign_key_recursive_cascade()
-    
-    print("All QueryProcessor execute_query tests passed!")
+    sys.exit(pytest.main([__file__]))
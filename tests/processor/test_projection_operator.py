@@ -100,6 +100,36 @@ def test_projection_table_wildcard_and_column():
     assert [col.name for col in result.schema[1].columns] == ["order_id"]
 
 
+def test_projection_full_table_wildcard_shares_source_rows():
+    operator = ProjectionOperator()
+    rows = _make_users_rows()
+
+    result = operator.execute(rows, "users.*")
+
+    assert result is not rows
+    assert result.data is rows.data
+    assert [col.name for col in result.schema[0].columns] == ["id", "name", "age"]
+
+
+def test_projection_returns_views_over_source_rows():
+    operator = ProjectionOperator()
+    rows = _make_users_rows()
+
+    result = operator.execute(rows, "name, users.age AS years")
+
+    assert result.data == [
+        {"users.name": "Alice", "years": 30},
+        {"users.name": "Bob", "years": 24},
+    ]
+    assert "users.id" not in result.data[0]
+    assert result.data[1]["years"] == 24
+
+    # view membaca row sumber, bukan salinan
+    rows.data[1]["users.age"] = 25
+    assert result.data[1]["years"] == 25
+    assert result.data[1].copy() == {"users.name": "Bob", "years": 25}
+
+
 def test_projection_unknown_column_raises():
     operator = ProjectionOperator()
     rows = _make_users_rows()
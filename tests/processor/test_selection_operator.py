@@ -1,219 +1,172 @@
-import sys
-import os
+from types import MappingProxyType
 
-# Add the project root to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import pytest
 
 from src.processor.operators.selection_operator import SelectionOperator
-from src.core.models.result import Rows
+from src.core.models.result import Rows, ColumnarRows
 from src.core.models.storage import TableSchema, ColumnDefinition, DataType
 
 
-def create_test_schema():
-    """Create a test table schema for users."""
-    columns = [
+# dibangun sekali per modul; row dibungkus read-only supaya tidak ada test yang bisa
+# mengubah state bersama (aman untuk pytest-xdist), tiap test cukup menyalin list-nya
+_SCHEMA = [TableSchema(
+    table_name="users",
+    columns=[
         ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
         ColumnDefinition(name="name", data_type=DataType.VARCHAR),
         ColumnDefinition(name="age", data_type=DataType.INTEGER),
         ColumnDefinition(name="salary", data_type=DataType.FLOAT)
     ]
-    return [TableSchema(table_name="users", columns=columns)]
+)]
+
+_DATA = tuple(MappingProxyType(row) for row in (
+    {"users.id": 1, "users.name": "John", "users.age": 25, "users.salary": 50000.0},
+    {"users.id": 2, "users.name": "Jane", "users.age": 30, "users.salary": 60000.0},
+    {"users.id": 3, "users.name": "Bob", "users.age": 35, "users.salary": 70000.0},
+    {"users.id": 4, "users.name": "Alice", "users.age": 28, "users.salary": 55000.0},
+    {"users.id": 5, "users.name": "Charlie", "users.age": 22, "users.salary": 45000.0},
+))
+
+
+@pytest.fixture(scope="module")
+def selection_rows():
+    return Rows(data=list(_DATA), rows_count=len(_DATA), schema=_SCHEMA)
+
+
+@pytest.mark.parametrize("condition, expected_count, row_predicate", [
+    pytest.param("users.name = 'John'", 1, lambda r: r["users.name"] == "John", id="equality"),
+    pytest.param("users.age > 28", 2, lambda r: r["users.age"] > 28, id="greater_than"),
+    pytest.param("users.age < 28", 2, lambda r: r["users.age"] < 28, id="less_than"),
+    pytest.param("users.salary >= 55000", 3, lambda r: r["users.salary"] >= 55000, id="greater_equal"),
+    pytest.param("users.name != 'John'", 4, lambda r: r["users.name"] != "John", id="not_equal"),
+    pytest.param("users.age > 25 AND users.salary > 55000", 2,
+                 lambda r: r["users.age"] > 25 and r["users.salary"] > 55000, id="and"),
+    pytest.param("users.age < 25 OR users.salary > 65000", 2,
+                 lambda r: r["users.age"] < 25 or r["users.salary"] > 65000, id="or"),
+    pytest.param("(users.age < 30 AND users.salary > 45000) OR users.name = 'Bob'", 3,
+                 lambda r: (r["users.age"] < 30 and r["users.salary"] > 45000) or r["users.name"] == "Bob",
+                 id="parentheses"),
+    pytest.param("users.age > 100", 0, lambda r: False, id="no_matches"),
+    pytest.param("users.id > 0", 5, lambda r: True, id="all_matches"),
+])
+def test_selection(selection_rows, condition, expected_count, row_predicate):
+    """Test a single condition keeps exactly the matching rows, in input order."""
+    result = SelectionOperator().execute(selection_rows, condition)
+    
+    assert result.rows_count == expected_count
+    assert result.data == [row for row in _DATA if row_predicate(row)]
+    assert result.schema == _SCHEMA
 
 
-def create_test_data():
-    """Create test data for users table."""
-    return [
-        {"users.id": 1, "users.name": "John", "users.age": 25, "users.salary": 50000.0},
-        {"users.id": 2, "users.name": "Jane", "users.age": 30, "users.salary": 60000.0},
-        {"users.id": 3, "users.name": "Bob", "users.age": 35, "users.salary": 70000.0},
-        {"users.id": 4, "users.name": "Alice", "users.age": 28, "users.salary": 55000.0},
-        {"users.id": 5, "users.name": "Charlie", "users.age": 22, "users.salary": 45000.0}
-    ]
-
-
-def test_selection_basic_equality():
-    """Test basic equality selection condition."""
+def test_selection_empty_input():
+    """Test selection with empty input data."""
     operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
+    data = []
     
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+    rows = Rows(data=data, rows_count=0, schema=_SCHEMA)
     
     result = operator.execute(rows, "users.name = 'John'")
     
-    assert result.rows_count == 1
-    assert len(result.data) == 1
-    assert result.data[0]["users.name"] == "John"
-    assert result.schema == schema
-
-
-def test_selection_numeric_comparison():
-    """Test numeric comparison conditions."""
-    operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
-    
-    result = operator.execute(rows, "users.age > 28")
-    
-    assert result.rows_count == 2  # Jane (30) and Bob (35)
-    assert len(result.data) == 2
-    ages = [row["users.age"] for row in result.data]
-    assert all(age > 28 for age in ages)
+    assert result.rows_count == 0
+    assert len(result.data) == 0
+    assert result.schema == _SCHEMA
 
 
-def test_selection_less_than_condition():
-    """Test less than condition."""
+def test_selection_short_circuit():
+    """Test AND/OR stop evaluating once the result is decided."""
     operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
+    data = list(_DATA)
     
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+    rows = Rows(data=data, rows_count=len(data), schema=_SCHEMA)
     
-    result = operator.execute(rows, "users.age < 28")
+    # users.name > 5 raises a type mismatch if it is ever evaluated
+    result = operator.execute(rows, "users.age > 100 AND users.name > 5")
+    assert result.rows_count == 0
     
-    assert result.rows_count == 2  # John (25) and Charlie (22)
-    ages = [row["users.age"] for row in result.data]
-    assert all(age < 28 for age in ages)
-
+    result = operator.execute(rows, "users.age > 0 OR users.name > 5")
+    assert result.rows_count == len(data)
 
-def test_selection_greater_equal_condition():
-    """Test greater than or equal condition."""
-    operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+def test_selection_columnwise_matches_rowwise():
+    """Test column-wise filtering keeps row order and agrees with per-row evaluation."""
+    from src.processor.conditions import ConditionParser
     
-    result = operator.execute(rows, "users.salary >= 55000")
-    
-    assert result.rows_count == 3  # Jane, Bob, Alice
-    salaries = [row["users.salary"] for row in result.data]
-    assert all(salary >= 55000 for salary in salaries)
-
-
-def test_selection_and_condition():
-    """Test AND condition."""
     operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
-    
-    result = operator.execute(rows, "users.age > 25 AND users.salary > 55000")
-    
-    assert result.rows_count == 2  # Jane and Bob
-    for row in result.data:
-        assert row["users.age"] > 25
-        assert row["users.salary"] > 55000
-
-
-def test_selection_or_condition():
-    """Test OR condition."""
+    data = list(_DATA)
+    
+    rows = Rows(data=data, rows_count=len(data), schema=_SCHEMA)
+    
+    for condition in ["users.age >= 28 AND salary < 70000",
+                      "users.name = 'Bob' OR (users.age < 25 OR users.id = 4)",
+                      "users.salary > users.age",
+                      "30 <= users.age",
+                      "users.salary >= 55000.5",
+                      "users.age > 27.5"]:
+        node = ConditionParser(_SCHEMA).parse(condition)
+        expected = [row for row in data if node.evaluate(row)]
+        
+        result = operator.execute(rows, condition)
+        assert result.data == expected
+
+def test_selection_columnar_rows():
+    """Test selection over struct-of-arrays rows materializes the same dicts."""
     operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+    data = list(_DATA)
     
-    result = operator.execute(rows, "users.age < 25 OR users.salary > 65000")
+    columnar = ColumnarRows.from_rows(Rows(data=data, rows_count=len(data), schema=_SCHEMA))
+    assert columnar.column("users.age") == [25, 30, 35, 28, 22]
+    assert columnar.data == data
     
-    assert result.rows_count == 2  # Charlie (age 22) and Bob (salary 70000)
-    for row in result.data:
-        assert row["users.age"] < 25 or row["users.salary"] > 65000
-
-
-def test_selection_no_matches():
-    """Test selection with no matching records."""
-    operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+    result = operator.execute(columnar, "users.age > 28")
+    assert isinstance(result, ColumnarRows)
+    assert result.column("users.name") == ["Jane", "Bob"]
+    assert [row["users.name"] for row in result.data] == ["Jane", "Bob"]
     
-    result = operator.execute(rows, "users.age > 100")
+    condition = "(users.age > 30 OR salary < 55000) AND users.name != 'John'"
+    expected = operator.execute(Rows(data=data, rows_count=len(data), schema=_SCHEMA), condition)
+    assert operator.execute(columnar, condition).data == expected.data
+    assert operator.execute(columnar, condition, count_only=True).rows_count == expected.rows_count
     
-    assert result.rows_count == 0
-    assert len(result.data) == 0
-    assert result.schema == schema
-
+    records = columnar.records()
+    assert records[1]["users.name"] == "Jane"
+    assert records[1][2] == 30
+    assert records[1].get("users.missing") is None
+    assert list(records[0].keys()) == list(data[0].keys())
 
-def test_selection_all_matches():
-    """Test selection where all records match."""
-    operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+def test_selection_compiled_predicate():
+    """Test large batches use a compiled predicate with the same results and laziness."""
+    from src.processor.conditions import ConditionEvaluator
     
-    result = operator.execute(rows, "users.id > 0")
-    
-    assert result.rows_count == 5
-    assert len(result.data) == 5
-    assert result.data == data
-    assert result.schema == schema
-
-
-def test_selection_empty_input():
-    """Test selection with empty input data."""
     operator = SelectionOperator()
-    schema = create_test_schema()
-    data = []
+    data = list(_DATA) * 300
     
-    rows = Rows(data=data, rows_count=0, schema=schema)
+    rows = Rows(data=data, rows_count=len(data), schema=_SCHEMA)
+    assert len(data) >= ConditionEvaluator.COMPILE_THRESHOLD
     
-    result = operator.execute(rows, "users.name = 'John'")
+    result = operator.execute(rows, "(users.age > 30 OR salary < 55000) AND users.name != 'John'")
+    assert result.rows_count == 600
+    assert {row["users.name"] for row in result.data} == {"Bob", "Charlie"}
     
+    # compiled predicate must still short-circuit before the type mismatch
+    result = operator.execute(rows, "users.age > 100 AND users.name > 5")
     assert result.rows_count == 0
-    assert len(result.data) == 0
-    assert result.schema == schema
-
-
-def test_selection_not_equal():
-    """Test not equal condition."""
-    operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
-    
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
     
-    result = operator.execute(rows, "users.name != 'John'")
-    
-    assert result.rows_count == 4  # Everyone except John
-    names = [row["users.name"] for row in result.data]
-    assert "John" not in names
-
+    try:
+        operator.execute(rows, "users.name > 5")
+        assert False, "Should have raised ValueError"
+    except ValueError as e:
+        assert "Type mismatch" in str(e)
 
-def test_selection_complex_condition():
-    """Test complex condition with parentheses."""
-    operator = SelectionOperator()
-    schema = create_test_schema()
-    data = create_test_data()
+def test_selection_reuses_parsed_condition(selection_rows):
+    """Test the same condition on the same schema is parsed only once."""
+    from src.processor.conditions import ConditionEvaluator
     
-    rows = Rows(data=data, rows_count=len(data), schema=schema)
+    condition = "users.age > 26 AND users.salary < 65000"
+    first = ConditionEvaluator(_SCHEMA)._get_parsed(condition)
+    second = ConditionEvaluator(list(_SCHEMA))._get_parsed(condition)
+    assert first is second
     
-    result = operator.execute(rows, "(users.age < 30 AND users.salary > 45000) OR users.name = 'Bob'")
-    
-    assert result.rows_count >= 1  # Should include at least Bob
-    
-    for row in result.data:
-        condition1 = row["users.age"] < 30 and row["users.salary"] > 45000
-        condition2 = row["users.name"] == "Bob"
-        assert condition1 or condition2
-
+    result = SelectionOperator().execute(selection_rows, condition)
+    assert [row["users.id"] for row in result.data] == [2, 4]
 
 if __name__ == "__main__":
-    test_selection_basic_equality()
-    test_selection_numeric_comparison()
-    test_selection_less_than_condition()
-    test_selection_greater_equal_condition()
-    test_selection_and_condition()
-    test_selection_or_condition()
-    test_selection_no_matches()
-    test_selection_all_matches()
-    test_selection_empty_input()
-    test_selection_not_equal()
-    test_selection_complex_condition()
-    
-    print("All selection operator tests passed!")
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__]))
@@ -1,7 +1,4 @@
-import os
-import sys
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import pytest
 
 from src.processor.operators.sort_operator import SortOperator
 from src.core.models import Rows, TableSchema, ColumnDefinition, DataType
@@ -19,21 +16,25 @@ def create_test_schema():
     return [TableSchema(table_name="test", columns=columns)]
 
 
-def create_test_data():
+# baris sumber dibagikan antar test; fixture raw_data memberi salinan per test
+_RAW = (
+    {"id": 1, "name": "Zara", "age": 25, "score": 80.5, "joined": "2023-01-01"},
+    {"id": 2, "name": "Ali",  "age": 30, "score": 90.0, "joined": "2023-02-01"},
+    {"id": 3, "name": "Ali",  "age": 20, "score": 85.0, "joined": "2023-03-01"},  # Ali muda
+    {"id": 4, "name": "Budi", "age": None, "score": 88.0, "joined": None},
+    {"id": 5, "name": "caca", "age": 28, "score": 70.0, "joined": "2023-01-15"}  # Lowercase name
+)
+
+
+@pytest.fixture
+def raw_data():
     """Create test data for sorting."""
-    return [
-        {"id": 1, "name": "Zara", "age": 25, "score": 80.5, "joined": "2023-01-01"},
-        {"id": 2, "name": "Ali",  "age": 30, "score": 90.0, "joined": "2023-02-01"},
-        {"id": 3, "name": "Ali",  "age": 20, "score": 85.0, "joined": "2023-03-01"},  # Ali muda
-        {"id": 4, "name": "Budi", "age": None, "score": 88.0, "joined": None},
-        {"id": 5, "name": "caca", "age": 28, "score": 70.0, "joined": "2023-01-15"}  # Lowercase name
-    ]
+    return [dict(row) for row in _RAW]
 
 
-def test_sort_no_order_by():
+def test_sort_no_order_by(raw_data):
     """Test jika order_by kosong, urutan tidak berubah"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -44,10 +45,9 @@ def test_sort_no_order_by():
     assert result_none.data == raw_data
 
 
-def test_sort_asc_integer():
+def test_sort_asc_integer(raw_data):
     """Test sorting ASC pada kolom integer"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -56,10 +56,9 @@ def test_sort_asc_integer():
     assert ids == [1, 2, 3, 4, 5]
 
 
-def test_sort_desc_integer():
+def test_sort_desc_integer(raw_data):
     """Test sorting DESC pada kolom integer"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -68,10 +67,9 @@ def test_sort_desc_integer():
     assert ids == [5, 4, 3, 2, 1]
 
 
-def test_sort_string_case_insensitive():
+def test_sort_string_case_insensitive(raw_data):
     """Test sorting string (memastikan 'Ali' < 'Budi' < 'caca')"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -85,10 +83,9 @@ def test_sort_string_case_insensitive():
     assert names == expected
 
 
-def test_sort_desc_string():
+def test_sort_desc_string(raw_data):
     """Test sorting DESC pada string (menguji logika pembalik bit char)"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -100,10 +97,9 @@ def test_sort_desc_string():
     assert names == expected
 
 
-def test_sort_multi_column():
+def test_sort_multi_column(raw_data):
     """Test sorting multi kolom: Nama ASC, Umur ASC"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -118,10 +114,9 @@ def test_sort_multi_column():
     assert ali_subset == [("Ali", 20), ("Ali", 30)]
 
 
-def test_sort_multi_column_mixed_direction():
+def test_sort_multi_column_mixed_direction(raw_data):
     """Test sorting multi kolom: Nama ASC, Umur DESC"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -134,10 +129,9 @@ def test_sort_multi_column_mixed_direction():
     assert ali_subset == [("Ali", 30), ("Ali", 20)]
 
 
-def test_sort_null_handling():
+def test_sort_null_handling(raw_data):
     """Test handling NULL values (Harus selalu di awal/terkecil)"""
     operator = SortOperator()
-    raw_data = create_test_data()
     schema = create_test_schema()
     input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
     
@@ -160,7 +154,11 @@ def test_parse_order_by_method():
         ("age", "DESC"),
         ("score", "ASC")
     ]
-    assert parsed == expected
+    assert list(parsed) == expected
+    
+    # hasil parse di-cache dan immutable
+    assert operator._parse_order_by(query) is parsed
+    assert isinstance(parsed, tuple)
 
 
 def test_normalize_value_method():
@@ -180,17 +178,99 @@ def test_normalize_value_method():
     assert val_str == (4, "test")  # Expect lowercase
 
 
-def test_apply_direction_method():
-    """Test method private _apply_direction untuk logika DESC"""
+def test_key_function_method():
+    """Test method private _key_function untuk logika DESC"""
+    operator = SortOperator()
+    mixed = {int, str, type(None)}
+    
+    # ASC sama dengan hasil normalisasi
+    asc_key = operator._key_function("ASC", mixed)
+    assert asc_key(50) == (1, 50)
+    assert asc_key("Abc") == (4, "abc")
+    
+    # DESC diurutkan dengan reverse=True: nilai tetap, hanya type_id yang dinegasikan
+    desc_key = operator._key_function("DESC", mixed)
+    assert desc_key(50) == (-1, 50)
+    assert desc_key("abc") == (-4, "abc")
+    assert desc_key(None) == (0, None)
+
+
+def test_sort_desc_keeps_nulls_first_and_ties_stable(raw_data):
+    """Test DESC tetap menaruh NULL di awal dan row seri mempertahankan urutan input"""
     operator = SortOperator()
+    schema = create_test_schema()
+    input_rows = Rows(data=raw_data, rows_count=len(raw_data), schema=schema)
+    
+    result = operator.execute(input_rows, "age DESC")
+    assert [row['id'] for row in result.data] == [4, 2, 5, 1, 3]
+    
+    result = operator.execute(input_rows, "name DESC, id ASC")
+    assert [row['id'] for row in result.data] == [1, 5, 4, 2, 3]
+    
+    # prefix lebih pendek berada di akhir saat DESC
+    prefixed = [{"name": "Ali"}, {"name": "Alice"}, {"name": "Al"}]
+    result = operator.execute(Rows(data=prefixed, rows_count=3, schema=schema), "name DESC")
+    assert [row['name'] for row in result.data] == ["Alice", "Ali", "Al"]
+
+
+def test_sort_repeated_values_normalized_once():
+    """Test kolom dengan banyak nilai berulang tetap terurut sama (normalisasi per nilai distinct)"""
+    operator = SortOperator()
+    schema = create_test_schema()
+    joined = ["2023-02-01", None, "2023-01-01", "2023-02-01", None, "2023-01-01"] * 3
+    data = [{"id": i, "joined": value} for i, value in enumerate(joined)]
+    
+    result = operator.execute(Rows(data=data, rows_count=len(data), schema=schema), "joined DESC, id")
     
-    # Test Int DESC
-    norm_int = (1, 50)
-    res_int = operator._apply_direction(norm_int, "DESC")
-    assert res_int == (1, -50)
+    assert [row["joined"] for row in result.data] == [None] * 6 + ["2023-02-01"] * 6 + ["2023-01-01"] * 6
+    assert [row["id"] for row in result.data[:6]] == [1, 4, 7, 10, 13, 16]
+
+
+def test_sort_nullable_numeric_column_keeps_nulls_first():
+    """Test NULL tetap paling awal pada kolom numerik, termasuk saat ada nilai tak hingga"""
+    operator = SortOperator()
+    schema = create_test_schema()
+    data = [{"id": 1, "score": 2.5}, {"id": 2, "score": None}, {"id": 3, "score": float("-inf")}, {"id": 4, "score": 7}]
+    rows = Rows(data=data, rows_count=len(data), schema=schema)
+    
+    assert [row["id"] for row in operator.execute(rows, "score ASC").data] == [2, 3, 1, 4]
+    assert [row["id"] for row in operator.execute(rows, "score DESC").data] == [2, 4, 1, 3]
+    
+    data[2]["score"] = float("inf")
+    assert [row["id"] for row in operator.execute(rows, "score DESC").data] == [2, 3, 4, 1]
+
+
+def test_string_key_function_matches_generic_normalizer():
+    """Test key khusus kolom teks sama dengan key dari _normalize_value"""
+    operator = SortOperator()
+    values = ["Bob", None, "2023-01-01", "1abc", "alice", "2023-01-01T10:00:00"]
+    
+    for direction in ("ASC", "DESC"):
+        key_of = operator._key_function(direction, {str, type(None)})
+        generic_key = operator._key_function(direction, {str, int, type(None)})
+        assert list(map(key_of, values)) == list(map(generic_key, values))
+    assert operator._key_function("DESC", {str})("1abc") == (-4, "1abc")
+
+
+def test_sort_single_row_returned_without_copy(raw_data):
+    """Test satu row dikembalikan apa adanya, kolom tetap divalidasi"""
+    operator = SortOperator()
+    schema = create_test_schema()
+    input_rows = Rows(data=raw_data[:1], rows_count=1, schema=schema)
+    
+    assert operator.execute(input_rows, "name DESC") is input_rows
+    with pytest.raises(ValueError):
+        operator.execute(input_rows, "missing")
+
+
+def test_sort_text_column_with_nulls_matches_tagged_keys():
+    """Test kolom teks dengan NULL (dipisah tanpa tag) sama dengan urutan key bertag"""
+    operator = SortOperator()
+    schema = create_test_schema()
+    names = ["bob", None, "Alice", "alice", None, "Carl", "bob"]
+    data = [{"id": i, "name": name, "age": i % 2} for i, name in enumerate(names)]
+    rows = Rows(data=data, rows_count=len(data), schema=schema)
     
-    # Test String DESC
-    norm_str = (4, "abc")
-    res_str = operator._apply_direction(norm_str, "DESC")
-    inverted = "".join(chr(255 - ord(c)) for c in "abc")
-    assert res_str == (4, inverted)
\ No newline at end of file
+    # NULL selalu di depan, nama seri (case-insensitive) diurutkan menurut age
+    assert [row["id"] for row in operator.execute(rows, "name ASC, age").data] == [4, 1, 2, 3, 0, 6, 5]
+    assert [row["id"] for row in operator.execute(rows, "name DESC, age").data] == [4, 1, 5, 0, 6, 2, 3]
@@ -1,10 +1,4 @@
-import os
-import sys
 import pytest
-from unittest.mock import Mock
-import shutil
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
 
 from src.core.models import (
     Rows,
@@ -14,6 +8,7 @@ from src.core.models import (
     DataWrite,
     Condition,
 )
+from src.core.models.response import Response
 from src.processor.operators import UpdateOperator
 from src.storage.storage_manager import StorageManager
 from src.concurrency.concurrency_manager import ConcurrencyControlManager
@@ -24,18 +19,10 @@ from src.failure.failure_recovery_manager import FailureRecoveryManager
 # Helpers
 # -------------------------------------------------------------------------
 
-def _make_mock_storage_manager():
-    data_dir = "data_test"
-    abs_data_path = os.path.join(os.path.dirname(__file__), '..', '..', 'src', data_dir)
-    if os.path.exists(abs_data_path):
-        try:
-            shutil.rmtree(abs_data_path)
-        except Exception:
-            pass
-
-    storage = StorageManager(data_directory=data_dir)
-
-    schema = TableSchema(
+@pytest.fixture(scope="module")
+def employees_schema():
+    # schema tidak diubah oleh test, jadi cukup dibangun sekali per modul
+    return TableSchema(
         table_name="employees",
         columns=[
             ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
@@ -46,29 +33,37 @@ def _make_mock_storage_manager():
         primary_key="id",
     )
 
-    # Create table on disk/storage layer
-    try:
-        storage.create_table(schema)
-    except Exception:
-        # If already exists, drop and recreate
-        try:
-            storage.drop_table(schema.table_name)
-            storage.create_table(schema)
-        except Exception:
-            pass
 
+@pytest.fixture(scope="module")
+def employees_storage(employees_schema):
+    # storage dan table dibuat sekali per modul; tiap test hanya mengosongkan row.
+    # backend memory: tidak ada file di bawah src/, jadi tidak perlu dibersihkan
+    storage = StorageManager(data_directory="update_test", backend="memory")
+    storage.create_table(employees_schema)
     return storage
 
 
+@pytest.fixture
+def storage(employees_storage):
+    employees_storage.truncate_table("employees")
+    return employees_storage
+
+
+_ALLOWED = Response(allowed=True, transaction_id=1)
+
+
+class _StubCCM:
+    """CCM minimal: setiap akses selalu diizinkan."""
+
+    def validate_object(self, *args, **kwargs):
+        return _ALLOWED
+
+    def get_active_transactions(self, *args, **kwargs):
+        return (None, [1, 2, 3])
+
+
 def _make_mock_ccm():
-    # Create a mock that always allows operations for testing
-    from unittest.mock import Mock
-    from src.core.models.response import Response
-    
-    mock_ccm = Mock()
-    mock_ccm.validate_object.return_value = Response(allowed=True, transaction_id=1)
-    mock_ccm.get_active_transactions.return_value = (None, [1, 2, 3])
-    return mock_ccm
+    return _StubCCM()
 
 
 class FakeNode:
@@ -110,8 +105,7 @@ class FakeNode:
 # TEST CASES
 # -------------------------------------------------------------------------
 
-def test_update_single_column():
-    storage = _make_mock_storage_manager()
+def test_update_single_column(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -132,8 +126,7 @@ def test_update_single_column():
     assert any(r.get("id") == 2 and r.get("salary") == 65000 for r in persisted.data)
 
 
-def test_update_multiple_columns():
-    storage = _make_mock_storage_manager()
+def test_update_multiple_columns(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -152,8 +145,7 @@ def test_update_multiple_columns():
     assert any(r.get("id") == 1 and r.get("salary") == 70000 and r.get("department") == "Engineering" for r in persisted.data)
 
 
-def test_update_all_rows_no_where():
-    storage = _make_mock_storage_manager()
+def test_update_all_rows_no_where(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -173,8 +165,7 @@ def test_update_all_rows_no_where():
     assert all(r.get("department") == "Marketing" for r in persisted.data)
 
 
-def test_update_with_null_value():
-    storage = _make_mock_storage_manager()
+def test_update_with_null_value(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -193,22 +184,21 @@ def test_update_with_null_value():
     assert any(r.get("id") == 1 and r.get("department") is None for r in persisted.data)
 
 
-def test_update_nonexistent_table_raises_error():
-    storage = _make_mock_storage_manager()
+def test_update_nonexistent_table_raises_error(storage):
     operator = UpdateOperator(_make_mock_ccm(), storage, FailureRecoveryManager())
 
-    mock_schema = Mock()
-    mock_schema.table_name = "nope"
-    mock_schema.primary_key = None  # This will trigger the ValueError
-    mock_schema.columns = []
-    rows = Rows(data=[], rows_count=0, schema=[mock_schema])
+    # tanpa primary key -> ValueError
+    schema = TableSchema(
+        table_name="nope",
+        columns=[ColumnDefinition(name="x", data_type=DataType.INTEGER)],
+    )
+    rows = Rows(data=[], rows_count=0, schema=[schema])
 
     with pytest.raises(ValueError):
         operator.execute(rows, "x = 1", tx_id=0)
 
 
-def test_update_nonexistent_column_raises_error():
-    storage = _make_mock_storage_manager()
+def test_update_nonexistent_column_raises_error(storage):
     operator = UpdateOperator(_make_mock_ccm(), storage, FailureRecoveryManager())
 
     schema = storage.get_table_schema("employees")
@@ -220,8 +210,7 @@ def test_update_nonexistent_column_raises_error():
         operator.execute(initial_rows, "bad_column = 10", tx_id=5)
 
 
-def test_update_integration_flow():
-    storage = _make_mock_storage_manager()
+def test_update_integration_flow(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -240,8 +229,7 @@ def test_update_integration_flow():
     assert any(r.get("id") == 2 and r.get("salary") == 80000 and r.get("department") == "IT" for r in persisted.data)
 
 
-def test_update_primary_key_duplicate_raises_error():
-    storage = _make_mock_storage_manager()
+def test_update_primary_key_duplicate_raises_error(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -263,8 +251,7 @@ def test_update_primary_key_duplicate_raises_error():
         operator.execute(single_row, "id = 1", tx_id=10)
 
 
-def test_update_type_mismatch_string_to_integer():
-    storage = _make_mock_storage_manager()
+def test_update_type_mismatch_string_to_integer(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -280,8 +267,7 @@ def test_update_type_mismatch_string_to_integer():
         operator.execute(initial_rows, "salary = 'not_a_number'", tx_id=11)
 
 
-def test_update_type_mismatch_string_to_id():
-    storage = _make_mock_storage_manager()
+def test_update_type_mismatch_string_to_id(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -297,8 +283,7 @@ def test_update_type_mismatch_string_to_id():
         operator.execute(initial_rows, "id = 'invalid_id'", tx_id=12)
 
 
-def test_update_malformed_assignment_expression():
-    storage = _make_mock_storage_manager()
+def test_update_malformed_assignment_expression(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -320,8 +305,7 @@ def test_update_malformed_assignment_expression():
         pass
 
 
-def test_update_empty_assignment():
-    storage = _make_mock_storage_manager()
+def test_update_empty_assignment(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -341,8 +325,7 @@ def test_update_empty_assignment():
     assert any(r.get("id") == 1 and r.get("salary") == 50000 for r in persisted.data)
 
 
-def test_update_numeric_string_conversion():
-    storage = _make_mock_storage_manager()
+def test_update_numeric_string_conversion(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -361,8 +344,7 @@ def test_update_numeric_string_conversion():
     assert any(r.get("id") == 1 and r.get("salary") == 75000 for r in persisted.data)
 
 
-def test_update_quoted_vs_unquoted_strings():
-    storage = _make_mock_storage_manager()
+def test_update_quoted_vs_unquoted_strings(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -381,8 +363,7 @@ def test_update_quoted_vs_unquoted_strings():
     assert any(r.get("department") == "Engineering" for r in persisted.data)
 
 
-def test_update_zero_and_negative_values():
-    storage = _make_mock_storage_manager()
+def test_update_zero_and_negative_values(storage):
     ccm = _make_mock_ccm()
     frm = FailureRecoveryManager(storage_manager=storage)
     operator = UpdateOperator(ccm, storage, frm)
@@ -406,3 +387,11 @@ def test_update_zero_and_negative_values():
     
     persisted = storage.dml_manager.load_all_rows("employees", schema)
     assert any(r.get("id") == 1 and r.get("salary") == -1000 for r in persisted.data)
+
+
+def test_update_set_clause_parsed_once(storage):
+    operator = UpdateOperator(_make_mock_ccm(), storage, FailureRecoveryManager(storage_manager=storage))
+
+    parsed = operator._parse_set_clause("salary = 1, department = 'A, B'")
+    assert parsed == (("salary", "1"), ("department", "'A, B'"))
+    assert UpdateOperator(_make_mock_ccm(), storage, None)._parse_set_clause("salary = 1, department = 'A, B'") is parsed
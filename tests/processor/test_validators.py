@@ -202,13 +202,5 @@ def test_invalid_statements():
         assert result.error_message, f"Should have error message for: {query}"
 
 if __name__ == "__main__":
-    test_select_statements()
-    test_join_statements() 
-    test_insert_statements()
-    test_update_statements()
-    test_delete_statements()
-    test_ddl_statements()
-    test_tcl_statements()
-    test_invalid_statements()
-    
-    print("All tests passed!")
+    import pytest
+    raise SystemExit(pytest.main([__file__]))
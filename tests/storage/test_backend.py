@@ -0,0 +1,98 @@
+import pytest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.storage.storage_manager import StorageManager
+from src.storage.backend import MemoryBackend, create_backend
+from src.core.models import (
+    TableSchema,
+    ColumnDefinition,
+    DataType,
+    DataRetrieval,
+    DataWrite,
+    Rows
+)
+
+
+@pytest.fixture(scope="function")
+def storage():
+    return StorageManager("data_test_memory", backend="memory")
+
+
+@pytest.fixture(scope="function")
+def employees_schema():
+    return TableSchema(
+        table_name="employees",
+        columns=[
+            ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
+            ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
+        ],
+        primary_key="id"
+    )
+
+
+class TestMemoryBackend:
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            create_backend("tape")
+
+    def test_write_read_remove(self):
+        backend = MemoryBackend()
+        backend.write("src/data/tables/a.dat", b"abc")
+
+        assert backend.exists("src/data/tables/a.dat")
+        assert backend.read("src/data/tables/a.dat") == b"abc"
+        assert backend.listdir("src/data/tables") == ["a.dat"]
+
+        backend.remove("src/data/tables/a.dat")
+        assert not backend.exists("src/data/tables/a.dat")
+        with pytest.raises(FileNotFoundError):
+            backend.read("src/data/tables/a.dat")
+
+    def test_snapshot_restore(self):
+        source = MemoryBackend()
+        source.write("src/a/tables/users.dat", b"rows")
+        source.write("src/a/schemas/users.dat", b"schema")
+        source.write("src/b/tables/other.dat", b"other")
+
+        snapshot = source.snapshot("src/a")
+        assert set(snapshot) == {os.path.join("tables", "users.dat"), os.path.join("schemas", "users.dat")}
+
+        target = MemoryBackend()
+        target.restore("/tmp/x", snapshot)
+        assert target.read("/tmp/x/tables/users.dat") == b"rows"
+        assert target.listdir("/tmp/x/schemas") == ["users.dat"]
+
+        target.write("/tmp/x/tables/users.dat", b"changed")
+        assert source.read("src/a/tables/users.dat") == b"rows"
+
+    def test_storage_does_not_touch_disk(self, storage, employees_schema):
+        storage.create_table(employees_schema)
+        storage.write_block(DataWrite(table_name="employees", data={"id": 1, "name": "Alice"}))
+        storage.set_index("employees", "id", "b_plus_tree")
+
+        assert not os.path.exists("src/data_test_memory")
+        assert storage.list_tables() == ["employees"]
+
+        result = storage.read_block(DataRetrieval(table_name="employees", columns=["*"]))
+        assert result.data == [{"id": 1, "name": "Alice"}]
+
+    def test_drop_all(self, storage, employees_schema):
+        storage.create_table(employees_schema)
+        storage.dml_manager.save_all_rows(
+            "employees",
+            Rows(data=[{"id": 1, "name": "Alice"}], rows_count=1),
+            employees_schema
+        )
+        storage.set_index("employees", "id", "b_plus_tree")
+
+        storage.drop_all()
+
+        assert storage.list_tables() == []
+        assert not storage.has_index("employees", "id")
+
+        storage.create_table(employees_schema)
+        result = storage.read_buffer(DataRetrieval(table_name="employees", columns=["*"]))
+        assert result.rows_count == 0
@@ -13,9 +13,13 @@ from src.core.models import (
 from src.storage.index.b_plus_tree_index import BPlusTreeIndex
 
 
+# direktori data per worker pytest-xdist supaya test paralel tidak saling menimpa
+DATA_DIR = f"data_test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+
+
 @pytest.fixture(scope="function")
 def test_data_dir():
-    test_dir = "src/data_test"
+    test_dir = os.path.join("src", DATA_DIR)
     if os.path.exists(test_dir):
         shutil.rmtree(test_dir)
     yield test_dir
@@ -25,7 +29,7 @@ def test_data_dir():
 
 @pytest.fixture(scope="function")
 def storage(test_data_dir):
-    return StorageManager("data_test")
+    return StorageManager(DATA_DIR)
 
 
 @pytest.fixture(scope="function")
@@ -181,7 +185,7 @@ class TestBPlusTreeIndex:
     
     def test_index_persistence(self, employees_table):
         storage, schema, _ = employees_table
-        index1 = BPlusTreeIndex("employees", "age", "src/data_test")
+        index1 = BPlusTreeIndex("employees", "age", os.path.join("src", DATA_DIR))
         
         rows = storage.dml_manager.load_all_rows("employees", schema)
         for i, row in enumerate(rows.data):
@@ -191,7 +195,7 @@ class TestBPlusTreeIndex:
         
         index1.save()
         result1 = index1.search(30)
-        index2 = BPlusTreeIndex("employees", "age", "src/data_test")
+        index2 = BPlusTreeIndex("employees", "age", os.path.join("src", DATA_DIR))
         result2 = index2.search(30)
         
         assert result1 == result2
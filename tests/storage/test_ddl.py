@@ -9,13 +9,19 @@ from src.core.models import (
     ColumnDefinition,
     DataType,
     ForeignKeyConstraint,
-    ForeignKeyAction
+    ForeignKeyAction,
+    DataRetrieval,
+    DataWrite
 )
 
 
+# direktori data per worker pytest-xdist supaya test paralel tidak saling menimpa
+DATA_DIR = f"data_test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+
+
 @pytest.fixture(scope="function")
 def test_data_dir():
-    test_dir = "src/data_test"
+    test_dir = os.path.join("src", DATA_DIR)
     if os.path.exists(test_dir):
         shutil.rmtree(test_dir)
     yield test_dir
@@ -25,7 +31,7 @@ def test_data_dir():
 
 @pytest.fixture(scope="function")
 def storage(test_data_dir):
-    return StorageManager("data_test")
+    return StorageManager(DATA_DIR)
 
 
 class TestCreateTable:
@@ -128,6 +134,38 @@ class TestDropTable:
             storage.drop_table("nonexistent")
 
 
+class TestTruncateTable:
+    
+    def test_truncate_table(self, storage):
+        schema = TableSchema(
+            table_name="employees",
+            columns=[
+                ColumnDefinition(name="id", data_type=DataType.INTEGER, primary_key=True),
+                ColumnDefinition(name="name", data_type=DataType.VARCHAR, max_length=50),
+            ],
+            primary_key="id"
+        )
+        storage.create_table(schema)
+        storage.set_index("employees", "id", "b_plus_tree")
+        storage.write_buffer(DataWrite(table_name="employees", data={"id": 1, "name": "Alice"}))
+        
+        storage.truncate_table("employees")
+        
+        assert storage.list_tables() == ["employees"]
+        assert storage.has_index("employees", "id")
+        assert storage.indexes[("employees", "id")].search(1) == []
+        result = storage.read_buffer(DataRetrieval(table_name="employees", columns=["*"]))
+        assert result.rows_count == 0
+        
+        storage.write_buffer(DataWrite(table_name="employees", data={"id": 1, "name": "Bob"}))
+        result = storage.read_buffer(DataRetrieval(table_name="employees", columns=["*"]))
+        assert result.data == [{"id": 1, "name": "Bob"}]
+    
+    def test_truncate_nonexistent_table(self, storage):
+        with pytest.raises(ValueError, match="does not exist"):
+            storage.truncate_table("nonexistent")
+
+
 class TestListTables:
     
     def test_list_tables(self, storage):
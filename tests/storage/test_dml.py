@@ -17,9 +17,14 @@ from src.core.models import (
     Rows
 )
 
+# direktori data per worker pytest-xdist supaya test paralel tidak saling menimpa
+DATA_DIR_BUFFER = f"data_test_buffer_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+DATA_DIR_NO_BUFFER = f"data_test_no_buffer_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+
+
 @pytest.fixture(scope="function")
 def test_data_dir_buffer():
-    test_dir = "src/data_test_buffer"
+    test_dir = os.path.join("src", DATA_DIR_BUFFER)
     if os.path.exists(test_dir):
         shutil.rmtree(test_dir)
     yield test_dir
@@ -29,7 +34,7 @@ def test_data_dir_buffer():
 
 @pytest.fixture(scope="function")
 def test_data_dir_no_buffer():
-    test_dir = "src/data_test_no_buffer"
+    test_dir = os.path.join("src", DATA_DIR_NO_BUFFER)
     if os.path.exists(test_dir):
         shutil.rmtree(test_dir)
     yield test_dir
@@ -39,12 +44,12 @@ def test_data_dir_no_buffer():
 
 @pytest.fixture(scope="function")
 def storage(test_data_dir_buffer):
-    return StorageManager("data_test_buffer", use_buffer=True)
+    return StorageManager(DATA_DIR_BUFFER, use_buffer=True)
 
 
 @pytest.fixture(scope="function")
 def storage_no_buffer(test_data_dir_no_buffer):
-    return StorageManager("data_test_no_buffer", use_buffer=False)
+    return StorageManager(DATA_DIR_NO_BUFFER, use_buffer=False)
 
 
 @pytest.fixture(scope="function")
@@ -263,6 +268,62 @@ class TestBufferReadOperations:
         assert stats["miss_count"] >= 0
         assert stats["hit_count"] >= 0
 
+    def test_read_by_primary_key_buffer(self, employees_table):
+        retrieval = DataRetrieval(
+            table_name="employees",
+            columns=["*"],
+            conditions=[
+                Condition(column="id", operator=ComparisonOperator.EQ, value=3),
+                Condition(column="age", operator=ComparisonOperator.GT, value=30),
+            ]
+        )
+        
+        result = employees_table.read_buffer(retrieval)
+        assert result.data == [{"id": 3, "name": "Charlie", "age": 35, "salary": 90000.0}]
+        
+        row = employees_table.dml_manager.get_row_by_pk("employees", employees_table.get_table_schema("employees"), 2)
+        assert row["name"] == "Bob"
+        row["name"] = "Mutated"
+        
+        employees_table.write_buffer(DataWrite(
+            table_name="employees",
+            data={"id": 6, "name": "Frank", "age": 40, "salary": 50000.0},
+            is_update=False,
+            conditions=[]
+        ))
+        
+        schema = employees_table.get_table_schema("employees")
+        assert employees_table.dml_manager.get_row_by_pk("employees", schema, 2)["name"] == "Bob"
+        assert employees_table.dml_manager.get_row_by_pk("employees", schema, 6)["name"] == "Frank"
+        assert employees_table.dml_manager.get_row_by_pk("employees", schema, 99) is None
+
+    def test_insert_writes_through_primary_key_map(self, employees_table):
+        dml_manager = employees_table.dml_manager
+        schema = employees_table.get_table_schema("employees")
+        assert dml_manager.get_row_by_pk("employees", schema, 1) is not None
+
+        employees_table.write_buffer(DataWrite(
+            table_name="employees",
+            data={"id": 7, "name": "", "age": "41", "salary": None},
+            is_update=False,
+            conditions=[]
+        ))
+        dml_manager.serializer.deserialize_rows = None  # map pk tidak boleh dibangun ulang
+
+        assert dml_manager.get_row_by_pk("employees", schema, 7) == {"id": 7, "name": None, "age": 41, "salary": None}
+        assert dml_manager.get_row_by_pk("employees", schema, 1)["id"] == 1
+
+    def test_read_by_primary_key_skips_index_scan(self, employees_table):
+        employees_table.set_index("employees", "id", "b_plus_tree")
+        employees_table.dml_manager.load_all_rows = None  # seek pk tidak boleh memuat seluruh row
+        
+        result = employees_table.read_buffer(DataRetrieval(
+            table_name="employees",
+            columns=["*"],
+            conditions=[Condition(column="id", operator=ComparisonOperator.EQ, value=2)]
+        ))
+        assert [row["name"] for row in result.data] == ["Bob"]
+
     def test_buffer_fallback_to_disk(self, employees_table):
         retrieval = DataRetrieval(
             table_name="employees",
@@ -575,6 +636,61 @@ class TestBufferWriteOperations:
         assert updated == 3
         assert all(row["salary"] == 88000 for row in result.data if row["age"] >= 30)
     
+    def test_update_buffer_batch(self, employees_table):
+        def by_pk(pk, data):
+            return DataWrite(
+                table_name="employees",
+                data=data,
+                is_update=True,
+                conditions=[Condition(column="id", operator=ComparisonOperator.EQ, value=pk)]
+            )
+        
+        updated = employees_table.write_buffer_batch([
+            by_pk(1, {"salary": 1.0}),
+            by_pk(2, {"id": 20}),
+            by_pk(20, {"salary": 2.0}),
+            by_pk(99, {"salary": 3.0}),
+        ])
+        
+        result = employees_table.read_buffer(DataRetrieval(table_name="employees", columns=["*"], conditions=[]))
+        salaries = {row["id"]: row["salary"] for row in result.data}
+        
+        assert updated == 3
+        assert salaries == {1: 1.0, 20: 2.0, 3: 90000.0, 4: 70000.0, 5: 85000.0}
+        
+        with pytest.raises(ValueError, match="PK conflict"):
+            employees_table.write_buffer_batch([by_pk(3, {"id": 4})])
+    
+    def test_update_buffer_batch_failure_leaves_index_untouched(self, employees_table):
+        employees_table.set_index("employees", "name", "b_plus_tree")
+        index = employees_table.indexes[("employees", "name")]
+        
+        def by_pk(pk, data):
+            return DataWrite(
+                table_name="employees",
+                data=data,
+                is_update=True,
+                conditions=[Condition(column="id", operator=ComparisonOperator.EQ, value=pk)]
+            )
+        
+        # write pertama valid, write kedua konflik pk: seluruh batch batal
+        with pytest.raises(ValueError, match="PK conflict"):
+            employees_table.write_buffer_batch([by_pk(1, {"name": "x"}), by_pk(1, {"id": 2})])
+        
+        assert index.search("Alice") == [0]
+        assert index.search("x") == []
+        result = employees_table.read_buffer(DataRetrieval(
+            table_name="employees",
+            columns=["*"],
+            conditions=[Condition(column="name", operator=ComparisonOperator.EQ, value="Alice")]
+        ))
+        assert [row["id"] for row in result.data] == [1]
+        
+        # batch yang berhasil baru mengubah index setelah page tersimpan
+        assert employees_table.write_buffer_batch([by_pk(1, {"name": "x"})]) == 1
+        assert index.search("Alice") == []
+        assert index.search("x") == [0]
+    
     def test_delete_buffer(self, employees_table):
         dd = DataDeletion(
             table_name="employees",
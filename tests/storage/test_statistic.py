@@ -12,9 +12,13 @@ from src.core.models import (
 )
 
 
+# direktori data per worker pytest-xdist supaya test paralel tidak saling menimpa
+DATA_DIR = f"data_test_{os.environ.get('PYTEST_XDIST_WORKER', 'main')}"
+
+
 @pytest.fixture(scope="function")
 def test_data_dir():
-    test_dir = "src/data_test"
+    test_dir = os.path.join("src", DATA_DIR)
     if os.path.exists(test_dir):
         shutil.rmtree(test_dir)
     yield test_dir
@@ -24,7 +28,7 @@ def test_data_dir():
 
 @pytest.fixture(scope="function")
 def storage(test_data_dir):
-    return StorageManager("data_test")
+    return StorageManager(DATA_DIR)
 
 
 @pytest.fixture(scope="function")